@@ -1,227 +1,1509 @@
-import re
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import pickle
-import string
+import hashlib
+import itertools
 import logging
+import pickle
+import threading
+import time
 from datetime import datetime
 
+import numpy as np
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.utils.extmath import safe_sparse_dot
+
+from career_fields import (
+    CAREER_FIELDS,
+    field_query_vectors,
+    field_weight_vector,
+    normalize_field_blocks,
+)
+from career_record import CareerRecord, as_career_record
+from catalog_loader import CatalogSessionError, fetch_career_records
+from engine_cache import LRUCache, document_key
+from model_store import compact_csr, is_model_dir, load_model_dir, save_model_dir
+from parallel_vectorizer import parallel_fit_transform, resolve_n_jobs
+from retrieval import InvertedIndex, IVFIndex, top_k_indices
+from text_normalizer import normalize_corpus, normalize_text
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Supported ways of finding the top careers for a single user
+RETRIEVAL_MODES = ('exhaustive', 'inverted', 'ivf')
+
+# Career documents normalized together while streaming a corpus into the
+# vectorizer (also the shard size of parallel fits)
+CORPUS_CHUNK_SIZE = 1000
+
+# Model versions are unique across engines, so cache keys never collide
+_model_versions = itertools.count(1)
+
+# Hybrid ranking: largest share of the final score given to the preference-
+# weighted career features (reached when every preference is at its maximum)
+HYBRID_FEATURE_WEIGHT = 0.3
+
+# Hybrid ranking with an inverted or IVF index: candidates per result taken
+# from the index (by similarity) and reranked with the user's preferences
+HYBRID_CANDIDATE_FACTOR = 10
+
+# Static per-career ranking feature columns, each scaled to [0, 1] and
+# weighted by a preference in [0, 1] (see preference_weights); salary is
+# matched against the user's range by the salary fit instead
+RANKING_FEATURES = ('demand', 'growth', 'remote')
+
+# Fixed weights of the per-request hybrid features
+SKILL_COVERAGE_WEIGHT = 0.5
+SALARY_FIT_WEIGHT = 0.5
+INDUSTRY_MATCH_WEIGHT = 0.5
+
+# Largest possible sum of hybrid feature weights
+MAX_HYBRID_WEIGHT = len(RANKING_FEATURES) + SKILL_COVERAGE_WEIGHT + SALARY_FIT_WEIGHT + INDUSTRY_MATCH_WEIGHT
+
+# Work environment phrases and how remote-friendly they make a career
+REMOTE_KEYWORDS = (
+    ('remote', 1.0),
+    ('work from home', 1.0),
+    ('telecommut', 1.0),
+    ('hybrid', 0.5),
+    ('flexible', 0.5),
+)
+
+# User preference fields that change the hybrid ranking, part of result cache keys
+PREFERENCE_FIELDS = ('salary_preference', 'remote_work', 'work_life_balance',
+                     'job_security', 'growth_opportunity', 'industries')
+
+class EngineSnapshot:
+    """
+    Immutable fitted state of a CareerRecommendationEngine
+    
+    Writers build a new snapshot with replace() and publish it with a single
+    attribute assignment; readers take engine.snapshot once per request and
+    use only that object, so a request never mixes the vectorizer, career
+    matrix and careers of different fits, and needs no lock. The arrays and
+    lists a snapshot holds must not be modified once it is published.
+    """
+    __slots__ = (
+        # Model; catalog_hash fingerprints the careers behind the rows
+        'vectorizer', 'careers', 'career_titles', 'career_ids', 'catalog_hash',
+        'career_vectors', 'career_vectors_t', 'inverted_index', 'ivf_index',
+        # Field-blocked matrices: block names and default query-time weights
+        # (None for a single block per career document; see career_fields)
+        'fields', 'field_weights',
+        # Cache key parts: model_version changes with the career vectors,
+        # result_generation whenever cached results become stale
+        'model_version', 'result_generation',
+        # Career-side reasoning features, one entry per career row
+        'career_keyword_texts', 'career_skill_sets', 'career_educations',
+        'career_growth_rates', 'career_salaries', 'career_outlook_texts',
+        # Career x skill incidence matrix; columns are lowercased skill names
+        'career_skill_matrix', 'skill_careers', 'career_skill_counts',
+        'inverse_skill_counts', 'skill_coverage_careers', 'skill_columns',
+        'skill_id_columns',
+        # Hybrid ranking feature columns (see RANKING_FEATURES)
+        'ranking_features', 'ranking_features_t', 'career_industry_codes',
+        'industry_names',
+    )
+    
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.pop(name, None))
+        if fields:
+            raise TypeError(f"Unknown snapshot fields: {', '.join(fields)}")
+    
+    @classmethod
+    def empty(cls, vectorizer):
+        """Snapshot of an engine that has not been fitted yet"""
+        ranking_features = np.empty((0, len(RANKING_FEATURES)))
+        return cls(
+            vectorizer=vectorizer, careers=[], career_titles=[],
+            model_version=0, result_generation=0,
+            career_keyword_texts=[], career_skill_sets=[], career_educations=[],
+            career_growth_rates=np.empty(0), career_salaries=np.empty(0), career_outlook_texts=[],
+            career_skill_counts=np.empty(0), inverse_skill_counts=np.empty(0),
+            skill_columns={}, skill_id_columns={},
+            ranking_features=ranking_features, ranking_features_t=ranking_features.T,
+            career_industry_codes=np.empty(0, dtype=np.intp), industry_names=[],
+        )
+    
+    def term_count(self):
+        """Width of a user vector: the vocabulary size, one block of the career matrix"""
+        return self.career_vectors.shape[1] // len(self.fields or (None,))
+    
+    def has_careers(self):
+        """True if vector rows map to careers: the careers were set, or the model has their ids"""
+        return bool(self.careers) or (self.career_ids is not None and len(self.career_ids) > 0)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"EngineSnapshot is immutable; use replace() to change '{name}'")
+    
+    def replace(self, **changes):
+        """Return a new snapshot with the given fields replaced"""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return EngineSnapshot(**fields)
+
+class UserReasoningContext:
+    """User data shared by the lazy results of one user; its features are extracted at most once."""
+    __slots__ = ('user_data', 'snapshot', '_features', '_skill_overlap')
+    
+    def __init__(self, user_data, features=None, snapshot=None):
+        self.user_data = user_data
+        self.snapshot = snapshot
+        self._features = features
+        self._skill_overlap = None
+    
+    def get_features(self, engine):
+        if self._features is None:
+            self._features = engine.extract_user_features(self.user_data)
+        return self._features
+    
+    def get_skill_overlap(self, engine):
+        if self._skill_overlap is None:
+            self._skill_overlap = engine.get_skill_overlap(self.user_data, self.snapshot)
+        return self._skill_overlap
+
+class CareerMatch:
+    """
+    A recommended career whose reasoning is only generated when it is read
+    
+    Unpacks like the (career, score, reasoning) tuples returned by default,
+    so existing callers keep working; callers that only need careers and
+    scores never pay for the reasoning text.
+    """
+    __slots__ = ('career', 'score', 'index', '_engine', '_context', '_reasoning')
+    
+    def __init__(self, engine, career, score, index, context):
+        self.career = career
+        self.score = score
+        self.index = index
+        self._engine = engine
+        self._context = context
+        self._reasoning = None
+    
+    @property
+    def reasoning(self):
+        """Explanation of the match, generated on first access."""
+        return self.explain()
+    
+    def explain(self):
+        """Generate (once) and return the explanation of the match."""
+        if self._reasoning is None:
+            self._reasoning = self._engine.generate_recommendation_reasoning(
+                self.career, self._context.user_data, self.score, index=self.index,
+                user_features=self._context.get_features(self._engine), snapshot=self._context.snapshot)
+        return self._reasoning
+    
+    @property
+    def skill_overlap(self):
+        """(number of the career's skills the user has, fraction of the career's skills covered)."""
+        counts, coverage = self._context.get_skill_overlap(self._engine)
+        return int(counts[self.index]), float(coverage[self.index])
+    
+    def __iter__(self):
+        return iter((self.career, self.score, self.reasoning))
+    
+    def __getitem__(self, item):
+        # Look fields up by name so match[0] and match[1] never build the reasoning
+        names = ('career', 'score', 'reasoning')[item]
+        if isinstance(item, slice):
+            return tuple(getattr(self, name) for name in names)
+        return getattr(self, names)
+    
+    def __len__(self):
+        return 3
+    
+    def __repr__(self):
+        return f'<CareerMatch {self.index} score={self.score:.3f}>'
+
 class CareerRecommendationEngine:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(stop_words='english')
-        self.careers = []
-        self.career_vectors = None
-        self.career_titles = []
+    def __init__(self, retrieval_mode='exhaustive', n_clusters=None, nprobe=8,
+                 user_vector_cache_size=1024, user_vector_cache_ttl=None,
+                 result_cache_size=1024, result_cache_ttl=None, n_jobs=1, field_weights=None,
+                 compact=False, catalog_session=None, hybrid_candidates=HYBRID_CANDIDATE_FACTOR):
+        """
+        Args:
+            retrieval_mode: 'exhaustive' scores every career; 'inverted' uses an
+                inverted index with exact MaxScore top-k pruning, so latency
+                scales with the postings touched rather than the catalog size;
+                'ivf' clusters the careers and scans only the nprobe clusters
+                closest to the user (approximate, for very large catalogs)
+            n_clusters: Number of IVF clusters (defaults to sqrt of the career count)
+            nprobe: Number of IVF clusters scanned per request
+            user_vector_cache_size: Number of user vectors kept in the LRU
+                cache (0 disables it)
+            user_vector_cache_ttl: Seconds a cached user vector stays valid
+                (None for no expiry)
+            result_cache_size: Number of recommendation results kept in the
+                LRU cache (0 disables it)
+            result_cache_ttl: Seconds a cached result stays valid (None for
+                no expiry)
+            n_jobs: Processes used to tokenize the corpus when fitting (1
+                fits in-process, -1 uses every CPU; see parallel_vectorizer)
+            field_weights: None fits one block per career document; a
+                dictionary of weights by field name (possibly empty) fits a
+                field-blocked matrix and sets its default query-time weights
+                (see career_fields)
+            compact: Fit career and user vectors as float32 values with int32
+                indices instead of float64, halving their memory; loaded
+                models keep the dtype they were saved with
+            catalog_session: SQLAlchemy session a loaded model fetches the
+                careers of its results with (defaults to the session of the
+                current application context; see lookup_careers)
+            hybrid_candidates: With an 'inverted' or 'ivf' retrieval mode,
+                users with preferences get the top_n * hybrid_candidates most
+                similar careers from the index, reranked with their
+                preferences; None scores every career for them instead
+        """
+        if retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {retrieval_mode}")
+        
+        self.retrieval_mode = retrieval_mode
+        self.n_clusters = n_clusters
+        self.nprobe = nprobe
+        self.n_jobs = n_jobs
+        self.field_weight_settings = field_weights
+        self.compact = compact
+        self.catalog_session = catalog_session
+        self.hybrid_candidates = hybrid_candidates
+        self.vector_dtype = np.float32 if compact else np.float64
+        
+        # Fitted state; its fields are also readable as engine attributes
+        self.snapshot = EngineSnapshot.empty(TfidfVectorizer(stop_words='english', dtype=self.vector_dtype))
+        
+        # Serializes writers; readers never take it
+        self._write_lock = threading.Lock()
+        
+        # User vectors keyed by (model version, hash of the normalized user document)
+        self.user_vector_cache = LRUCache(user_vector_cache_size, user_vector_cache_ttl)
+        
+        # Top-n results keyed by (model version, result generation, user
+        # profile, request options); see get_career_recommendations
+        self.result_cache = LRUCache(result_cache_size, result_cache_ttl)
+        
+    def publish(self, invalidate_results=False, **changes):
+        """
+        Replace fields of the fitted state with one atomic snapshot swap
         
+        Expensive state should be computed before calling this; only the
+        copy of the current snapshot happens under the write lock.
+        
+        Args:
+            invalidate_results: Also start a new result cache generation
+            **changes: EngineSnapshot fields to replace
+        """
+        with self._write_lock:
+            if invalidate_results:
+                changes['result_generation'] = self.snapshot.result_generation + 1
+            self.snapshot = self.snapshot.replace(**changes)
+        return self.snapshot
+    
     def preprocess_text(self, text):
-        """Preprocess text by removing punctuation, numbers, and stopwords."""
-        if not text:
-            return ""
-            
-        try:
-            # Convert to lowercase
-            text = text.lower()
-            
-            # Remove punctuation
-            text = re.sub(f'[{string.punctuation}]', ' ', text)
-            
-            # Remove numbers
-            text = re.sub(r'\d+', '', text)
-            
-            # Remove extra whitespace
-            text = re.sub(r'\s+', ' ', text).strip()
-            
-            return text
-        except Exception as e:
-            logger.error(f"Error preprocessing text: {e}")
-            return text or ""
+        """Preprocess text by removing punctuation and numbers (see text_normalizer)."""
+        return normalize_text(text)
     
-    def create_career_vectors(self, careers):
+    def create_career_vectors(self, careers, n_jobs=None):
         """
         Create TF-IDF vectors for careers
         
+        careers may be any iterable, such as catalog_loader.iter_catalog():
+        documents are built and normalized CORPUS_CHUNK_SIZE at a time and
+        streamed into the vectorizer, so the raw corpus is never held in
+        memory as a whole. With several jobs the chunks are normalized,
+        tokenized and counted in worker processes instead. For a
+        field-blocked engine the vectorizer is fit on the whole documents and
+        each field is then transformed into its own block.
+        
+        The new vectorizer, vectors and careers are published together in one
+        snapshot, so requests served meanwhile keep using the previous fit.
+        
         Args:
-            careers: List of career objects or dictionaries with title, description, and skills
+            careers: Iterable of career objects, CareerRecords or dictionaries
+                with title, description, and skills
+            n_jobs: Worker processes (defaults to the engine's n_jobs)
         """
-        self.careers = careers
+        n_jobs = self.n_jobs if n_jobs is None else n_jobs
+        careers = iter(careers)
+        first_career = next(careers, None)
+        if first_career is None:
+            # No rows to fit or normalize: publish an unfitted, empty state
+            logger.warning("No careers to vectorize; the engine has no careers to recommend")
+            empty = EngineSnapshot.empty(clone(self.snapshot.vectorizer))
+            self.publish(invalidate_results=True, model_version=next(_model_versions),
+                         **{name: getattr(empty, name) for name in EngineSnapshot.__slots__
+                            if name not in ('model_version', 'result_generation')})
+            self.user_vector_cache.clear()
+            return
+        careers = itertools.chain((first_career,), careers)
         
-        # Prepare document corpus for each career
-        career_documents = []
-        self.career_titles = []
-        
-        for career in careers:
-            # Check if career is a dictionary (from Kaggle dataset) or an object (from database)
-            if isinstance(career, dict):
-                # For dictionary data (from Kaggle dataset)
-                title = career.get('title', '')
-                description = career.get('description', '')
-                skills = career.get('skills', '')
-                interests = career.get('interests', '')
-                requirements = career.get('requirements', '')
-                
-                document = f"{title} {description} {skills} {interests} {requirements}"
-                document = self.preprocess_text(document)
-                
-                career_documents.append(document)
-                self.career_titles.append(title)
-            else:
-                # For database objects
-                # Combine title, description, and skills
-                skill_text = ' '.join([skill.name + ' ' + (skill.description or '') for skill in career.skills]) if hasattr(career, 'skills') else ''
-                
-                document = f"{career.title} {career.description or ''} {skill_text} {career.education_required or ''} {career.work_environment or ''}"
-                document = self.preprocess_text(document)
-                
-                career_documents.append(document)
-                self.career_titles.append(career.title)
+        records, career_titles = [], []
+        document_chunks = self.iter_career_document_chunks(careers, records, career_titles)
         
+        # Fit a fresh copy: the published vectorizer may be in use by requests
+        vectorizer = clone(self.snapshot.vectorizer).set_params(dtype=self.vector_dtype)
         try:
-            # Create TF-IDF vectors
-            self.career_vectors = self.vectorizer.fit_transform(career_documents)
-            logger.info(f"Created TF-IDF vectors for {len(careers)} careers")
+            documents = (document for chunk in document_chunks for document in normalize_corpus(chunk))
+            if resolve_n_jobs(n_jobs) > 1:
+                career_vectors = parallel_fit_transform(vectorizer, document_chunks, n_jobs)
+            elif self.field_weight_settings is not None:
+                # The whole-document matrix is not used: only fit the vocabulary and idf
+                vectorizer.fit(documents)
+            else:
+                career_vectors = vectorizer.fit_transform(documents)
+            
+            if self.field_weight_settings is not None:
+                vector_state = self.build_vector_state(self.build_field_blocks(vectorizer, records),
+                                                       fields=CAREER_FIELDS)
+            else:
+                vector_state = self.build_vector_state(career_vectors)
+            logger.info(f"Created TF-IDF vectors for {len(records)} careers")
         except Exception as e:
             logger.error(f"Error creating career vectors: {e}")
             # Initialize with empty vectors as fallback
-            self.career_vectors = np.zeros((len(careers), 1))
+            vector_state = self.build_vector_state(np.zeros((len(records), 1)))
+        
+        career_state = self.build_career_state(records)
+        career_ids = [career.get('id') if isinstance(career, dict) else career.id for career in records]
+        # Only careers from the database can be checked against it when the model is loaded
+        fingerprint = catalog_hash(records) if None not in career_ids else None
+        self.publish(invalidate_results=True, vectorizer=vectorizer, career_titles=career_titles,
+                     career_ids=np.array([-1 if career_id is None else career_id for career_id in career_ids],
+                                         dtype=np.int64),
+                     catalog_hash=fingerprint, **career_state, **vector_state)
+        self.user_vector_cache.clear()
+    
+    def iter_career_document_chunks(self, careers, records, career_titles, chunk_size=None):
+        """
+        Yield the raw documents of the careers in lists of chunk_size
+        
+        As careers are consumed, their CareerRecords (or dictionaries) and
+        titles are appended to records and career_titles.
+        
+        Args:
+            careers: Iterable of career objects, CareerRecords or dictionaries
+            records: List receiving the careers, in document order
+            career_titles: List receiving the career titles
+            chunk_size: Documents per chunk (default CORPUS_CHUNK_SIZE)
+        """
+        chunk_size = chunk_size or CORPUS_CHUNK_SIZE
+        chunk = []
+        for career in careers:
+            career = as_career_record(career)
+            title, document = self.career_document(career)
+            records.append(career)
+            career_titles.append(title)
+            chunk.append(document)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    @staticmethod
+    def career_document(career):
+        """Return the title and raw TF-IDF document text of a career dictionary or CareerRecord"""
+        # Check if career is a dictionary (from Kaggle dataset) or a record (from database)
+        if isinstance(career, dict):
+            # For dictionary data (from Kaggle dataset)
+            title = career.get('title', '')
+            description = career.get('description', '')
+            skills = career.get('skills', '')
+            interests = career.get('interests', '')
+            requirements = career.get('requirements', '')
+            
+            return title, f"{title} {description} {skills} {interests} {requirements}"
+        
+        # For career records (copied from database objects)
+        # Combine title, description, and skills
+        skill_text = ' '.join([name + ' ' + description
+                               for name, description in zip(career.skill_names, career.skill_descriptions, strict=True)])
+        
+        document = f"{career.title} {career.description or ''} {skill_text} {career.education_required or ''} {career.work_environment or ''}"
+        return career.title, document
+    
+    @staticmethod
+    def career_field_documents(career):
+        """Return the raw text of every field of CAREER_FIELDS for a career dictionary or CareerRecord"""
+        if isinstance(career, dict):
+            return (
+                career.get('title', ''),
+                f"{career.get('description', '')} {career.get('interests', '')}",
+                f"{career.get('skills', '')}",
+                career.get('requirements', ''),
+            )
+        
+        skill_text = ' '.join([name + ' ' + description
+                               for name, description in zip(career.skill_names, career.skill_descriptions, strict=True)])
+        return (
+            career.title,
+            career.description or '',
+            skill_text,
+            f"{career.education_required or ''} {career.work_environment or ''}",
+        )
+    
+    def build_field_blocks(self, vectorizer, careers):
+        """
+        Transform every field of the careers with a fitted vectorizer and
+        stack the blocks horizontally (see career_fields)
+        
+        Returns:
+            CSR matrix of shape (len(careers), len(CAREER_FIELDS) * n_terms)
+        """
+        field_documents = zip(*(self.career_field_documents(career) for career in careers), strict=True)
+        return sparse.hstack([vectorizer.transform(normalize_corpus(list(documents)))
+                              for documents in field_documents], format='csr')
+    
+    def set_career_vectors(self, career_vectors, career_vectors_t=None, clustering=None):
+        """
+        Publish a new career matrix (see build_vector_state)
+        """
+        self.publish(**self.build_vector_state(career_vectors, career_vectors_t, clustering))
+        self.user_vector_cache.clear()
+    
+    def build_vector_state(self, career_vectors, career_vectors_t=None, clustering=None, fields=None,
+                           field_weights=None):
+        """
+        Prepare the career matrix in the layouts used for scoring
+        
+        Rows are L2-normalized once here, so cosine similarity reduces to a raw
+        sparse dot product at request time. Alongside the row-major CSR matrix
+        the engine keeps a term-major copy (the CSC layout of career_vectors,
+        held as the CSR transpose) so a user vector multiplies it directly,
+        touching only the postings of the user's terms. The blocks of a
+        field-blocked matrix are normalized separately.
+        
+        Args:
+            career_vectors: Career-major TF-IDF matrix
+            career_vectors_t: Term-major copy of an already normalized matrix
+                (as stored in a model directory); both are used as given, so
+                memory-mapped arrays are not copied
+            clustering: Optional (centroids, assignments) to reuse for the IVF index
+            fields: Block names of a field-blocked matrix, or None
+            field_weights: Stored default weights of the fields, overridden
+                by the engine's field_weights
+            
+        Returns:
+            Dict of EngineSnapshot fields, with a new model_version
+        """
+        if fields is not None:
+            fields = tuple(fields)
+            field_weights = field_weight_vector(fields, self.field_weight_settings, base=field_weights)
+        
+        if career_vectors_t is None:
+            if fields is not None:
+                career_vectors = normalize_field_blocks(career_vectors, len(fields), copy=False,
+                                                        dtype=self.vector_dtype)
+            else:
+                career_vectors = sparse.csr_matrix(career_vectors, dtype=self.vector_dtype)
+                career_vectors = normalize(career_vectors, norm='l2', copy=False)
+                career_vectors.sort_indices()
+            career_vectors_t = career_vectors.T.tocsr()
+            career_vectors_t.sort_indices()
+            if self.compact:
+                career_vectors, career_vectors_t = compact_csr(career_vectors), compact_csr(career_vectors_t)
+        
+        inverted_index = ivf_index = None
+        if self.retrieval_mode == 'inverted':
+            inverted_index = InvertedIndex(career_vectors_t)
+        elif self.retrieval_mode == 'ivf':
+            centroids, assignments = clustering if clustering is not None else (None, None)
+            ivf_index = IVFIndex(career_vectors, n_clusters=self.n_clusters,
+                                 centroids=centroids, assignments=assignments)
+        
+        return {
+            'career_vectors': career_vectors,
+            'career_vectors_t': career_vectors_t,
+            'inverted_index': inverted_index,
+            'ivf_index': ivf_index,
+            'fields': fields,
+            'field_weights': field_weights,
+            'model_version': next(_model_versions),
+        }
+    
+    def set_field_weights(self, field_weights):
+        """
+        Change the default query-time field weights, without refitting
+        
+        Cached user vectors stay valid; cached results are invalidated. The
+        weights are also used by later fits.
+        
+        Args:
+            field_weights: Dictionary of weights by field name (see career_fields)
+        """
+        self.field_weight_settings = field_weights
+        snapshot = self.snapshot
+        if snapshot.fields is not None:
+            self.publish(invalidate_results=True, field_weights=field_weight_vector(snapshot.fields, field_weights))
+    
+    def query_vectors(self, user_vectors, user_data_list, snapshot=None):
+        """
+        Expand user vectors to the layout of the career matrix
+        
+        For a field-blocked matrix, row i is scaled per field by the
+        snapshot's default weights, overridden by
+        user_data_list[i]['field_weights'] when given (e.g. per tenant).
+        Single-block matrices use the user vectors as they are.
+        
+        Args:
+            user_vectors: User TF-IDF rows
+            user_data_list: User data dictionary of every row
+            snapshot: EngineSnapshot to use (defaults to the current one)
+        """
+        snapshot = snapshot or self.snapshot
+        if snapshot.fields is None:
+            return user_vectors
+        
+        overrides = [user_data.get('field_weights') for user_data in user_data_list]
+        if not any(overrides):
+            return field_query_vectors(user_vectors, snapshot.field_weights)
+        weights = np.array([field_weight_vector(snapshot.fields, override, base=snapshot.field_weights)
+                            for override in overrides])
+        return field_query_vectors(user_vectors, weights)
+    
+    def score_user_vectors(self, user_vectors, snapshot=None):
+        """
+        Score user vectors against every career
+        
+        User vectors come from the same TF-IDF vectorizer and are already
+        L2-normalized, so the dot product with the normalized career rows is
+        their cosine similarity.
+        
+        Args:
+            user_vectors: Sparse user TF-IDF rows
+            snapshot: EngineSnapshot to use (defaults to the current one)
+        
+        Returns:
+            Dense array of shape (n_users, n_careers)
+        """
+        snapshot = snapshot or self.snapshot
+        career_vectors_t = snapshot.career_vectors_t
+        if sparse.issparse(user_vectors) and user_vectors.dtype != career_vectors_t.dtype:
+            # Sparse products need matching dtypes (compact float32 models)
+            user_vectors = user_vectors.astype(career_vectors_t.dtype)
+        return np.asarray(safe_sparse_dot(user_vectors, career_vectors_t, dense_output=True))
+    
+    def find_top_careers(self, user_vector, top_n, snapshot=None):
+        """
+        Find the best matching careers for one user vector
+        
+        Returns:
+            (career indices, scores) arrays, best first
+        """
+        snapshot = snapshot or self.snapshot
+        if snapshot.inverted_index is not None and sparse.issparse(user_vector):
+            return snapshot.inverted_index.search(user_vector, top_n)
+        if snapshot.ivf_index is not None and sparse.issparse(user_vector):
+            return snapshot.ivf_index.search(user_vector, top_n, nprobe=self.nprobe)
+        
+        similarities = self.score_user_vectors(user_vector, snapshot).ravel()
+        top_indices = top_k_indices(similarities, top_n)
+        return top_indices, similarities[top_indices]
     
-    def create_user_vector(self, user_data):
+    def find_top_hybrid_careers(self, user_vector, user_data, top_n, snapshot=None):
+        """
+        Find the best careers for one user by hybrid score (see hybrid_scores)
+        
+        In the exhaustive retrieval mode, or with hybrid_candidates set to
+        None, every career is scored. Otherwise the inverted or IVF index
+        returns the top_n * hybrid_candidates most similar careers and only
+        those are reranked, so a career far down the similarity ranking
+        cannot be lifted into the results by its features alone.
+        
+        Returns:
+            (career indices, scores) arrays, best first
+        """
+        snapshot = snapshot or self.snapshot
+        indexed = snapshot.inverted_index is not None or snapshot.ivf_index is not None
+        if self.hybrid_candidates is None or not indexed:
+            similarities = self.score_user_vectors(user_vector, snapshot)
+            scores = self.hybrid_scores(similarities, [user_data], snapshot)[0]
+            top_indices = top_k_indices(scores, top_n)
+            return top_indices, scores[top_indices]
+        
+        candidates, similarities = self.find_top_careers(user_vector, top_n * self.hybrid_candidates, snapshot)
+        scores = self.hybrid_scores(similarities[None, :], [user_data], snapshot, columns=candidates)[0]
+        order = top_k_indices(scores, top_n)
+        return candidates[order], scores[order]
+    
+    def build_user_document(self, user_data):
+        """
+        Build the preprocessed text document for a user
+        
+        Args:
+            user_data: Dictionary containing user skills, interests, etc.
+        """
+        # Skills may be Skill objects or plain skill names
+        skill_parts = []
+        for skill in user_data.get('skills', []) or []:
+            if hasattr(skill, 'name'):
+                skill_parts.append(skill.name + ' ' + (skill.description or ''))
+            elif isinstance(skill, str):
+                skill_parts.append(skill)
+        skills_text = ' '.join(skill_parts)
+        
+        interests = user_data.get('interests', '') or ''
+        strengths = user_data.get('strengths', '') or ''
+        personality = user_data.get('personality_traits', '') or ''
+        education = user_data.get('education_level', '') or ''
+        
+        user_document = f"{skills_text} {interests} {strengths} {personality} {education}"
+        return self.preprocess_text(user_document)
+    
+    def create_user_vector(self, user_data, snapshot=None):
         """
         Create a TF-IDF vector from user assessment data
         
         Args:
             user_data: Dictionary containing user skills, interests, etc.
+            snapshot: EngineSnapshot to use (defaults to the current one)
         """
-        if not self.vectorizer or not self.career_vectors:
+        snapshot = snapshot or self.snapshot
+        if not snapshot.vectorizer or snapshot.career_vectors is None:
             logger.error("Vectorizer not initialized. Please call create_career_vectors first.")
             return None
         
         try:
             # Combine user data into a single document
-            skills_text = ' '.join([skill.name + ' ' + (skill.description or '') for skill in user_data.get('skills', [])])
-            interests = user_data.get('interests', '')
-            strengths = user_data.get('strengths', '')
-            personality = user_data.get('personality_traits', '')
-            education = user_data.get('education_level', '')
-            
-            user_document = f"{skills_text} {interests} {strengths} {personality} {education}"
-            user_document = self.preprocess_text(user_document)
-            
-            # Transform using the vectorizer fit on career data
-            user_vector = self.vectorizer.transform([user_document])
-            return user_vector
+            return self.vectorize_user_document(self.build_user_document(user_data), snapshot=snapshot)
         
         except Exception as e:
             logger.error(f"Error creating user vector: {e}")
             # Return a zero vector as fallback
-            return np.zeros((1, self.career_vectors.shape[1]))
+            return np.zeros((1, snapshot.term_count()))
+    
+    def vectorize_user_document(self, user_document, document_hash=None, snapshot=None):
+        """
+        Transform a preprocessed user document, reusing the vector of an
+        identical document for this model
+        
+        Args:
+            user_document: Document built by build_user_document
+            document_hash: document_key(user_document), if already computed
+            snapshot: EngineSnapshot to use (defaults to the current one)
+        """
+        snapshot = snapshot or self.snapshot
+        cache_key = (snapshot.model_version, document_hash or document_key(user_document))
+        user_vector = self.user_vector_cache.get(cache_key)
+        if user_vector is None:
+            # Transform using the vectorizer fit on career data
+            user_vector = snapshot.vectorizer.transform([user_document])
+            self.user_vector_cache.put(cache_key, user_vector)
+        return user_vector
+    
+    def create_user_vectors(self, user_data_list, snapshot=None):
+        """
+        Create TF-IDF vectors for many users with a single transform call
+        
+        Args:
+            user_data_list: List of user data dictionaries
+            snapshot: EngineSnapshot to use (defaults to the current one)
+            
+        Returns:
+            Sparse matrix with one row per user, or None if the vectorizer is not ready
+        """
+        snapshot = snapshot or self.snapshot
+        if not snapshot.vectorizer or snapshot.career_vectors is None:
+            logger.error("Vectorizer not initialized. Please call create_career_vectors first.")
+            return None
+        
+        try:
+            user_documents = [self.build_user_document(user_data) for user_data in user_data_list]
+            
+            # Transform only the profiles that are not cached, in one call
+            cache_keys = [(snapshot.model_version, document_key(document)) for document in user_documents]
+            rows = [self.user_vector_cache.get(cache_key) for cache_key in cache_keys]
+            missing = [i for i, row in enumerate(rows) if row is None]
+            if missing:
+                transformed = snapshot.vectorizer.transform([user_documents[i] for i in missing])
+                for position, i in enumerate(missing):
+                    rows[i] = transformed[position]
+                    self.user_vector_cache.put(cache_keys[i], rows[i])
+                if len(missing) == len(rows):
+                    return transformed
+            return sparse.vstack(rows, format='csr')
+        except Exception as e:
+            logger.error(f"Error creating user vectors: {e}")
+            return np.zeros((len(user_data_list), snapshot.term_count()))
     
-    def get_career_recommendations(self, user_data, top_n=5):
+    def get_career_recommendations(self, user_data, top_n=5, lazy_reasoning=False):
         """
         Get career recommendations for a user
         
+        When user_data has 'preferences' (a UserPreference or dictionary), the
+        ranking blends similarity with preference-weighted career features
+        (see hybrid_scores).
+        
+        Results are deterministic for a given model, user document, reasoning
+        inputs, preferences and top_n, so they are served from result_cache
+        when the same request was answered before. Refitting the model changes
+        model_version and invalidate_results() bumps result_generation, so
+        stale entries are never read and simply age out of the LRU.
+        
+        The whole request runs against the snapshot current when it starts.
+        
         Args:
             user_data: Dictionary containing user skills, interests, etc.
             top_n: Number of recommendations to return
+            lazy_reasoning: Return CareerMatch objects whose reasoning is only
+                generated when read, for callers that need careers and scores
             
         Returns:
-            List of (career, score, reasoning) tuples
+            List of (career, score, reasoning) tuples, or of CareerMatch
+            objects with lazy_reasoning. Careers fit from the database are
+            CareerRecords. A loaded model without set_careers fetches the
+            records of its results by id (see lookup_careers).
         """
-        if not self.careers or self.career_vectors is None:
+        snapshot = self.snapshot
+        if not snapshot.has_careers() or snapshot.career_vectors is None:
             logger.error("Career vectors not initialized. Please call create_career_vectors first.")
             return []
         
         try:
-            # Create user vector
-            user_vector = self.create_user_vector(user_data)
+            user_document = self.build_user_document(user_data)
+            document_hash = document_key(user_document)
+            user_features = self.extract_user_features(user_data)
+            cache_key = (snapshot.model_version, snapshot.result_generation, document_hash, top_n,
+                         lazy_reasoning, self.result_profile_key(user_data, user_features))
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                results, compute_seconds = cached
+                self.result_cache.record_saved_time(compute_seconds)
+                return list(results)
             
-            if user_vector is None:
-                logger.error("Failed to create user vector")
-                return []
+            start_time = time.perf_counter()
             
-            # Calculate cosine similarity between user and careers
-            similarities = cosine_similarity(user_vector, self.career_vectors).flatten()
+            # Create user vector
+            user_vector = self.vectorize_user_document(user_document, document_hash, snapshot)
+            user_vector = self.query_vectors(user_vector, [user_data], snapshot)
             
-            # Get top N career indices
-            top_indices = similarities.argsort()[-top_n:][::-1]
+            if user_data.get('preferences') is not None:
+                top_indices, top_scores = self.find_top_hybrid_careers(user_vector, user_data, top_n, snapshot)
+            else:
+                # Find the top N careers by cosine similarity
+                top_indices, top_scores = self.find_top_careers(user_vector, top_n, snapshot)
             
             # Create recommendation list
-            recommendations = []
-            for idx in top_indices:
-                career = self.careers[idx]
-                score = similarities[idx]
-                
-                # Generate reasoning
-                reasoning = self.generate_recommendation_reasoning(career, user_data, score)
-                
-                recommendations.append((career, float(score), reasoning))
+            results = self.build_recommendations(user_data, top_indices, top_scores,
+                                                 lazy_reasoning, user_features, snapshot)
             
-            return recommendations
+            compute_seconds = time.perf_counter() - start_time
+            self.result_cache.record_compute_time(compute_seconds)
+            self.result_cache.put(cache_key, (tuple(results), compute_seconds))
+            return results
         
+        except CatalogSessionError:
+            # A misconfigured caller, not a failed request: don't hide it behind no results
+            raise
         except Exception as e:
             logger.error(f"Error getting career recommendations: {e}")
             return []
     
-    def generate_recommendation_reasoning(self, career, user_data, score):
-        """Generate an explanation for why a career was recommended."""
+    def result_profile_key(self, user_data, user_features):
+        """
+        Hashable summary of the user data that affects a result beyond the
+        user document: the reasoning inputs and the ranking preferences
+        
+        Args:
+            user_data: Dictionary containing user skills, interests, etc.
+            user_features: extract_user_features(user_data)
+        """
+        user_skills, user_education, interest_keywords = user_features
+        preferences = user_data.get('preferences')
+        preference_key = None
+        if preferences is not None:
+            preference_key = tuple(
+                tuple(value) if isinstance(value, (list, tuple, set)) else value
+                for value in (self._preference_value(preferences, name) for name in PREFERENCE_FIELDS)
+            )
+            if user_data.get('industries'):
+                preference_key += (tuple(user_data['industries']),)
+        field_weights = user_data.get('field_weights')
+        return (
+            frozenset(user_skills),
+            user_education,
+            tuple(interest_keywords) if interest_keywords is not None else None,
+            preference_key,
+            tuple(sorted(field_weights.items())) if field_weights else None,
+        )
+    
+    def invalidate_results(self):
+        """
+        Invalidate every cached recommendation result in O(1)
+        
+        Called when the career catalog changes without a refit; old entries
+        are no longer reachable and are evicted by the LRU as new ones arrive.
+        """
+        self.publish(invalidate_results=True)
+    
+    def get_cache_stats(self):
+        """Return the model version and the user vector and result cache metrics"""
+        snapshot = self.snapshot
+        return {
+            'model_version': snapshot.model_version,
+            'result_generation': snapshot.result_generation,
+            'user_vector_cache': self.user_vector_cache.stats(),
+            'result_cache': self.result_cache.stats(),
+        }
+    
+    def get_career_recommendations_batch(self, user_data_list, top_n=5, lazy_reasoning=False):
+        """
+        Get career recommendations for many users at once
+        
+        All user vectors are built with one transform call and scored against
+        the careers with a single matrix product, followed by a per-row top-N
+        selection. Batches are always scored exhaustively, whatever the
+        retrieval mode.
+        
+        Args:
+            user_data_list: List of user data dictionaries
+            top_n: Number of recommendations to return per user
+            lazy_reasoning: Return CareerMatch objects whose reasoning is only
+                generated when read (see get_career_recommendations)
+            
+        Returns:
+            List with one list of (career, score, reasoning) tuples (or
+            CareerMatch objects) per user
+        """
+        snapshot = self.snapshot
+        if not snapshot.has_careers() or snapshot.career_vectors is None:
+            logger.error("Career vectors not initialized. Please call create_career_vectors first.")
+            return [[] for _ in user_data_list]
+        
+        if not user_data_list:
+            return []
+        
+        try:
+            user_vectors = self.create_user_vectors(user_data_list, snapshot)
+            
+            if user_vectors is None:
+                logger.error("Failed to create user vectors")
+                return [[] for _ in user_data_list]
+            user_vectors = self.query_vectors(user_vectors, user_data_list, snapshot)
+            
+            # Calculate cosine similarity between every user and every career,
+            # blended with the career features for users with preferences
+            similarities = self.score_user_vectors(user_vectors, snapshot)
+            similarities = self.hybrid_scores(similarities, user_data_list, snapshot)
+            
+            # Select the top N careers of each row without sorting whole rows
+            top_indices = top_k_indices(similarities, top_n)
+            
+            top_scores = np.take_along_axis(similarities, top_indices, axis=1)
+            
+            # Resolve the careers of every user's rows in one lookup
+            careers = self.lookup_careers(top_indices.ravel(), snapshot)
+            n_top = top_indices.shape[1]
+            return [
+                self.build_recommendations(user_data, top_indices[row], top_scores[row], lazy_reasoning,
+                                           snapshot=snapshot, careers=careers[row * n_top:(row + 1) * n_top])
+                for row, user_data in enumerate(user_data_list)
+            ]
+        
+        except CatalogSessionError:
+            raise
+        except Exception as e:
+            logger.error(f"Error getting batch career recommendations: {e}")
+            return [[] for _ in user_data_list]
+    
+    def build_recommendations(self, user_data, top_indices, top_scores, lazy_reasoning=False,
+                              user_features=None, snapshot=None, careers=None):
+        """
+        Turn the top career rows of one user into recommendation results
+        
+        Args:
+            user_features: extract_user_features(user_data), if already computed
+            snapshot: EngineSnapshot the rows were scored with; lazy results
+                keep it for their reasoning
+            careers: lookup_careers(top_indices), if already resolved
+        
+        Returns:
+            List of (career, score, reasoning) tuples, or of CareerMatch
+            objects whose reasoning is generated on first access; rows whose
+            career no longer exists are skipped
+        """
+        snapshot = snapshot or self.snapshot
+        if careers is None:
+            careers = self.lookup_careers(top_indices, snapshot)
+        context = UserReasoningContext(user_data, user_features, snapshot)
+        matches = [
+            CareerMatch(self, career, float(score), int(idx), context)
+            for idx, score, career in zip(top_indices, top_scores, careers, strict=True)
+            if career is not None
+        ]
+        if lazy_reasoning:
+            return matches
+        return [tuple(match) for match in matches]
+    
+    def lookup_careers(self, rows, snapshot=None):
+        """
+        Return the careers of vector rows
+        
+        Rows index snapshot.careers when the careers were set. A model loaded
+        without them maps rows to database ids with an array lookup and
+        fetches the records of those ids only, with one batched query per
+        table, through the engine's catalog_session.
+        
+        Args:
+            rows: Vector row indices
+            snapshot: EngineSnapshot the rows refer to (defaults to the current one)
+        
+        Returns:
+            List of careers aligned with rows (None for careers that no longer exist)
+        
+        Raises:
+            CatalogSessionError: If the careers must be fetched without a
+                catalog_session outside an application context
+        """
+        snapshot = snapshot or self.snapshot
+        rows = np.asarray(rows, dtype=np.intp)
+        if snapshot.careers:
+            return [snapshot.careers[row] for row in rows]
+        if len(rows) == 0:
+            return []
+        return fetch_career_records(np.asarray(snapshot.career_ids)[rows], session=self.catalog_session)
+    
+    def set_careers(self, careers):
+        """
+        Publish the careers behind the vector rows with their precomputed features
+        
+        Args:
+            careers: List of career objects, CareerRecords or dictionaries, in
+                vector row order
+        """
+        # Cached results hold the previous career objects
+        self.publish(invalidate_results=True, **self.build_career_state(careers))
+    
+    def build_career_state(self, careers):
+        """
+        Precompute the reasoning, skill and ranking features of careers
+        
+        Career objects are copied into CareerRecords first, so the engine
+        keeps no ORM instances (and their sessions) alive.
+        
+        Returns:
+            Dict of EngineSnapshot fields, including careers
+        """
+        careers = [as_career_record(career) for career in careers]
+        state = {'careers': careers}
+        state.update(self.build_reasoning_features(careers))
+        state.update(self.build_skill_matrix(careers, state['career_skill_sets']))
+        state.update(self.build_ranking_features(careers, state['career_growth_rates']))
+        return state
+    
+    def build_ranking_features(self, careers, career_growth_rates):
+        """
+        Build the per-career feature columns used by the hybrid ranking
+        
+        Latest demand, growth and remote friendliness are each scaled
+        to [0, 1] (missing values get the column median); industries are
+        stored as integer codes.
+        
+        Returns:
+            Dict of EngineSnapshot fields
+        """
+        extracted = [self.extract_ranking_features(career) for career in careers]
+        demand = np.array([feature[0] for feature in extracted], dtype=np.float64)
+        remote = np.array([feature[2] for feature in extracted], dtype=np.float64)
+        
+        industry_codes = {}
+        career_industry_codes = np.array(
+            [industry_codes.setdefault(feature[1], len(industry_codes)) for feature in extracted],
+            dtype=np.intp
+        )
+        
+        ranking_features = np.column_stack([
+            self._scale_column(np.clip(demand, 0.0, 1.0), scale=False),
+            self._scale_column(career_growth_rates),
+            remote,
+        ]) if careers else np.empty((0, len(RANKING_FEATURES)))
+        
+        return {
+            'ranking_features': ranking_features,
+            'ranking_features_t': np.ascontiguousarray(ranking_features.T),
+            'career_industry_codes': career_industry_codes,
+            'industry_names': list(industry_codes),
+        }
+    
+    def extract_ranking_features(self, career):
+        """
+        Extract the raw hybrid ranking features of one career
+        
+        Returns:
+            (latest demand level or NaN, lowercased industry, remote friendliness)
+        """
+        try:
+            career = as_career_record(career)
+            if isinstance(career, dict):
+                demand = self._parse_number(career.get('demand_level'))
+                industry = (career.get('industry', '') or '').strip().lower()
+                work_environment = (career.get('work_environment', '') or '').lower()
+            else:
+                demand = self._parse_number(career.demand_level)
+                industry = career.industry.strip().lower()
+                work_environment = career.work_environment.lower()
+            
+            remote = max([value for keyword, value in REMOTE_KEYWORDS if keyword in work_environment], default=0.0)
+            return demand, industry, remote
+        
+        except Exception as e:
+            logger.error(f"Error extracting career ranking features: {e}")
+            return np.nan, '', 0.0
+    
+    @staticmethod
+    def _scale_column(values, scale=True):
+        """Min-max scale a feature column to [0, 1]; NaNs become the median of the known values."""
+        values = np.array(values, dtype=np.float64)
+        known = ~np.isnan(values)
+        if not known.any():
+            return np.zeros_like(values)
+        if scale:
+            low, high = values[known].min(), values[known].max()
+            values[known] = (values[known] - low) / (high - low) if high > low else 0.5
+        values[~known] = np.median(values[known])
+        return values
+    
+    @staticmethod
+    def _preference_value(preferences, name, default=None):
+        """Read a preference from a UserPreference object or a dictionary."""
+        if isinstance(preferences, dict):
+            value = preferences.get(name, default)
+        else:
+            value = getattr(preferences, name, default)
+        return default if value is None else value
+    
+    @staticmethod
+    def _parse_salary_range(salary_preference):
+        """Parse a salary preference like '50000-70000' or '$60,000' into (low, high), or None."""
+        if not salary_preference:
+            return None
+        try:
+            parts = [float(part.replace('$', '').replace(',', '').strip())
+                     for part in str(salary_preference).split('-') if part.strip()]
+        except ValueError:
+            return None
+        if not parts:
+            return None
+        return min(parts), max(parts)
+    
+    def preference_weights(self, user_data, snapshot=None):
+        """
+        Weights of the hybrid features for one user
+        
+        job_security weights demand, growth_opportunity weights growth and
+        work_life_balance (or remote_work) weights remote friendliness; the
+        1-10 preference scales map to 0.1-1.0.
+        
+        Returns:
+            (weights of RANKING_FEATURES, salary range or None, industry codes
+            the user asked for); all zero weights when there are no preferences
+        """
+        snapshot = snapshot or self.snapshot
+        weights = np.zeros(len(RANKING_FEATURES))
+        preferences = user_data.get('preferences')
+        if preferences is None:
+            return weights, None, None
+        
+        def scale(name):
+            try:
+                return min(max(float(self._preference_value(preferences, name, 0)), 0.0), 10.0) / 10.0
+            except (TypeError, ValueError):
+                return 0.0
+        
+        weights[RANKING_FEATURES.index('demand')] = scale('job_security')
+        weights[RANKING_FEATURES.index('growth')] = scale('growth_opportunity')
+        remote_weight = scale('work_life_balance')
+        if self._preference_value(preferences, 'remote_work', False):
+            remote_weight = 1.0
+        weights[RANKING_FEATURES.index('remote')] = remote_weight
+        
+        salary_range = self._parse_salary_range(self._preference_value(preferences, 'salary_preference'))
+        
+        industries = user_data.get('industries') or self._preference_value(preferences, 'industries')
+        industry_codes = None
+        if industries:
+            lookup = {name: code for code, name in enumerate(snapshot.industry_names)}
+            industry_codes = [lookup[name.strip().lower()] for name in industries if name.strip().lower() in lookup]
+        
+        return weights, salary_range, industry_codes
+    
+    def hybrid_scores(self, similarities, user_data_list, snapshot=None, columns=None):
+        """
+        Blend TF-IDF similarities with preference-weighted career features
+        
+        For each user, the feature score is the weighted mean of the static
+        feature columns, skill coverage, salary fit and industry match. It is
+        blended in with a share that grows with the user's preference weights
+        (up to HYBRID_FEATURE_WEIGHT), so users without preferences keep their
+        plain similarity scores. Everything is computed with array operations
+        over all careers at once.
+        
+        Args:
+            similarities: Array of shape (n_users, n_careers), or (n_users,
+                len(columns)) with columns
+            user_data_list: The users' data dictionaries
+            snapshot: EngineSnapshot to use (defaults to the current one)
+            columns: Career indices of the similarity columns, or None when
+                similarities cover every career
+            
+        Returns:
+            Blended scores of the same shape as similarities
+        """
+        snapshot = snapshot or self.snapshot
+        similarities = np.atleast_2d(similarities)
+        rows = [row for row, user_data in enumerate(user_data_list) if user_data.get('preferences') is not None]
+        if not rows:
+            return similarities
+        n_careers = similarities.shape[1] if columns is None else snapshot.career_vectors.shape[0]
+        if len(snapshot.ranking_features) != n_careers:
+            # A model loaded without set_careers has no career features
+            logger.warning("Career features not loaded; ranking by similarity only")
+            return similarities
+        
+        ranking_features_t = snapshot.ranking_features_t
+        career_salaries = snapshot.career_salaries
+        career_industry_codes = snapshot.career_industry_codes
+        if columns is not None:
+            ranking_features_t = ranking_features_t[:, columns]
+            career_salaries = career_salaries[columns]
+            career_industry_codes = career_industry_codes[columns]
+        
+        # Static feature columns, weighted per user in one matrix product
+        preferences = [self.preference_weights(user_data_list[row], snapshot) for row in rows]
+        weights = np.array([preference[0] for preference in preferences])
+        total_weights = weights.sum(axis=1) + SKILL_COVERAGE_WEIGHT
+        feature_scores = weights @ ranking_features_t
+        
+        # Skill coverage in one sparse product
+        skill_lists = []
+        for row in rows:
+            skills = user_data_list[row].get('skills') or []
+            skill_lists.append(skills.split(',') if isinstance(skills, str) else skills)
+        coverage = self.compute_skill_coverage(self.create_user_skill_vectors(skill_lists, snapshot), snapshot)
+        if columns is not None:
+            coverage = coverage[:, columns]
+        feature_scores += SKILL_COVERAGE_WEIGHT * coverage
+        
+        for position, (_, salary_range, industry_codes) in enumerate(preferences):
+            if salary_range is not None:
+                low, high = salary_range
+                distance = np.maximum(low - career_salaries, career_salaries - high).clip(min=0)
+                salary_fit = np.nan_to_num(1.0 - np.minimum(distance / max(low, 1.0), 1.0), nan=0.5)
+                feature_scores[position] += SALARY_FIT_WEIGHT * salary_fit
+                total_weights[position] += SALARY_FIT_WEIGHT
+            if industry_codes:
+                feature_scores[position] += INDUSTRY_MATCH_WEIGHT * np.isin(career_industry_codes, industry_codes)
+                total_weights[position] += INDUSTRY_MATCH_WEIGHT
+        
+        # Blend: (1 - share) * similarity + share * weighted mean of the features
+        share = HYBRID_FEATURE_WEIGHT * total_weights / MAX_HYBRID_WEIGHT
+        feature_scores *= (share / total_weights)[:, None]
+        if len(rows) == len(similarities):
+            feature_scores += similarities * (1.0 - share)[:, None]
+            return feature_scores
+        
+        feature_scores += similarities[rows] * (1.0 - share)[:, None]
+        blended = similarities.copy()
+        blended[rows] = feature_scores
+        return blended
+    
+    def build_skill_matrix(self, careers, career_skill_sets):
+        """
+        Build the sparse career x skill incidence matrix (the career_skill table)
+        
+        Skills are matched by lowercased name, like the reasoning text; database
+        skill ids map to the column of their name.
+        
+        Args:
+            careers: CareerRecords or dictionaries
+            career_skill_sets: Lowercased skill names of every career
+                (from build_reasoning_features)
+            
+        Returns:
+            Dict of EngineSnapshot fields
+        """
+        skill_columns = {}
+        rows, columns = [], []
+        for row, skill_names in enumerate(career_skill_sets):
+            for name in skill_names:
+                rows.append(row)
+                columns.append(skill_columns.setdefault(name, len(skill_columns)))
+        
+        skill_id_columns = {}
+        for career in careers:
+            if isinstance(career, CareerRecord):
+                for skill_id, skill_name in zip(career.skill_ids, career.skill_names, strict=True):
+                    column = skill_columns.get((skill_name or '').lower())
+                    if column is not None:
+                        skill_id_columns[skill_id] = column
+        
+        career_skill_matrix = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, columns)),
+            shape=(len(careers), len(skill_columns))
+        )
+        career_skill_matrix.sum_duplicates()
+        career_skill_matrix.data[:] = 1.0
+        
+        # Skill-major copy: a user's skill row times it gives per-career counts
+        skill_careers = career_skill_matrix.T.tocsr()
+        career_skill_counts = np.asarray(career_skill_matrix.sum(axis=1)).ravel()
+        inverse_skill_counts = np.divide(1.0, career_skill_counts,
+                                         out=np.zeros_like(career_skill_counts),
+                                         where=career_skill_counts > 0)
+        
+        return {
+            'career_skill_matrix': career_skill_matrix,
+            'skill_careers': skill_careers,
+            'career_skill_counts': career_skill_counts,
+            'inverse_skill_counts': inverse_skill_counts,
+            # Columns scaled by 1 / career skill count: the product gives coverage directly
+            'skill_coverage_careers': sparse.csr_matrix(skill_careers.multiply(inverse_skill_counts[None, :])),
+            'skill_columns': skill_columns,
+            'skill_id_columns': skill_id_columns,
+        }
+    
+    def create_user_skill_vectors(self, user_skill_lists, snapshot=None):
+        """
+        Build 0/1 skill indicator rows for users
+        
+        Args:
+            user_skill_lists: One list per user of skill ids, Skill objects or skill names
+            snapshot: EngineSnapshot to use (defaults to the current one)
+            
+        Returns:
+            Sparse matrix of shape (n_users, n_skills); skills no career has are ignored
+        """
+        snapshot = snapshot or self.snapshot
+        skill_columns, skill_id_columns = snapshot.skill_columns, snapshot.skill_id_columns
+        rows, columns = [], []
+        for row, user_skills in enumerate(user_skill_lists):
+            for skill in user_skills or []:
+                if isinstance(skill, (int, np.integer)):
+                    column = skill_id_columns.get(int(skill))
+                elif hasattr(skill, 'name'):
+                    column = skill_id_columns.get(getattr(skill, 'id', None))
+                    if column is None:
+                        column = skill_columns.get(skill.name.lower())
+                elif isinstance(skill, str):
+                    column = skill_columns.get(skill.strip().lower())
+                else:
+                    column = None
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+        
+        user_skill_vectors = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, columns)),
+            shape=(len(user_skill_lists), len(skill_columns))
+        )
+        user_skill_vectors.sum_duplicates()
+        user_skill_vectors.data[:] = 1.0
+        return user_skill_vectors
+    
+    def compute_skill_overlap(self, user_skill_vectors, snapshot=None):
+        """
+        Count the skills every user shares with every career in one sparse product
+        
+        Args:
+            user_skill_vectors: Output of create_user_skill_vectors
+            snapshot: EngineSnapshot to use (defaults to the current one)
+            
+        Returns:
+            (counts, coverage) arrays of shape (n_users, n_careers): the number
+            of the career's skills the user has, and that number divided by the
+            career's skill count (0 for careers without skills)
+        """
+        snapshot = snapshot or self.snapshot
+        counts = np.asarray(safe_sparse_dot(user_skill_vectors, snapshot.skill_careers, dense_output=True))
+        return counts, counts * snapshot.inverse_skill_counts
+    
+    def compute_skill_coverage(self, user_skill_vectors, snapshot=None):
+        """Coverage part of compute_skill_overlap, with a single sparse product."""
+        snapshot = snapshot or self.snapshot
+        return np.asarray(safe_sparse_dot(user_skill_vectors, snapshot.skill_coverage_careers, dense_output=True))
+    
+    def get_skill_overlap(self, user_data, snapshot=None):
+        """
+        Skill overlap of one user with every career
+        
+        Args:
+            user_data: Dictionary whose 'skills' are skill ids, Skill objects,
+                names, or a comma-separated string of names
+            snapshot: EngineSnapshot to use (defaults to the current one)
+            
+        Returns:
+            (counts, coverage) arrays of length n_careers
+        """
+        skills = user_data.get('skills') or []
+        if isinstance(skills, str):
+            skills = skills.split(',')
+        snapshot = snapshot or self.snapshot
+        counts, coverage = self.compute_skill_overlap(self.create_user_skill_vectors([skills], snapshot), snapshot)
+        return counts[0], coverage[0]
+    
+    def build_reasoning_features(self, careers):
+        """
+        Precompute the career side of the recommendation reasoning
+        
+        Done once per fit so that explaining a recommendation only costs the
+        user-side work: no text preprocessing, skill relationship loads or
+        market trend queries per request.
+        
+        Returns:
+            Dict of EngineSnapshot fields
+        """
+        features = [self.extract_career_features(career) for career in careers]
+        career_growth_rates = np.array([feature[3] for feature in features], dtype=np.float64)
+        career_salaries = np.array([feature[4] for feature in features], dtype=np.float64)
+        
+        return {
+            # Normalized title and description; a keyword is a substring of one
+            # of the career's words exactly when it is a substring of this text
+            'career_keyword_texts': [feature[0] for feature in features],
+            'career_skill_sets': [feature[1] for feature in features],
+            'career_educations': [feature[2] for feature in features],
+            'career_growth_rates': career_growth_rates,
+            'career_salaries': career_salaries,
+            'career_outlook_texts': [
+                self.render_outlook_text(growth_rate, salary)
+                for growth_rate, salary in zip(career_growth_rates, career_salaries, strict=True)
+            ],
+        }
+    
+    def extract_career_features(self, career):
+        """
+        Extract the career-side reasoning features of one career
+        
+        Returns:
+            (keyword text, skill name set, education text, growth rate, salary);
+            missing numbers are NaN
+        """
         try:
             # Check if career is a dictionary (from Kaggle dataset) or an object (from database)
+            career = as_career_record(career)
             if isinstance(career, dict):
                 # For dictionary data (from Kaggle dataset)
-                career_title = career.get('title', '')
-                career_description = career.get('description', '')
-                career_skills_str = career.get('skills', '')
-                career_skills = set([s.strip().lower() for s in career_skills_str.split(',') if s.strip()]) if career_skills_str else set()
-                career_education = career.get('requirements', '').lower()
-                career_growth_rate = None  # This might not be available from Kaggle data
-                career_salary = None  # This might not be available directly
-                
-                if 'salary' in career:
-                    try:
-                        # Clean salary value (remove commas, currency symbols, etc.)
-                        salary_str = str(career['salary']).replace('$', '').replace(',', '')
-                        career_salary = float(salary_str)
-                    except (ValueError, TypeError):
-                        career_salary = None
-                
-                if 'growth_rate' in career:
-                    try:
-                        # Clean growth rate value (remove % symbol)
-                        growth_str = str(career['growth_rate']).replace('%', '')
-                        career_growth_rate = float(growth_str)
-                    except (ValueError, TypeError):
-                        career_growth_rate = None
+                career_title = career.get('title', '') or ''
+                career_description = career.get('description', '') or ''
+                career_skills_data = career.get('skills', '') or ''
+                if isinstance(career_skills_data, str):
+                    career_skills_data = career_skills_data.split(',')
+                career_skills = frozenset(s.strip().lower() for s in career_skills_data if isinstance(s, str) and s.strip())
+                career_education = (career.get('requirements', '') or '').lower()
+                career_growth_rate = self._parse_number(career.get('growth_rate'), '%')
+                career_salary = self._parse_number(career.get('salary', career.get('avg_salary')), '$,')
             else:
-                # For database objects
-                career_title = career.title
+                # For career records (copied from database objects)
+                career_title = career.title or ''
                 career_description = career.description or ''
-                career_skills = set([skill.name.lower() for skill in career.skills]) if hasattr(career, 'skills') else set()
-                career_education = (career.education_required or '').lower()
-                career_growth_rate = career.growth_rate
-                career_salary = career.avg_salary
-            
-            # Process user skills
-            user_skills = set()
-            if 'skills' in user_data:
-                user_skills_data = user_data['skills']
-                if isinstance(user_skills_data, list):
-                    for skill in user_skills_data:
-                        if hasattr(skill, 'name'):
-                            user_skills.add(skill.name.lower())
-                        elif isinstance(skill, str):
-                            user_skills.add(skill.lower())
-                elif isinstance(user_skills_data, str):
-                    user_skills = set([s.strip().lower() for s in user_skills_data.split(',') if s.strip()])
+                career_skills = frozenset(name.lower() for name in career.skill_names)
+                career_education = career.education_required.lower()
+                career_growth_rate = self._parse_number(career.growth_rate)
+                # Dollar salary, comparable with salary preferences
+                career_salary = self._parse_number(career.salary)
+            
+            keyword_text = self.preprocess_text(career_title + ' ' + career_description)
+            return keyword_text, career_skills, career_education, career_growth_rate, career_salary
+        
+        except Exception as e:
+            logger.error(f"Error extracting career reasoning features: {e}")
+            return '', frozenset(), '', np.nan, np.nan
+    
+    @staticmethod
+    def _parse_number(value, strip_chars=''):
+        """Convert a number or numeric string (e.g. '$85,000', '7%') to float, NaN if missing"""
+        if value is None:
+            return np.nan
+        try:
+            value = str(value)
+            for char in strip_chars:
+                value = value.replace(char, '')
+            return float(value)
+        except (ValueError, TypeError):
+            return np.nan
+    
+    @staticmethod
+    def render_outlook_text(growth_rate, salary):
+        """Render the growth and salary sentences of the reasoning (empty when unknown or zero)."""
+        text = ""
+        
+        # Add career growth information
+        if growth_rate and not np.isnan(growth_rate):
+            text += f" This career has a {growth_rate:.1f}% annual growth rate,"
+            if growth_rate > 10:
+                text += " which is excellent."
+            elif growth_rate > 5:
+                text += " which is good."
+            else:
+                text += " which is steady."
+        
+        # Add salary information
+        if salary and not np.isnan(salary):
+            text += f" The average salary is ${salary:,.0f} per year."
+        
+        return text
+    
+    def extract_user_features(self, user_data):
+        """
+        Extract the user side of the recommendation reasoning once per request
+        
+        Returns:
+            (skill name set, education text, interest keywords or None when
+            the user gave no interests)
+        """
+        # Process user skills
+        user_skills = set()
+        user_skills_data = user_data.get('skills')
+        if isinstance(user_skills_data, list):
+            for skill in user_skills_data:
+                if hasattr(skill, 'name'):
+                    user_skills.add(skill.name.lower())
+                elif isinstance(skill, str):
+                    user_skills.add(skill.lower())
+        elif isinstance(user_skills_data, str):
+            user_skills = set([s.strip().lower() for s in user_skills_data.split(',') if s.strip()])
+        
+        user_education = (user_data.get('education_level', '') or '').lower()
+        
+        user_interests = (user_data.get('interests', '') or '').lower()
+        interest_keywords = self.preprocess_text(user_interests).split() if user_interests else None
+        
+        return user_skills, user_education, interest_keywords
+    
+    def get_career_features(self, career, index=None, snapshot=None):
+        """Return the precomputed reasoning features of a career row, or compute them for an arbitrary career."""
+        snapshot = snapshot or self.snapshot
+        if (index is not None and index < len(snapshot.career_keyword_texts)
+                and len(snapshot.career_keyword_texts) == len(snapshot.careers) and snapshot.careers[index] is career):
+            return (snapshot.career_keyword_texts[index], snapshot.career_skill_sets[index],
+                    snapshot.career_educations[index], snapshot.career_outlook_texts[index])
+        
+        keyword_text, career_skills, career_education, growth_rate, salary = self.extract_career_features(career)
+        return keyword_text, career_skills, career_education, self.render_outlook_text(growth_rate, salary)
+    
+    def generate_recommendation_reasoning(self, career, user_data, score, index=None, user_features=None,
+                                          snapshot=None):
+        """
+        Generate an explanation for why a career was recommended.
+        
+        Args:
+            career: Career object or dictionary
+            user_data: Dictionary containing user skills, interests, etc.
+            score: Match score of the career
+            index: Row of the career in snapshot.careers, to use its precomputed features
+            user_features: Result of extract_user_features(user_data), when
+                explaining several careers for the same user
+            snapshot: EngineSnapshot whose rows index refers to
+        """
+        try:
+            keyword_text, career_skills, career_education, outlook_text = self.get_career_features(career, index, snapshot)
+            user_skills, user_education, interest_keywords = user_features or self.extract_user_features(user_data)
             
             # Find matching skills
             matching_skills = user_skills.intersection(career_skills)
             
             # Get user education level compatibility
             education_match = "compatible"
-            user_education = user_data.get('education_level', '').lower()
             
             if user_education and career_education:
                 if 'bachelor' in user_education and ('master' in career_education or 'phd' in career_education):
@@ -231,13 +1513,9 @@ class CareerRecommendationEngine:
             
             # Check interests alignment
             interests_alignment = "moderate"
-            user_interests = (user_data.get('interests', '') or '').lower()
             
-            if user_interests:
-                career_keywords = self.preprocess_text(career_title + ' ' + career_description).split()
-                interest_keywords = self.preprocess_text(user_interests).split()
-                
-                overlap = sum(1 for kw in interest_keywords if any(kw in ckw for ckw in career_keywords))
+            if interest_keywords is not None:
+                overlap = sum(1 for kw in interest_keywords if kw in keyword_text)
                 
                 if overlap > 3:
                     interests_alignment = "strong"
@@ -262,19 +1540,8 @@ class CareerRecommendationEngine:
             else:
                 reasoning += " This field may expose you to new areas beyond your current interests."
             
-            # Add career growth information
-            if career_growth_rate:
-                reasoning += f" This career has a {career_growth_rate:.1f}% annual growth rate,"
-                if career_growth_rate > 10:
-                    reasoning += " which is excellent."
-                elif career_growth_rate > 5:
-                    reasoning += " which is good."
-                else:
-                    reasoning += " which is steady."
-            
-            # Add salary information
-            if career_salary:
-                reasoning += f" The average salary is ${career_salary:,.0f} per year."
+            # Growth and salary sentences are rendered at fit time
+            reasoning += outlook_text
             
             return reasoning
             
@@ -312,7 +1579,7 @@ class CareerRecommendationEngine:
             
             # Calculate demand growth (simple linear regression)
             n = len(years)
-            demand_slope = (n * sum(x*y for x, y in zip(years, demand_levels)) - sum(years) * sum(demand_levels)) / (n * sum(x*x for x in years) - sum(years)**2)
+            demand_slope = (n * sum(x*y for x, y in zip(years, demand_levels, strict=True)) - sum(years) * sum(demand_levels)) / (n * sum(x*x for x in years) - sum(years)**2)
             
             # Calculate salary growth (use average of percentage changes)
             salary_growth = sum(salary_trends) / len(salary_trends) if salary_trends else 0
@@ -402,17 +1669,46 @@ class CareerRecommendationEngine:
         
         return summary
     
-    def save_model(self, filepath='career_recommendation_model.pkl'):
-        """Save the model to a file."""
+    def get_career_ids(self):
+        """Return the database id of every career row (None where unknown)."""
+        snapshot = self.snapshot
+        if snapshot.careers:
+            return [career.get('id') if isinstance(career, dict) else getattr(career, 'id', None)
+                    for career in snapshot.careers]
+        if snapshot.career_ids is not None:
+            return [None if career_id < 0 else int(career_id) for career_id in snapshot.career_ids]
+        return None
+    
+    def save_model(self, filepath='models/career_recommendation_model'):
+        """
+        Save the model as a memory-mappable model directory.
+        
+        A path ending in .pkl writes the legacy pickle instead.
+        """
+        snapshot = self.snapshot
         try:
-            model_data = {
-                'vectorizer': self.vectorizer,
-                'career_vectors': self.career_vectors,
-                'career_titles': self.career_titles
-            }
-            
-            with open(filepath, 'wb') as f:
-                pickle.dump(model_data, f)
+            if filepath.endswith('.pkl'):
+                model_data = {
+                    'vectorizer': snapshot.vectorizer,
+                    'career_vectors': snapshot.career_vectors,
+                    'career_titles': snapshot.career_titles,
+                    'career_ids': self.get_career_ids(),
+                    'catalog_hash': snapshot.catalog_hash,
+                    'fields': snapshot.fields,
+                    'field_weights': snapshot.field_weights
+                }
+                
+                with open(filepath, 'wb') as f:
+                    pickle.dump(model_data, f)
+            else:
+                clustering = None
+                if snapshot.ivf_index is not None:
+                    clustering = (snapshot.ivf_index.centroids, snapshot.ivf_index.assignments)
+                
+                save_model_dir(filepath, snapshot.vectorizer, snapshot.career_vectors, snapshot.career_titles,
+                               career_ids=self.get_career_ids(), clustering=clustering,
+                               fields=snapshot.fields, field_weights=snapshot.field_weights,
+                               catalog_hash=snapshot.catalog_hash)
                 
             logger.info(f"Model saved to {filepath}")
             return True
@@ -420,18 +1716,82 @@ class CareerRecommendationEngine:
             logger.error(f"Error saving model: {e}")
             return False
     
-    def load_model(self, filepath='career_recommendation_model.pkl'):
-        """Load the model from a file."""
+    def load_model(self, filepath='models/career_recommendation_model'):
+        """
+        Load the model from a model directory or a legacy pickle file.
+        
+        The arrays of a model directory are memory-mapped read-only, so
+        processes loading the same model share its pages. Careers are not
+        loaded: recommendations fetch their careers by id (see
+        lookup_careers) until set_careers provides the whole catalog, which
+        the hybrid ranking and skill overlap need.
+        """
         try:
-            with open(filepath, 'rb') as f:
-                model_data = pickle.load(f)
+            if is_model_dir(filepath):
+                model_data = load_model_dir(filepath)
                 
-            self.vectorizer = model_data['vectorizer']
-            self.career_vectors = model_data['career_vectors']
-            self.career_titles = model_data['career_titles']
+                vector_state = self.build_vector_state(model_data['career_vectors'],
+                                                       career_vectors_t=model_data['career_vectors_t'],
+                                                       clustering=model_data['clustering'],
+                                                       fields=model_data['fields'],
+                                                       field_weights=model_data['field_weights'])
+                career_ids = model_data['career_ids']
+                fingerprint = model_data['catalog_hash']
+            else:
+                with open(filepath, 'rb') as f:
+                    model_data = pickle.load(f)
+                    
+                vector_state = self.build_vector_state(model_data['career_vectors'],
+                                                       fields=model_data.get('fields'),
+                                                       field_weights=model_data.get('field_weights'))
+                career_ids = model_data.get('career_ids')
+                if career_ids is not None:
+                    career_ids = np.array([-1 if career_id is None else career_id for career_id in career_ids],
+                                          dtype=np.int64)
+                fingerprint = model_data.get('catalog_hash')
+            if career_ids is not None and (np.asarray(career_ids) < 0).any():
+                # Rows without a database id can only be mapped by set_careers
+                career_ids = None
+            
+            # Careers of a previous fit no longer match the rows
+            self.publish(invalidate_results=True, vectorizer=model_data['vectorizer'],
+                         career_titles=model_data['career_titles'], career_ids=career_ids,
+                         catalog_hash=fingerprint, **self.build_career_state([]), **vector_state)
+            self.user_vector_cache.clear()
             
             logger.info(f"Model loaded from {filepath}")
             return True
         except Exception as e:
             logger.error(f"Error loading model: {e}")
-            return False
\ No newline at end of file
+            return False
+
+def catalog_hash(careers):
+    """
+    Fingerprint the careers behind the rows of a model
+    
+    The hash covers the id and every field document of each career in row
+    order, so it changes whenever a career is added, removed, reordered or
+    has text that feeds its vectors edited.
+    
+    Args:
+        careers: Iterable of Career objects, CareerRecords or career dictionaries
+    
+    Returns:
+        Hex SHA-1 digest
+    """
+    digest = hashlib.sha1()
+    for career in careers:
+        career = as_career_record(career)
+        career_id = career.get('id') if isinstance(career, dict) else career.id
+        documents = CareerRecommendationEngine.career_field_documents(career)
+        digest.update('\x1e'.join([str(career_id), *documents]).encode('utf-8'))
+        digest.update(b'\x1d')
+    return digest.hexdigest()
+
+def _snapshot_field(name):
+    return property(lambda engine: getattr(engine.snapshot, name),
+                    doc=f"{name} of the current snapshot (read-only; see EngineSnapshot)")
+
+# Fitted state stays readable as engine attributes, e.g. engine.careers
+for _name in EngineSnapshot.__slots__:
+    setattr(CareerRecommendationEngine, _name, _snapshot_field(_name))
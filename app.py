@@ -1,5 +1,7 @@
 import os
+import json
 import logging
+import multiprocessing
 
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
@@ -28,6 +30,28 @@ app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)  # Needed for url_for
 app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:///career_data.db")
 
 # app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL")
+# Recommendation engine retrieval: "exhaustive", "inverted" or "ivf" (large catalogs)
+app.config["RECOMMENDER_RETRIEVAL_MODE"] = os.environ.get("RECOMMENDER_RETRIEVAL_MODE", "exhaustive")
+# Clusters scanned per query in "ivf" mode; higher is slower but closer to exact
+app.config["RECOMMENDER_IVF_NPROBE"] = int(os.environ.get("RECOMMENDER_IVF_NPROBE", "8"))
+# Candidates per result that "inverted" and "ivf" modes rerank for users with
+# preferences; 0 scores every career for them instead
+app.config["RECOMMENDER_HYBRID_CANDIDATES"] = int(os.environ.get("RECOMMENDER_HYBRID_CANDIDATES", "10")) or None
+# Recommendation engine caches: entries kept and seconds an entry stays valid
+app.config["RECOMMENDER_CACHE_SIZE"] = int(os.environ.get("RECOMMENDER_CACHE_SIZE", "1024"))
+app.config["RECOMMENDER_CACHE_TTL"] = int(os.environ.get("RECOMMENDER_CACHE_TTL", "3600"))
+# Processes used to tokenize the catalog when fitting the engine (-1: one per CPU)
+app.config["RECOMMENDER_FIT_JOBS"] = int(os.environ.get("RECOMMENDER_FIT_JOBS", "1"))
+# JSON weights by career field, e.g. '{"skills": 2}', to fit field-blocked
+# career vectors whose field weights can change without a refit (see career_fields)
+app.config["RECOMMENDER_FIELD_WEIGHTS"] = (json.loads(os.environ["RECOMMENDER_FIELD_WEIGHTS"])
+                                           if os.environ.get("RECOMMENDER_FIELD_WEIGHTS") else None)
+# Fit float32 career and user vectors with int32 indices (half the memory of float64)
+app.config["RECOMMENDER_COMPACT_VECTORS"] = os.environ.get("RECOMMENDER_COMPACT_VECTORS", "0") == "1"
+# Model registry directory, and seconds between checks of its active version (0: never swap models at runtime)
+app.config["RECOMMENDER_MODEL_REGISTRY"] = os.environ.get("RECOMMENDER_MODEL_REGISTRY", "models/registry")
+app.config["RECOMMENDER_MODEL_POLL_SECONDS"] = float(os.environ.get("RECOMMENDER_MODEL_POLL_SECONDS", "10"))
+
 app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
     "pool_recycle": 300,
     "pool_pre_ping": True,
@@ -51,11 +75,18 @@ with app.app_context():
     import models  # noqa: F401
     import routes  # noqa: F401
     
-    # Create database tables if they don't exist
-    db.create_all()
-    
-    # Log database connection info
-    logger.info(f"Connected to database: {app.config['SQLALCHEMY_DATABASE_URI']}")
-    from sqlalchemy import inspect
-    inspector = inspect(db.engine)
-    logger.info(f"Database tables: {inspector.get_table_names()}")
+    # Worker processes started by multiprocessing (such as the spawned shard
+    # workers of parallel_vectorizer) re-import the main module, and with it
+    # this one: only the serving process sets up the database and the engine
+    if multiprocessing.current_process().name == 'MainProcess':
+        # Create database tables if they don't exist
+        db.create_all()
+        
+        # Load the recommendation engine before serving requests
+        routes.engine_manager.preload()
+        
+        # Log database connection info
+        logger.info(f"Connected to database: {app.config['SQLALCHEMY_DATABASE_URI']}")
+        from sqlalchemy import inspect
+        inspector = inspect(db.engine)
+        logger.info(f"Database tables: {inspector.get_table_names()}")
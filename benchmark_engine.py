@@ -0,0 +1,676 @@
+import logging
+import os
+import re
+import string
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from ai_engine import (
+    HYBRID_FEATURE_WEIGHT,
+    MAX_HYBRID_WEIGHT,
+    SKILL_COVERAGE_WEIGHT,
+    CareerRecommendationEngine,
+)
+from retrieval import merge_top_k, top_k_indices
+from synthetic_data import (
+    make_careers,
+    make_specific_users,
+    make_topic_data,
+    make_users,
+    make_vocabulary,
+)
+from text_normalizer import normalize_corpus, normalize_text
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def timed(func, *args, **kwargs):
+    """Run a function and return (result, elapsed seconds)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def benchmark_batch_scoring(catalog_sizes=(1000, 10000), n_users=500, top_n=5):
+    """Compare per-user get_career_recommendations calls with the batch API"""
+    vocabulary = make_vocabulary()
+    users = make_users(n_users, vocabulary)
+
+    logger.info("Batch scoring: per-user loop vs get_career_recommendations_batch")
+    for n_careers in catalog_sizes:
+        engine = CareerRecommendationEngine()
+        engine.create_career_vectors(make_careers(n_careers, vocabulary))
+
+        looped, loop_time = timed(lambda engine=engine: [engine.get_career_recommendations(user, top_n=top_n)
+                                                          for user in users])
+        batched, batch_time = timed(engine.get_career_recommendations_batch, users, top_n=top_n)
+
+        agreement = np.mean([
+            [career['title'] for career, _, _ in a] == [career['title'] for career, _, _ in b]
+            for a, b in zip(looped, batched, strict=True)
+        ])
+        logger.info(
+            f"careers={n_careers:>8} users={n_users} "
+            f"loop={n_users / loop_time:>9.1f} users/s "
+            f"batch={n_users / batch_time:>9.1f} users/s "
+            f"speedup={loop_time / batch_time:>5.1f}x "
+            f"same top-{top_n}={agreement:.1%}"
+        )
+
+def best_of(func, repeats=5):
+    """Return the fastest of several runs of func, in seconds"""
+    return min(timed(func)[1] for _ in range(repeats))
+
+def benchmark_top_k(catalog_sizes=(1000, 10000, 100000, 1000000), top_n=5, n_shards=8):
+    """Compare full argsort with partial top-k selection and sharded heap merging"""
+    rng = np.random.default_rng(0)
+
+    logger.info(f"Top-{top_n} selection latency by catalog size (best of 5 runs)")
+    for n_careers in catalog_sizes:
+        scores = rng.random(n_careers)
+        shards = list(zip(np.array_split(np.arange(n_careers), n_shards),
+                          np.array_split(scores, n_shards), strict=True))
+
+        argsort_time = best_of(lambda scores=scores: scores.argsort()[-top_n:][::-1])
+        partial_time = best_of(lambda scores=scores: top_k_indices(scores, top_n))
+        merge_time = best_of(lambda shards=shards: merge_top_k(shards, top_n))
+
+        assert list(top_k_indices(scores, top_n)) == list(scores.argsort()[-top_n:][::-1])
+        logger.info(
+            f"careers={n_careers:>8} "
+            f"argsort={argsort_time * 1e3:>8.3f} ms "
+            f"argpartition={partial_time * 1e3:>8.3f} ms "
+            f"heap merge ({n_shards} shards)={merge_time * 1e3:>8.3f} ms "
+            f"speedup={argsort_time / partial_time:>5.1f}x"
+        )
+
+def benchmark_dot_product(catalog_sizes=(1000, 10000, 100000), n_users=200):
+    """Compare sklearn cosine_similarity with the pre-normalized sparse dot product"""
+    vocabulary = make_vocabulary()
+    users = make_users(n_users, vocabulary)
+
+    logger.info("Scoring: cosine_similarity vs pre-normalized dot product (best of 5 runs)")
+    for n_careers in catalog_sizes:
+        engine = CareerRecommendationEngine()
+        engine.create_career_vectors(make_careers(n_careers, vocabulary))
+        user_vectors = engine.create_user_vectors(users)
+        single = user_vectors[0]
+
+        assert np.allclose(cosine_similarity(user_vectors, engine.career_vectors),
+                           engine.score_user_vectors(user_vectors))
+
+        cosine_single = best_of(lambda engine=engine, single=single: cosine_similarity(single, engine.career_vectors))
+        dot_single = best_of(lambda engine=engine, single=single: engine.score_user_vectors(single))
+        cosine_batch = best_of(lambda engine=engine, user_vectors=user_vectors:
+                               cosine_similarity(user_vectors, engine.career_vectors))
+        dot_batch = best_of(lambda engine=engine, user_vectors=user_vectors: engine.score_user_vectors(user_vectors))
+        logger.info(
+            f"careers={n_careers:>8} "
+            f"single user: cosine={cosine_single * 1e3:>8.3f} ms dot={dot_single * 1e3:>8.3f} ms "
+            f"({cosine_single / dot_single:>4.1f}x) | "
+            f"{n_users} users: cosine={cosine_batch * 1e3:>8.2f} ms dot={dot_batch * 1e3:>8.2f} ms "
+            f"({cosine_batch / dot_batch:>4.1f}x)"
+        )
+
+def benchmark_inverted_index(catalog_sizes=(10000, 100000, 1000000), n_users=100, top_n=5):
+    """Compare exhaustive scoring with MaxScore retrieval over the inverted index"""
+    vocabulary = make_vocabulary(20000)
+    user_sets = {
+        'common-term users': make_users(n_users, vocabulary),
+        'specific users': make_specific_users(n_users, vocabulary),
+    }
+
+    logger.info(f"Single-user top-{top_n} retrieval: exhaustive vs inverted index")
+    for n_careers in catalog_sizes:
+        engine = CareerRecommendationEngine(retrieval_mode='inverted')
+        engine.create_career_vectors(make_careers(n_careers, vocabulary))
+        index = engine.inverted_index
+
+        for label, users in user_sets.items():
+            user_vectors = [engine.create_user_vector(user) for user in users]
+
+            def exhaustive(engine=engine, user_vectors=user_vectors):
+                results = []
+                for user_vector in user_vectors:
+                    similarities = engine.score_user_vectors(user_vector).ravel()
+                    top = top_k_indices(similarities, top_n)
+                    results.append(similarities[top])
+                return results
+
+            def inverted(index=index, user_vectors=user_vectors):
+                return [index.search(user_vector, top_n)[1] for user_vector in user_vectors]
+
+            exhaustive_scores, exhaustive_time = timed(exhaustive)
+            inverted_scores, inverted_time = timed(inverted)
+            exact = np.mean([np.allclose(a, b) for a, b in zip(exhaustive_scores, inverted_scores, strict=True)])
+            logger.info(
+                f"careers={n_careers:>8} {label:<17} "
+                f"exhaustive={exhaustive_time / n_users * 1e3:>8.3f} ms/user "
+                f"inverted={inverted_time / n_users * 1e3:>8.3f} ms/user "
+                f"speedup={exhaustive_time / inverted_time:>5.1f}x "
+                f"exact={exact:.1%}"
+            )
+
+def benchmark_ivf(n_careers=100000, n_users=200, top_n=5, nprobes=(1, 2, 4, 8, 16, 32, 64)):
+    """Report recall@k and latency of IVF retrieval for several nprobe values"""
+    vocabulary = make_vocabulary(20000)
+    careers, users = make_topic_data(n_careers, n_users, vocabulary)
+
+    engine = CareerRecommendationEngine(retrieval_mode='ivf')
+    _, build_time = timed(engine.create_career_vectors, careers)
+    user_vectors = [engine.create_user_vector(user) for user in users]
+    index = engine.ivf_index
+
+    def exact():
+        results = []
+        for user_vector in user_vectors:
+            similarities = engine.score_user_vectors(user_vector).ravel()
+            results.append(top_k_indices(similarities, top_n))
+        return results
+
+    exact_results, exact_time = timed(exact)
+    logger.info(
+        f"IVF recall@{top_n} vs latency: careers={n_careers} clusters={index.n_clusters} "
+        f"(fit + clustering {build_time:.1f} s); exact scorer {exact_time / n_users * 1e3:.3f} ms/user"
+    )
+    for nprobe in nprobes:
+        if nprobe > index.n_clusters:
+            break
+        approximate, ivf_time = timed(lambda nprobe=nprobe: [index.search(user_vector, top_n, nprobe=nprobe)[0]
+                                                             for user_vector in user_vectors])
+        recall = np.mean([len(set(a) & set(b)) / top_n for a, b in zip(exact_results, approximate, strict=True)])
+        logger.info(
+            f"nprobe={nprobe:>4} recall@{top_n}={recall:>6.1%} "
+            f"latency={ivf_time / n_users * 1e3:>8.3f} ms/user "
+            f"speedup={exact_time / ivf_time:>5.1f}x"
+        )
+
+def benchmark_model_load(catalog_sizes=(10000, 100000), n_workers=4):
+    """Compare loading a pickled model with opening a memory-mapped model directory"""
+    vocabulary = make_vocabulary(20000)
+
+    logger.info(f"Model load: pickle vs memory-mapped directory (best of 5 runs, {n_workers} workers)")
+    for n_careers in catalog_sizes:
+        engine = CareerRecommendationEngine()
+        engine.create_career_vectors(make_careers(n_careers, vocabulary))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pickle_path = os.path.join(tmp, 'model.pkl')
+            dir_path = os.path.join(tmp, 'model')
+            engine.save_model(pickle_path)
+            engine.save_model(dir_path)
+
+            pickle_time = best_of(lambda path=pickle_path: CareerRecommendationEngine().load_model(path))
+            dir_time = best_of(lambda path=dir_path: CareerRecommendationEngine().load_model(path))
+
+            # The pickle path gives each worker a private copy of both
+            # career matrices; the mapped arrays are shared page cache
+            matrix = engine.career_vectors
+            matrix_mib = 2 * (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 2**20
+            logger.info(
+                f"careers={n_careers:>8} pickle={pickle_time * 1e3:>8.1f} ms "
+                f"mmap dir={dir_time * 1e3:>8.1f} ms ({pickle_time / dir_time:>5.1f}x) | "
+                f"private matrix memory for {n_workers} workers: "
+                f"pickle={n_workers * matrix_mib:.0f} MiB mmap dir=0 MiB (shared {matrix_mib:.0f} MiB)"
+            )
+
+def regex_preprocess_text(text):
+    """The previous preprocess_text: three re.sub passes, one pattern built per call"""
+    text = text.lower()
+    text = re.sub(f'[{string.punctuation}]', ' ', text)
+    text = re.sub(r'\d+', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def benchmark_normalizer(corpus_sizes=(1000, 10000, 100000)):
+    """Compare the regex preprocessor with the translate-based normalizer"""
+    vocabulary = make_vocabulary()
+
+    logger.info("Text normalization: regex passes vs translate table (best of 5 runs)")
+    for n_documents in corpus_sizes:
+        documents = [
+            f"{career['title']}: {career['description']} ({career['skills']}); {career['requirements']} 2024-25!"
+            for career in make_careers(n_documents, vocabulary)
+        ]
+        assert normalize_corpus(documents) == [regex_preprocess_text(document) for document in documents]
+
+        regex_time = best_of(lambda documents=documents: [regex_preprocess_text(document) for document in documents])
+        translate_time = best_of(lambda documents=documents: [normalize_text(document) for document in documents])
+        corpus_time = best_of(lambda documents=documents: normalize_corpus(documents))
+        megabytes = sum(len(document) for document in documents) / 1e6
+        logger.info(
+            f"documents={n_documents:>7} per document: regex={regex_time * 1e3:>8.1f} ms "
+            f"translate={translate_time * 1e3:>8.1f} ms ({regex_time / translate_time:>4.1f}x) | "
+            f"whole corpus={corpus_time * 1e3:>8.1f} ms ({regex_time / corpus_time:>4.1f}x, "
+            f"{megabytes / corpus_time:>5.0f} MB/s)"
+        )
+
+def benchmark_reasoning(n_careers=10000, n_users=500, top_n=5):
+    """Compare explaining recommendations with per-request and precomputed career features"""
+    vocabulary = make_vocabulary()
+    engine = CareerRecommendationEngine()
+    engine.create_career_vectors(make_careers(n_careers, vocabulary))
+    users = make_users(n_users, vocabulary)
+    top = [engine.find_top_careers(engine.create_user_vector(user), top_n) for user in users]
+
+    def explain(precomputed):
+        for user, (indices, scores) in zip(users, top, strict=True):
+            user_features = engine.extract_user_features(user) if precomputed else None
+            for idx, score in zip(indices, scores, strict=True):
+                engine.generate_recommendation_reasoning(
+                    engine.careers[idx], user, score,
+                    index=idx if precomputed else None, user_features=user_features)
+
+    per_request_time = best_of(lambda: explain(False))
+    precomputed_time = best_of(lambda: explain(True))
+    logger.info(
+        f"Reasoning for top-{top_n} of {n_users} users: per-request features="
+        f"{per_request_time / n_users * 1e3:.3f} ms/user precomputed="
+        f"{precomputed_time / n_users * 1e3:.3f} ms/user ({per_request_time / precomputed_time:.1f}x)"
+    )
+
+    eager = engine.get_career_recommendations_batch(users, top_n)
+    lazy = engine.get_career_recommendations_batch(users, top_n, lazy_reasoning=True)
+    assert [list(map(tuple, row)) for row in lazy] == eager
+
+    eager_time = best_of(lambda: engine.get_career_recommendations_batch(users, top_n))
+    lazy_time = best_of(lambda: [[(match.career, match.score) for match in row]
+                                 for row in engine.get_career_recommendations_batch(users, top_n, lazy_reasoning=True)])
+    logger.info(
+        f"Batch of {n_users} users: with reasoning={eager_time * 1e3:.1f} ms "
+        f"scores only (lazy_reasoning)={lazy_time * 1e3:.1f} ms ({eager_time / lazy_time:.1f}x)"
+    )
+
+def benchmark_skill_overlap(catalog_sizes=(1000, 10000, 100000), n_users=100):
+    """Compare per-career set intersections with the career x skill incidence matrix"""
+    vocabulary = make_vocabulary()
+    users = make_users(n_users, vocabulary)
+    user_skill_sets = [set(skill.lower() for skill in user['skills']) for user in users]
+
+    logger.info(f"Skill overlap with every career for {n_users} users (best of 5 runs)")
+    for n_careers in catalog_sizes:
+        engine = CareerRecommendationEngine()
+        engine.create_career_vectors(make_careers(n_careers, vocabulary))
+
+        def intersections(engine=engine):
+            return [[len(user_skills & career_skills) for career_skills in engine.career_skill_sets]
+                    for user_skills in user_skill_sets]
+
+        def incidence_matrix(engine=engine):
+            return engine.compute_skill_overlap(engine.create_user_skill_vectors([user['skills'] for user in users]))
+
+        assert np.array_equal(np.array(intersections()), incidence_matrix()[0])
+        set_time = best_of(intersections)
+        matrix_time = best_of(incidence_matrix)
+        logger.info(
+            f"careers={n_careers:>8} set intersections={set_time * 1e3:>9.2f} ms "
+            f"sparse product={matrix_time * 1e3:>8.2f} ms ({set_time / matrix_time:>5.1f}x)"
+        )
+
+def loop_hybrid_scores(engine, similarities, user_data_list):
+    """Reference hybrid ranking with a Python loop over careers, for users without skills or salary range"""
+    blended = similarities.copy()
+    for row, user_data in enumerate(user_data_list):
+        weights, _, _ = engine.preference_weights(user_data)
+        total = weights.sum() + SKILL_COVERAGE_WEIGHT
+        share = HYBRID_FEATURE_WEIGHT * total / MAX_HYBRID_WEIGHT
+        for idx in range(len(engine.careers)):
+            feature_score = sum(w * x for w, x in zip(weights, engine.ranking_features[idx], strict=True)) / total
+            blended[row, idx] = (1.0 - share) * similarities[row, idx] + share * feature_score
+    return blended
+
+def benchmark_hybrid(catalog_sizes=(1000, 10000, 100000), n_users=100, top_n=5):
+    """Cost of hybrid (preference-weighted) ranking over plain similarity ranking"""
+    vocabulary = make_vocabulary()
+    users = make_users(n_users, vocabulary)
+    rng = np.random.default_rng(3)
+    preference_users = [
+        dict(user, preferences={'job_security': int(rng.integers(1, 11)),
+                                'growth_opportunity': int(rng.integers(1, 11)),
+                                'work_life_balance': int(rng.integers(1, 11))})
+        for user in users
+    ]
+
+    logger.info(f"Batch ranking of {n_users} users: similarity only vs hybrid (best of 5 runs)")
+    for n_careers in catalog_sizes:
+        engine = CareerRecommendationEngine()
+        careers = make_careers(n_careers, vocabulary)
+        for career, growth, salary in zip(careers, rng.normal(5, 3, n_careers), rng.normal(70000, 15000, n_careers),
+                                          strict=True):
+            career['growth_rate'], career['avg_salary'], career['demand_level'] = growth, salary, rng.random()
+        engine.create_career_vectors(careers)
+        similarities = engine.score_user_vectors(engine.create_user_vectors(users))
+
+        # Without skills the vectorized blend must equal the per-career loop
+        no_skills = [dict(user, skills=[]) for user in preference_users]
+        if n_careers <= 10000:
+            assert np.allclose(engine.hybrid_scores(similarities, no_skills),
+                               loop_hybrid_scores(engine, similarities, no_skills))
+            loop_time = best_of(lambda engine=engine, similarities=similarities, no_skills=no_skills:
+                                loop_hybrid_scores(engine, similarities, no_skills), repeats=1)
+        else:
+            loop_time = float('nan')
+
+        plain_time = best_of(lambda engine=engine:
+                             engine.get_career_recommendations_batch(users, top_n, lazy_reasoning=True))
+        hybrid_time = best_of(lambda engine=engine:
+                              engine.get_career_recommendations_batch(preference_users, top_n, lazy_reasoning=True))
+        blend_time = best_of(lambda engine=engine, similarities=similarities:
+                             engine.hybrid_scores(similarities, preference_users))
+        logger.info(
+            f"careers={n_careers:>8} similarity={plain_time * 1e3:>8.1f} ms hybrid={hybrid_time * 1e3:>8.1f} ms "
+            f"| blend step: vectorized={blend_time * 1e3:>8.2f} ms per-career loop={loop_time * 1e3:>9.1f} ms"
+        )
+
+def benchmark_user_vector_cache(n_careers=10000, n_profiles=200, n_requests=2000):
+    """Latency of create_user_vector with and without the user-vector cache for revisiting users"""
+    vocabulary = make_vocabulary()
+    careers = make_careers(n_careers, vocabulary)
+    profiles = make_users(n_profiles, vocabulary)
+    rng = np.random.default_rng(5)
+    requests = [profiles[i] for i in rng.integers(0, n_profiles, n_requests)]
+
+    logger.info(f"create_user_vector for {n_requests} requests from {n_profiles} distinct profiles")
+    for cache_size in (0, 1024):
+        engine = CareerRecommendationEngine(user_vector_cache_size=cache_size)
+        engine.create_career_vectors(careers)
+        _, elapsed = timed(lambda engine=engine: [engine.create_user_vector(user) for user in requests])
+        stats = engine.user_vector_cache.stats()
+        logger.info(
+            f"cache size={cache_size:>5} {elapsed / n_requests * 1e6:>7.1f} us/request "
+            f"hits={stats['hits']} misses={stats['misses']} hit rate={stats['hit_rate']:.1%}"
+        )
+
+def benchmark_result_cache(n_careers=10000, n_profiles=200, n_requests=2000):
+    """Latency of get_career_recommendations with and without the result cache, and after invalidation"""
+    vocabulary = make_vocabulary()
+    careers = make_careers(n_careers, vocabulary)
+    profiles = make_users(n_profiles, vocabulary)
+    rng = np.random.default_rng(6)
+    requests = [profiles[i] for i in rng.integers(0, n_profiles, n_requests)]
+
+    logger.info(f"get_career_recommendations for {n_requests} requests from {n_profiles} distinct profiles")
+    results = {}
+    for cache_size in (0, 1024):
+        engine = CareerRecommendationEngine(result_cache_size=cache_size)
+        engine.create_career_vectors(careers)
+        results[cache_size], elapsed = timed(lambda engine=engine: [engine.get_career_recommendations(user)
+                                                                    for user in requests])
+        stats = engine.result_cache.stats()
+        logger.info(
+            f"cache size={cache_size:>5} {elapsed / n_requests * 1e6:>8.1f} us/request "
+            f"hit rate={stats['hit_rate']:.1%} saved={stats['saved_seconds'] * 1e3:.0f} ms"
+        )
+    assert [[(c['title'], s) for c, s, _ in r] for r in results[0]] == \
+        [[(c['title'], s) for c, s, _ in r] for r in results[1024]], "cached results differ"
+
+    _, elapsed = timed(engine.invalidate_results)
+    logger.info(f"invalidate_results with {len(engine.result_cache)} entries: {elapsed * 1e6:.1f} us")
+
+_benchmark_database = None
+
+def open_benchmark_database():
+    """Import the Flask app against a throwaway SQLite database, or return None if it is already loaded"""
+    global _benchmark_database
+    if _benchmark_database is not None:
+        return _benchmark_database
+    if 'app' in sys.modules:
+        logger.error("The app is already imported; database benchmarks need a throwaway database")
+        return None
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark.db')}"
+    from app import app, db
+    _benchmark_database = (app, db)
+    return _benchmark_database
+
+def seed_catalog(db, n_careers, vocabulary, n_skills=500, skills_per_career=6, trends_per_career=3, seed=0):
+    """Replace the career catalog with synthetic careers, skills and market trends using bulk inserts"""
+    from datetime import datetime
+
+    from sqlalchemy import delete, insert
+
+    from models import Career, MarketTrend, Skill, career_skill
+
+    rng = np.random.default_rng(seed)
+    for table in (MarketTrend.__table__, career_skill, Career.__table__, Skill.__table__):
+        db.session.execute(delete(table))
+
+    careers = make_careers(n_careers, vocabulary, seed=seed)
+    db.session.execute(insert(Skill), [
+        {'id': i + 1, 'name': f"{vocabulary[i]} {i}", 'description': f"{vocabulary[-i - 1]} work"}
+        for i in range(n_skills)
+    ])
+    db.session.execute(insert(Career), [
+        {'id': i + 1, 'name': career['title'], 'description': career['description'],
+         'required_skills': career['skills'], 'industry': f"industry {i % 20}"}
+        for i, career in enumerate(careers)
+    ])
+    db.session.execute(insert(career_skill), [
+        {'career_id': i + 1, 'skill_id': int(skill_id) + 1}
+        for i in range(n_careers)
+        for skill_id in rng.choice(n_skills, size=skills_per_career, replace=False)
+    ])
+    db.session.execute(insert(MarketTrend), [
+        {'career_id': i + 1, 'demand_level': float(rng.random()), 'salary_range': f"{rng.integers(1, 9)}%",
+         'updated_at': datetime(2020 + year, 1, 1)}
+        for i in range(n_careers)
+        for year in range(trends_per_career)
+    ])
+    db.session.commit()
+
+def benchmark_catalog_load(catalog_sizes=(1000, 5000)):
+    """Queries and time to load the career catalog: per-career ORM loads vs catalog_loader"""
+    opened = open_benchmark_database()
+    if opened is None:
+        return
+    app, db = opened
+    from career_record import CareerRecord
+    from catalog_loader import count_queries, load_catalog
+    from models import Career
+
+    vocabulary = make_vocabulary()
+    logger.info("Catalog load: Career.query.all() with per-career skills and trends vs catalog_loader")
+    for n_careers in catalog_sizes:
+        with app.app_context():
+            seed_catalog(db, n_careers, vocabulary)
+            db.session.remove()
+
+        with app.app_context():
+            with count_queries(db.session.connection()) as orm_queries:
+                _, orm_elapsed = timed(lambda: [CareerRecord.from_career(career) for career in Career.query.all()])
+            db.session.remove()
+
+        with app.app_context():
+            records, stats = load_catalog()
+            db.session.remove()
+
+        logger.info(
+            f"careers={n_careers:>8} ORM objects: {orm_queries[0]:>6} queries {orm_elapsed * 1e3:>8.1f} ms | "
+            f"catalog_loader: {stats['queries']} queries {stats['seconds'] * 1e3:>7.1f} ms "
+            f"({orm_elapsed / stats['seconds']:.1f}x)"
+        )
+
+def benchmark_corpus_stream(catalog_sizes=(2000, 10000)):
+    """Peak memory and time to fit the career vectors: loaded catalog vs streamed from the database"""
+    import tracemalloc
+    opened = open_benchmark_database()
+    if opened is None:
+        return
+    app, db = opened
+    from catalog_loader import iter_catalog, load_catalog
+
+    def fit_loaded():
+        careers, _ = load_catalog()
+        engine = CareerRecommendationEngine()
+        engine.create_career_vectors(careers)
+        return engine
+
+    def fit_streamed():
+        engine = CareerRecommendationEngine()
+        engine.create_career_vectors(iter_catalog())
+        return engine
+
+    def measure(fit):
+        with app.app_context():
+            tracemalloc.start()
+            engine, elapsed = timed(fit)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            db.session.remove()
+        return engine, elapsed, peak
+
+    vocabulary = make_vocabulary()
+    logger.info("Corpus build: load_catalog() then fit vs iter_catalog() streamed into the vectorizer")
+    for n_careers in catalog_sizes:
+        with app.app_context():
+            seed_catalog(db, n_careers, vocabulary)
+            db.session.remove()
+
+        loaded, loaded_elapsed, loaded_peak = measure(fit_loaded)
+        streamed, streamed_elapsed, streamed_peak = measure(fit_streamed)
+        same = (loaded.career_vectors != streamed.career_vectors).nnz == 0
+
+        logger.info(
+            f"careers={n_careers:>8} loaded: {loaded_elapsed * 1e3:>8.1f} ms peak {loaded_peak / 2**20:>7.1f} MiB | "
+            f"streamed: {streamed_elapsed * 1e3:>8.1f} ms peak {streamed_peak / 2**20:>7.1f} MiB "
+            f"(identical vectors: {same})"
+        )
+
+def benchmark_parallel_fit(catalog_sizes=(20000, 100000), worker_counts=(1, 2, 4, 8)):
+    """Time to fit the career vectors by number of tokenizing processes"""
+    vocabulary = make_vocabulary()
+
+    logger.info(f"Parallel fit: create_career_vectors by n_jobs ({os.cpu_count()} CPUs)")
+    for n_careers in catalog_sizes:
+        careers = make_careers(n_careers, vocabulary)
+        serial = CareerRecommendationEngine()
+        _, serial_time = timed(serial.create_career_vectors, careers)
+
+        for n_jobs in worker_counts:
+            engine = CareerRecommendationEngine(n_jobs=n_jobs)
+            _, elapsed = timed(engine.create_career_vectors, careers)
+            same = (engine.career_vectors.shape == serial.career_vectors.shape and
+                    abs(engine.career_vectors - serial.career_vectors).max() < 1e-12)
+            logger.info(
+                f"careers={n_careers:>8} n_jobs={n_jobs} {elapsed * 1e3:>9.1f} ms "
+                f"speedup={serial_time / elapsed:>5.2f}x (same vectors: {same})"
+            )
+
+def benchmark_field_weights(catalog_sizes=(10000, 50000), n_users=200, top_n=5):
+    """Changing field weights: refit vs query-time scaling of a field-blocked matrix"""
+    vocabulary = make_vocabulary()
+    users = make_users(n_users, vocabulary)
+
+    logger.info("Field weights: refit vs set_field_weights, and per-user latency by layout (best of 5 runs)")
+    for n_careers in catalog_sizes:
+        careers = make_careers(n_careers, vocabulary)
+        document = CareerRecommendationEngine(result_cache_size=0)
+        document.create_career_vectors(careers)
+        fielded = CareerRecommendationEngine(result_cache_size=0, field_weights={})
+        _, refit_time = timed(fielded.create_career_vectors, careers)
+        _, reweight_time = timed(fielded.set_field_weights, {'skills': 2.0})
+
+        document_time = best_of(lambda engine=document: [engine.get_career_recommendations(user, top_n=top_n)
+                                                         for user in users])
+        fielded_time = best_of(lambda engine=fielded: [engine.get_career_recommendations(user, top_n=top_n)
+                                                       for user in users])
+        logger.info(
+            f"careers={n_careers:>8} refit={refit_time * 1e3:>9.1f} ms reweight={reweight_time * 1e3:>6.3f} ms | "
+            f"per user: document={document_time / n_users * 1e3:>6.3f} ms "
+            f"fielded={fielded_time / n_users * 1e3:>6.3f} ms"
+        )
+
+def csr_nbytes(matrix):
+    """Bytes held by the data, indices and indptr arrays of a CSR matrix"""
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+def directory_nbytes(path):
+    """Total size of the files in a directory"""
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+def benchmark_compact_vectors(n_careers=100000, n_users=500, top_n=10, retrieval_modes=('exhaustive', 'inverted')):
+    """Validation report for compact (float32/int32) vectors: top-k agreement with float64 and memory saved"""
+    vocabulary = make_vocabulary()
+    careers = make_careers(n_careers, vocabulary)
+    users = make_users(n_users, vocabulary)
+    per_100k = 100000 / n_careers
+
+    logger.info(f"Compact vectors: float32/int32 vs float64, {n_careers} careers, {n_users} users, top-{top_n}")
+    for mode in retrieval_modes:
+        full = CareerRecommendationEngine(retrieval_mode=mode, result_cache_size=0)
+        full.create_career_vectors(careers)
+        compact = CareerRecommendationEngine(retrieval_mode=mode, result_cache_size=0, compact=True)
+        compact.create_career_vectors(careers)
+
+        full_top = [full.find_top_careers(full.create_user_vector(user), top_n) for user in users]
+        compact_top = [compact.find_top_careers(compact.create_user_vector(user), top_n) for user in users]
+        same_order = np.mean([list(a[0]) == list(b[0]) for a, b in zip(full_top, compact_top, strict=True)])
+        overlap = np.mean([len(set(a[0]) & set(b[0])) / top_n for a, b in zip(full_top, compact_top, strict=True)])
+        score_error = max(np.abs(a[1] - b[1]).max() for a, b in zip(full_top, compact_top, strict=True))
+
+        full_time = best_of(lambda engine=full: [engine.find_top_careers(engine.create_user_vector(user), top_n)
+                                                 for user in users])
+        compact_time = best_of(lambda engine=compact: [engine.find_top_careers(engine.create_user_vector(user), top_n)
+                                                       for user in users])
+        logger.info(
+            f"{mode:>10}: identical top-{top_n} order {same_order:.1%}, overlap {overlap:.2%}, "
+            f"max score error {score_error:.2e} | per user {full_time / n_users * 1e3:.3f} ms float64, "
+            f"{compact_time / n_users * 1e3:.3f} ms compact"
+        )
+
+    full_bytes = csr_nbytes(full.career_vectors) + csr_nbytes(full.career_vectors_t)
+    compact_bytes = csr_nbytes(compact.career_vectors) + csr_nbytes(compact.career_vectors_t)
+    user_vector = full.create_user_vector(users[0])
+    compact_user_vector = compact.create_user_vector(users[0])
+
+    with tempfile.TemporaryDirectory() as directory:
+        full.save_model(os.path.join(directory, 'full'))
+        compact.save_model(os.path.join(directory, 'compact'))
+        full_disk = directory_nbytes(os.path.join(directory, 'full'))
+        compact_disk = directory_nbytes(os.path.join(directory, 'compact'))
+
+    logger.info(
+        f"Career matrices per 100k careers: float64 {full_bytes * per_100k / 2**20:.1f} MiB, "
+        f"compact {compact_bytes * per_100k / 2**20:.1f} MiB, saved {(full_bytes - compact_bytes) * per_100k / 2**20:.1f} MiB "
+        f"({1 - compact_bytes / full_bytes:.0%}); dtypes {full.career_vectors.dtype}/{full.career_vectors.indices.dtype} -> "
+        f"{compact.career_vectors.dtype}/{compact.career_vectors.indices.dtype}"
+    )
+    logger.info(
+        f"Model directory per 100k careers: float64 {full_disk * per_100k / 2**20:.1f} MiB, "
+        f"compact {compact_disk * per_100k / 2**20:.1f} MiB | user vector: {csr_nbytes(user_vector)} B float64, "
+        f"{csr_nbytes(compact_user_vector)} B compact"
+    )
+
+BENCHMARKS = {
+    'batch': benchmark_batch_scoring,
+    'topk': benchmark_top_k,
+    'dot': benchmark_dot_product,
+    'index': benchmark_inverted_index,
+    'ivf': benchmark_ivf,
+    'load': benchmark_model_load,
+    'normalize': benchmark_normalizer,
+    'reasoning': benchmark_reasoning,
+    'skills': benchmark_skill_overlap,
+    'hybrid': benchmark_hybrid,
+    'cache': benchmark_user_vector_cache,
+    'results': benchmark_result_cache,
+    'catalog': benchmark_catalog_load,
+    'stream': benchmark_corpus_stream,
+    'parallel': benchmark_parallel_fit,
+    'fields': benchmark_field_weights,
+    'compact': benchmark_compact_vectors,
+}
+
+def main():
+    """Run the benchmarks named on the command line, or all of them"""
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            logger.error(f"Unknown benchmark: {name}. Available: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[name]()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import logging
+
+import numpy as np
+from scipy import sparse
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Blocks of a field-blocked career matrix, in column order
+CAREER_FIELDS = ('title', 'description', 'skills', 'environment')
+
+# Default query-time weight of every field (normalized to sum to 1 when used)
+DEFAULT_FIELD_WEIGHTS = {'title': 1.0, 'description': 1.0, 'skills': 1.0, 'environment': 0.5}
+
+# Field-blocked layout
+#
+# A field-blocked career matrix has one TF-IDF block per field, all over the
+# same vocabulary and IDF weights, stacked horizontally:
+#
+#     [ title | description | skills | environment ]     n_careers x (4 * n_terms)
+#
+# Every block of a row is L2-normalized on its own. A user vector u (one
+# block wide) is expanded at query time to [w_title * u | w_description * u |
+# ...], a diagonal scaling, so its dot product with a career row is the
+# weighted sum of the per-field cosine similarities. Changing the weights
+# never requires a refit.
+
+def field_weight_vector(fields, weights=None, base=None):
+    """
+    Resolve field weights to an array aligned with fields
+
+    Args:
+        fields: Field names of the matrix blocks
+        weights: Dictionary of weights by field name overriding base; unknown
+            names are ignored
+        base: Array of weights to start from (defaults to DEFAULT_FIELD_WEIGHTS)
+
+    Returns:
+        Array of len(fields) non-negative weights (field_query_vectors
+        normalizes them to sum to 1)
+    """
+    if base is None:
+        base = [DEFAULT_FIELD_WEIGHTS.get(field, 1.0) for field in fields]
+    vector = np.array(base, dtype=np.float64)
+    for name, weight in (weights or {}).items():
+        if name in fields:
+            vector[fields.index(name)] = max(float(weight), 0.0)
+        else:
+            logger.warning(f"Ignoring weight of unknown field '{name}'")
+    return vector
+
+def normalize_field_blocks(matrix, n_fields, copy=True, dtype=np.float64):
+    """
+    L2-normalize every field block of every row of a field-blocked matrix
+
+    Args:
+        matrix: Sparse matrix of shape (n_rows, n_fields * n_terms)
+        n_fields: Number of blocks
+        copy: Normalize a copy instead of the matrix itself
+        dtype: Value dtype of the result
+
+    Returns:
+        CSR matrix with sorted indices
+    """
+    matrix = sparse.csr_matrix(matrix, dtype=dtype, copy=copy)
+    n_rows, n_columns = matrix.shape
+    n_terms = n_columns // n_fields
+
+    rows = np.repeat(np.arange(n_rows), np.diff(matrix.indptr))
+    blocks = rows * n_fields + matrix.indices // n_terms
+    norms = np.sqrt(np.bincount(blocks, weights=matrix.data ** 2, minlength=n_rows * n_fields))
+    norms[norms == 0] = 1.0
+    matrix.data /= norms[blocks]
+    matrix.sort_indices()
+    return matrix
+
+def field_query_vectors(user_vectors, weights):
+    """
+    Expand user vectors to the field-blocked layout, scaling block f by weights[..., f]
+
+    The weights of a row are normalized to sum to 1 (all-zero weights count
+    every field equally), so scores stay in [0, 1].
+
+    Args:
+        user_vectors: Sparse user TF-IDF rows, one block wide
+        weights: Array of shape (n_fields,) shared by every row, or
+            (n_rows, n_fields) for per-row weights
+
+    Returns:
+        CSR matrix of shape (n_rows, n_fields * n_terms)
+    """
+    user_vectors = sparse.csr_matrix(user_vectors)
+    weights = np.array(weights, dtype=user_vectors.dtype)
+    totals = weights.sum(axis=-1, keepdims=True)
+    weights = np.where(totals > 0, weights / np.where(totals > 0, totals, 1.0), 1.0 / weights.shape[-1])
+    if weights.ndim == 1:
+        return sparse.hstack([user_vectors * weight for weight in weights], format='csr')
+    return sparse.hstack([sparse.diags(weights[:, field]) @ user_vectors for field in range(weights.shape[1])],
+                         format='csr')
@@ -0,0 +1,77 @@
+class CareerRecord:
+    """
+    Compact, session-independent copy of a Career row
+
+    Holds everything the recommendation engine reads from a career, including
+    its skills and latest market trend numbers, so the engine never keeps ORM
+    instances: no lazy loads on detached or stale objects and no per-instance
+    ORM state. Attribute names follow the Career model; records of given ids
+    are fetched with catalog_loader.fetch_career_records.
+    """
+    __slots__ = ('id', 'title', 'description', 'industry', 'education_required', 'work_environment',
+                 'skill_ids', 'skill_names', 'skill_descriptions',
+                 'demand_level', 'avg_salary', 'salary', 'growth_rate')
+
+    def __init__(self, id, title, description='', industry='', education_required='', work_environment='',
+                 skill_ids=(), skill_names=(), skill_descriptions=(),
+                 demand_level=None, avg_salary=None, salary=None, growth_rate=None):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.industry = industry
+        self.education_required = education_required
+        self.work_environment = work_environment
+        self.skill_ids = tuple(skill_ids)
+        self.skill_names = tuple(skill_names)
+        self.skill_descriptions = tuple(skill_descriptions)
+        self.demand_level = demand_level
+        self.avg_salary = avg_salary
+        # Dollar midpoint of the latest salary range (avg_salary mirrors
+        # Career.avg_salary, the percentage spread of that range)
+        self.salary = salary
+        self.growth_rate = growth_rate
+
+    @classmethod
+    def from_career(cls, career, trends=None):
+        """
+        Copy a Career object
+
+        Args:
+            career: Career ORM object
+            trends: Its MarketTrend rows, if already loaded (otherwise they
+                are queried once)
+        """
+        skills = list(career.skills) if hasattr(career, 'skills') else []
+        if trends is None:
+            trends = career.market_trends.all() if hasattr(career, 'market_trends') else []
+        latest_trend = max(trends, key=lambda t: t.year) if trends else None
+
+        return cls(
+            id=career.id,
+            title=career.title,
+            description=career.description or '',
+            industry=getattr(career, 'industry', '') or '',
+            education_required=career.education_required or '',
+            work_environment=career.work_environment or '',
+            skill_ids=[skill.id for skill in skills],
+            skill_names=[skill.name for skill in skills],
+            skill_descriptions=[skill.description or '' for skill in skills],
+            demand_level=latest_trend.demand_level if latest_trend else None,
+            avg_salary=career.salary_from_trends(trends),
+            salary=career.salary_midpoint_from_trends(trends),
+            growth_rate=career.growth_rate_from_trends(trends),
+        )
+
+    @property
+    def name(self):
+        """Career.name, which title mirrors"""
+        return self.title
+
+    def __repr__(self):
+        return f'<CareerRecord {self.id} {self.title}>'
+
+def as_career_record(career):
+    """Return dictionaries and CareerRecords as they are; copy Career objects into a CareerRecord"""
+    if isinstance(career, (dict, CareerRecord)):
+        return career
+    return CareerRecord.from_career(career)
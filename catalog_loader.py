@@ -0,0 +1,222 @@
+import logging
+import time
+from contextlib import contextmanager
+from itertools import groupby
+from types import SimpleNamespace
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, select
+
+from career_record import CareerRecord
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+@contextmanager
+def count_queries(connection):
+    """
+    Count the SQL statements executed on a connection
+
+    Yields:
+        One-element list holding the running count
+    """
+    count = [0]
+
+    def before_cursor_execute(*_):
+        count[0] += 1
+
+    event.listen(connection, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield count
+    finally:
+        event.remove(connection, 'before_cursor_execute', before_cursor_execute)
+
+# Rows fetched per round trip when streaming the catalog
+CATALOG_BATCH_SIZE = 1000
+
+class CatalogSessionError(RuntimeError):
+    """The catalog was read with neither a session nor an application context"""
+
+def resolve_session(session=None):
+    """
+    Return the session to read the catalog with
+
+    Library code never imports the app: without an explicit session, the
+    Flask-SQLAlchemy session of the current application context is used.
+
+    Args:
+        session: SQLAlchemy session, or None
+
+    Returns:
+        session, or the session of the current application context
+
+    Raises:
+        CatalogSessionError: If no session is given outside an application context
+    """
+    if session is not None:
+        return session
+    if not has_app_context():
+        raise CatalogSessionError("No database session to read the career catalog with: "
+                                  "pass a session or call inside an application context")
+    return current_app.extensions['sqlalchemy'].session
+
+class _GroupedRows:
+    """Rows ordered by career_id, consumed one career at a time (one side of a merge join)"""
+    def __init__(self, rows):
+        self._groups = groupby(rows, key=lambda row: row.career_id)
+        self._current = next(self._groups, None)
+
+    def take(self, career_id):
+        """Return the rows of career_id, skipping rows of smaller ids"""
+        while self._current is not None and self._current[0] < career_id:
+            self._current = next(self._groups, None)
+        if self._current is None or self._current[0] != career_id:
+            return []
+        rows = list(self._current[1])
+        self._current = next(self._groups, None)
+        return rows
+
+def _career_record(row, skill_rows, trend_rows):
+    """
+    Build the CareerRecord of a career row from its skill and trend rows
+
+    The Career and MarketTrend computed properties only read columns, so they
+    are evaluated on the result rows instead of building ORM instances.
+    """
+    from models import Career, MarketTrend
+
+    trends = [
+        SimpleNamespace(demand_level=trend.demand_level, year=MarketTrend.year.fget(trend),
+                        salary_trend=MarketTrend.salary_trend.fget(trend),
+                        salary_midpoint=MarketTrend.salary_midpoint.fget(trend))
+        for trend in trend_rows
+    ]
+    latest_trend = max(trends, key=lambda t: t.year) if trends else None
+    return CareerRecord(
+        id=row.id,
+        title=row.name,
+        description=row.description or '',
+        industry=row.industry or '',
+        education_required=Career.education_required.fget(row) or '',
+        work_environment=Career.work_environment.fget(row) or '',
+        skill_ids=[skill.id for skill in skill_rows],
+        skill_names=[skill.name for skill in skill_rows],
+        skill_descriptions=[skill.description or '' for skill in skill_rows],
+        demand_level=latest_trend.demand_level if latest_trend else None,
+        avg_salary=Career.salary_from_trends(trends),
+        salary=Career.salary_midpoint_from_trends(trends),
+        growth_rate=Career.growth_rate_from_trends(trends),
+    )
+
+def iter_catalog(session=None, batch_size=CATALOG_BATCH_SIZE, career_ids=None):
+    """
+    Stream the career catalog as CareerRecords, in career id order
+
+    Careers, their skills (career_skill joined to skill) and their market
+    trend rows are fetched with one query each, all ordered by career id and
+    read batch_size rows at a time (server-side cursors where the database
+    supports them). The three streams are merge-joined on career id, so only
+    a batch of each query is held in memory, never the whole catalog or an
+    ORM object graph.
+
+    Args:
+        session: SQLAlchemy session (defaults to the session of the current
+            application context; see resolve_session)
+        batch_size: Rows fetched per round trip
+        career_ids: Only stream these careers (one Career.id IN (...) filter
+            per query), or None for the whole catalog
+
+    Returns:
+        Iterator over the CareerRecord of every career
+
+    Raises:
+        CatalogSessionError: If no session is given outside an application context
+    """
+    return _iter_catalog(resolve_session(session), batch_size, career_ids)
+
+def _iter_catalog(session, batch_size, career_ids):
+    """Generator behind iter_catalog, run once the session is resolved"""
+    from models import Career, MarketTrend, Skill, career_skill
+
+    options = {'yield_per': batch_size}
+
+    career_query = select(Career.id, Career.name, Career.description, Career.industry)
+    skill_query = (select(career_skill.c.career_id, Skill.id, Skill.name, Skill.description)
+                   .join(Skill, Skill.id == career_skill.c.skill_id))
+    trend_query = select(MarketTrend.career_id, MarketTrend.demand_level, MarketTrend.salary_range,
+                         MarketTrend.updated_at)
+    if career_ids is not None:
+        career_ids = sorted(set(career_ids))
+        career_query = career_query.where(Career.id.in_(career_ids))
+        skill_query = skill_query.where(career_skill.c.career_id.in_(career_ids))
+        trend_query = trend_query.where(MarketTrend.career_id.in_(career_ids))
+
+    career_rows = session.execute(career_query.order_by(Career.id), execution_options=options)
+    skill_rows = _GroupedRows(session.execute(
+        skill_query.order_by(career_skill.c.career_id, Skill.id),
+        execution_options=options
+    ))
+    trend_rows = _GroupedRows(session.execute(
+        trend_query.order_by(MarketTrend.career_id, MarketTrend.id),
+        execution_options=options
+    ))
+
+    for row in career_rows:
+        yield _career_record(row, skill_rows.take(row.id), trend_rows.take(row.id))
+
+def load_catalog(session=None):
+    """
+    Load the whole career catalog as a list of CareerRecords (see iter_catalog)
+
+    The three set-based queries replace one skills and one trends query per
+    career.
+
+    Args:
+        session: SQLAlchemy session (defaults to the session of the current
+            application context; see resolve_session)
+
+    Returns:
+        (records ordered by career id, stats dict with careers, queries and
+        seconds)
+    """
+    session = resolve_session(session)
+    start_time = time.perf_counter()
+
+    with count_queries(session.connection()) as query_count:
+        records = list(iter_catalog(session))
+
+    stats = {
+        'careers': len(records),
+        'queries': query_count[0],
+        'seconds': time.perf_counter() - start_time,
+    }
+    logger.info(f"Loaded {stats['careers']} careers with {stats['queries']} queries "
+                f"in {stats['seconds'] * 1e3:.1f} ms")
+    return records, stats
+
+def fetch_career_records(career_ids, session=None):
+    """
+    Fetch the CareerRecords of the given careers with one batched query per table
+
+    Used to resolve the top-n rows of an engine loaded from a model artifact
+    without loading the whole catalog.
+
+    Args:
+        career_ids: Career ids in the order wanted
+        session: SQLAlchemy session (defaults to the session of the current
+            application context; see resolve_session)
+
+    Returns:
+        List of CareerRecords in the same order (None for unknown ids)
+
+    Raises:
+        CatalogSessionError: If no session is given outside an application context
+    """
+    session = resolve_session(session)
+    wanted = sorted({int(career_id) for career_id in career_ids if career_id is not None and career_id >= 0})
+    records = {}
+    # Keep the IN lists within the bound parameter limits of the database
+    for start in range(0, len(wanted), CATALOG_BATCH_SIZE):
+        for record in iter_catalog(session, career_ids=wanted[start:start + CATALOG_BATCH_SIZE]):
+            records[record.id] = record
+    return [records.get(None if career_id is None else int(career_id)) for career_id in career_ids]
@@ -0,0 +1,229 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+from scipy import sparse
+from sklearn.base import clone
+
+from ai_engine import CareerRecommendationEngine
+from model_registry import ModelRegistry
+from model_store import save_model_dir
+from sample_profiles import get_sample_user_data
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = 'models/career_recommendation_model'
+
+# Default pruning: terms must occur in at least MIN_DF careers and in at most
+# MAX_DF of them, and weigh at least MIN_WEIGHT in some career vector
+MIN_DF = 2
+MAX_DF = 0.9
+MIN_WEIGHT = 0.01
+
+def term_statistics(career_vectors, n_fields=1):
+    """
+    Return the document frequency and the largest weight of every term
+
+    For a field-blocked matrix a term counts once per career, whatever the
+    fields it occurs in.
+    """
+    career_vectors = sparse.csr_matrix(career_vectors)
+    n_terms = career_vectors.shape[1] // n_fields
+    blocks = [career_vectors[:, field * n_terms:(field + 1) * n_terms] for field in range(n_fields)]
+
+    occurrences = sum((block != 0).astype(np.int32) for block in blocks)
+    document_frequency = np.asarray((occurrences > 0).sum(axis=0)).ravel()
+    max_weight = np.max([block.max(axis=0).toarray().ravel() for block in blocks], axis=0)
+    return document_frequency, max_weight
+
+def prune_vocabulary(vectorizer, career_vectors, fields=None, min_df=MIN_DF, max_df=MAX_DF, min_weight=MIN_WEIGHT):
+    """
+    Drop rare, ubiquitous and near-empty terms from a fitted model
+
+    Args:
+        vectorizer: Fitted TfidfVectorizer
+        career_vectors: Career matrix (field-blocked when fields is given)
+        fields: Block names of a field-blocked matrix, or None
+        min_df: Minimum number of careers containing a term
+        max_df: Maximum share of careers containing a term
+        min_weight: Minimum largest weight of a term in any career vector
+
+    Returns:
+        (pruned vectorizer, pruned career matrix, kept term indices); rows
+        are renormalized when the model is saved
+    """
+    n_fields = len(fields) if fields else 1
+    n_careers = career_vectors.shape[0]
+    document_frequency, max_weight = term_statistics(career_vectors, n_fields)
+
+    kept = np.flatnonzero((document_frequency >= min_df) &
+                          (document_frequency <= max_df * n_careers) &
+                          (max_weight >= min_weight))
+    if len(kept) == 0:
+        raise ValueError("Pruning would drop every term; lower min_df or min_weight, or raise max_df")
+
+    terms = [None] * len(vectorizer.vocabulary_)
+    for term, index in vectorizer.vocabulary_.items():
+        terms[index] = term
+
+    pruned = clone(vectorizer)
+    pruned.vocabulary_ = {terms[index]: column for column, index in enumerate(kept)}
+    if vectorizer.use_idf:
+        pruned.idf_ = np.asarray(vectorizer.idf_)[kept]
+
+    n_terms = len(terms)
+    columns = np.concatenate([kept + field * n_terms for field in range(n_fields)])
+    return pruned, sparse.csr_matrix(career_vectors)[:, columns], kept
+
+def matrix_nbytes(matrix):
+    """Bytes held by the data, indices and indptr arrays of a CSR matrix"""
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+def load_engine(path, repeats=3):
+    """Load a model into a new engine, returning (engine, best load time in seconds)"""
+    best, engine = None, None
+    for _ in range(repeats):
+        engine = CareerRecommendationEngine()
+        start_time = time.perf_counter()
+        if not engine.load_model(path):
+            raise ValueError(f"Could not load model from {path}")
+        elapsed = time.perf_counter() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+    return engine, best
+
+def top_careers(engine, users, top_n):
+    """Return the top career rows of every user"""
+    return [set(engine.find_top_careers(engine.query_vectors(engine.create_user_vector(user), [user]), top_n)[0])
+            for user in users]
+
+def load_users(path=None):
+    """Load user profiles from a JSON file, or use the sample profiles"""
+    if path:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    return get_sample_user_data()
+
+def compact_model(source, target, min_df=MIN_DF, max_df=MAX_DF, min_weight=MIN_WEIGHT, users=None, top_n=5):
+    """
+    Prune the vocabulary of a saved model, save the result and report the effect
+
+    Args:
+        source: Model directory or legacy pickle to compact
+        target: Model directory to write (may be source)
+        min_df, max_df, min_weight: Pruning thresholds (see prune_vocabulary)
+        users: User profiles for the top-n overlap check
+        top_n: Recommendations compared per user
+
+    Returns:
+        Report dictionary
+    """
+    original, original_load = load_engine(source)
+    snapshot = original.snapshot
+    vectorizer, career_vectors, kept = prune_vocabulary(snapshot.vectorizer, snapshot.career_vectors,
+                                                        snapshot.fields, min_df, max_df, min_weight)
+    original_top = top_careers(original, users or [], top_n)
+
+    save_model_dir(target, vectorizer, career_vectors, snapshot.career_titles,
+                   career_ids=original.get_career_ids(), fields=snapshot.fields,
+                   field_weights=snapshot.field_weights, catalog_hash=snapshot.catalog_hash)
+    compacted, compacted_load = load_engine(target)
+    compacted_top = top_careers(compacted, users or [], top_n)
+
+    overlaps = [len(a & b) / max(len(a), 1) for a, b in zip(original_top, compacted_top, strict=True)]
+    report = {
+        'source': source,
+        'target': target,
+        'thresholds': {'min_df': min_df, 'max_df': max_df, 'min_weight': min_weight},
+        'careers': snapshot.career_vectors.shape[0],
+        'terms': [len(snapshot.vectorizer.vocabulary_), len(kept)],
+        'shape': [list(snapshot.career_vectors.shape), list(compacted.career_vectors.shape)],
+        'nnz': [int(snapshot.career_vectors.nnz), int(compacted.career_vectors.nnz)],
+        'matrix_bytes': [matrix_nbytes(snapshot.career_vectors) + matrix_nbytes(snapshot.career_vectors_t),
+                         matrix_nbytes(compacted.career_vectors) + matrix_nbytes(compacted.career_vectors_t)],
+        'load_seconds': [original_load, compacted_load],
+        'users': len(overlaps),
+        f'top{top_n}_overlap': float(np.mean(overlaps)) if overlaps else None,
+        f'top{top_n}_overlap_min': float(np.min(overlaps)) if overlaps else None,
+    }
+
+    logger.info(f"Terms: {report['terms'][0]} -> {report['terms'][1]} "
+                f"({1 - report['terms'][1] / report['terms'][0]:.1%} pruned)")
+    logger.info(f"Matrix: {report['shape'][0]} nnz={report['nnz'][0]} {report['matrix_bytes'][0] / 2**20:.2f} MiB -> "
+                f"{report['shape'][1]} nnz={report['nnz'][1]} {report['matrix_bytes'][1] / 2**20:.2f} MiB")
+    logger.info(f"Load time: {original_load * 1e3:.1f} ms -> {compacted_load * 1e3:.1f} ms")
+    if overlaps:
+        logger.info(f"Top-{top_n} overlap with the original model over {len(overlaps)} users: "
+                    f"mean {report[f'top{top_n}_overlap']:.1%}, min {report[f'top{top_n}_overlap_min']:.1%}")
+    return report
+
+def main():
+    """Compact a saved model from the command line"""
+    parser = argparse.ArgumentParser(description="Prune the vocabulary of a saved career recommendation model")
+    parser.add_argument('source', nargs='?', default=None,
+                        help=f"model directory or pickle (default: the active registry version, "
+                             f"else {DEFAULT_MODEL_PATH}[.pkl])")
+    parser.add_argument('--output', help="model directory to write (default: a new inactive registry version when "
+                                         "compacting the active one, else <source>_compact)")
+    parser.add_argument('--min-df', type=int, default=MIN_DF, help="minimum number of careers containing a term")
+    parser.add_argument('--max-df', type=float, default=MAX_DF, help="maximum share of careers containing a term")
+    parser.add_argument('--min-weight', type=float, default=MIN_WEIGHT,
+                        help="minimum largest weight of a term in any career vector")
+    parser.add_argument('--users', help="JSON list of user profiles for the overlap check "
+                                        "(default: the sample_profiles users)")
+    parser.add_argument('--top-n', type=int, default=5, help="recommendations compared per user")
+    parser.add_argument('--report', help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    registry = ModelRegistry()
+    source_version = registry.active_version() if args.source is None else None
+    if source_version:
+        source = registry.path(source_version)
+    else:
+        source = args.source or DEFAULT_MODEL_PATH
+        if args.source is None and not os.path.exists(source):
+            source = f"{DEFAULT_MODEL_PATH}.pkl"
+    if not os.path.exists(source):
+        logger.error(f"Model not found: {source}")
+        return 1
+    thresholds = (args.min_df, args.max_df, args.min_weight)
+    users = load_users(args.users)
+
+    try:
+        if source_version and not args.output:
+            # A compacted registry model becomes a new (inactive) version of its own
+            reports = []
+
+            def save_compacted(path):
+                reports.append(compact_model(source, path, *thresholds, users=users, top_n=args.top_n))
+                return True
+
+            source_meta = registry.get(source_version)
+            version = registry.register(
+                save_compacted,
+                source='compact_model', build_seconds=source_meta.get('build_seconds'), activate=False,
+                compacted_from=source_version
+            )
+            report = dict(reports[0], target=registry.path(version))
+            logger.info(f"Compacted model registered as version {version}; "
+                        f"activate it with: python model_registry.py activate {version}")
+        else:
+            target = args.output or f"{os.path.splitext(source)[0] if source.endswith('.pkl') else source}_compact"
+            report = compact_model(source, target, *thresholds, users=users, top_n=args.top_n)
+            logger.info(f"Compacted model saved to {target}")
+    except Exception as e:
+        logger.error(f"Error compacting model: {e}")
+        return 1
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with an optional time to live
+
+    Counts hits, misses and evictions so callers can report cache metrics;
+    callers may also record how long misses took to compute and how much
+    time hits saved. A maxsize of 0 disables caching.
+    """
+    def __init__(self, maxsize=1024, ttl=None):
+        """
+        Args:
+            maxsize: Maximum number of entries; the least recently used entry
+                is evicted beyond it
+            ttl: Seconds an entry stays valid, or None for no expiry
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.compute_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def get(self, key, default=None):
+        """Return the cached value for key (marking it recently used), or default"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entries beyond maxsize"""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def record_compute_time(self, seconds):
+        """Record the time spent computing a value after a miss"""
+        with self._lock:
+            self.compute_seconds += seconds
+
+    def record_saved_time(self, seconds):
+        """Record the computation time a hit avoided"""
+        with self._lock:
+            self.saved_seconds += seconds
+
+    def clear(self):
+        """Drop every entry; the counters are kept"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return the cache size and counters as a dictionary"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'compute_seconds': self.compute_seconds,
+                'saved_seconds': self.saved_seconds,
+                'avg_miss_ms': self.compute_seconds / self.misses * 1e3 if self.misses else 0.0,
+            }
+
+def document_key(document):
+    """Return a compact, fixed-size cache key for a text document"""
+    return hashlib.sha1(document.encode('utf-8')).digest()
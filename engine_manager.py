@@ -0,0 +1,396 @@
+import logging
+import os
+import re
+import threading
+import time
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from ai_engine import HYBRID_CANDIDATE_FACTOR, CareerRecommendationEngine, catalog_hash
+from catalog_loader import iter_catalog, load_catalog
+from model_registry import REGISTRY_ROOT, ModelRegistry
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Model artifacts written by older versions of the training scripts, used
+# when the model registry has no active version
+MODEL_ARTIFACTS = [
+    'models/career_recommendation_model',
+    'models/career_recommendation_model.pkl',
+    'career_recommendation_model.pkl',
+]
+
+# Tables whose rows feed the career documents and records: skill names and
+# descriptions are part of the documents, market trends give the salary,
+# growth and demand values
+CATALOG_TABLES = {'career', 'career_skill', 'skill', 'market_trend'}
+
+# Raw SQL statements that modify the career catalog
+CATALOG_WRITE_PATTERN = re.compile(
+    r'^\s*(insert\s+into|update|delete\s+from)\s+["`]?(career|career_skill|skill|market_trend)\b',
+    re.IGNORECASE
+)
+
+# Relationships that feed the career documents and records, by model name;
+# other relationships (such as the users backref of Skill) do not
+CATALOG_RELATIONSHIPS = {
+    'Career': ('skills', 'market_trends'),
+    'MarketTrend': ('career',),
+    'Skill': (),
+}
+
+def catalog_fields_changed(obj):
+    """True if a pending catalog object has changes in its columns or CATALOG_RELATIONSHIPS."""
+    state = inspect(obj)
+    names = [attr.key for attr in state.mapper.column_attrs]
+    names.extend(CATALOG_RELATIONSHIPS[type(obj).__name__])
+    return any(state.attrs[name].history.has_changes() for name in names)
+
+class EngineManager:
+    """
+    Owns the recommendation engine used by the web app.
+
+    The engine is loaded from a saved model artifact at startup and rebuilt in
+    a background thread whenever the career catalog changes, so request
+    handlers never pay the cost of fitting the vectorizer. A watcher thread
+    follows the active version of the model registry, so activating a new
+    model (or rolling back) swaps the engine without a restart.
+    """
+    def __init__(self, app):
+        self.app = app
+        self.engine = self.new_engine()
+        self.catalog_version = 0
+        self.engine_catalog_version = -1
+        self.registry = ModelRegistry(app.config.get('RECOMMENDER_MODEL_REGISTRY', REGISTRY_ROOT))
+        # Registry version the engine was loaded from (None when fit or loaded otherwise)
+        self.model_version = None
+        # Last active registry version seen by the watcher
+        self._active_version = None
+        # Bumped by every engine swap; an engine built from an older generation is stale
+        self.engine_generation = 0
+        self._lock = threading.Lock()
+        self._rebuild_thread = None
+        self._watch_thread = None
+        self._listeners_installed = False
+
+    def new_engine(self):
+        """Create an unfitted engine configured from the app config."""
+        return CareerRecommendationEngine(
+            retrieval_mode=self.app.config.get('RECOMMENDER_RETRIEVAL_MODE', 'exhaustive'),
+            nprobe=self.app.config.get('RECOMMENDER_IVF_NPROBE', 8),
+            hybrid_candidates=self.app.config.get('RECOMMENDER_HYBRID_CANDIDATES', HYBRID_CANDIDATE_FACTOR),
+            user_vector_cache_size=self.app.config.get('RECOMMENDER_CACHE_SIZE', 1024),
+            user_vector_cache_ttl=self.app.config.get('RECOMMENDER_CACHE_TTL'),
+            result_cache_size=self.app.config.get('RECOMMENDER_CACHE_SIZE', 1024),
+            result_cache_ttl=self.app.config.get('RECOMMENDER_CACHE_TTL'),
+            n_jobs=self.app.config.get('RECOMMENDER_FIT_JOBS', 1),
+            field_weights=self.app.config.get('RECOMMENDER_FIELD_WEIGHTS'),
+            compact=self.app.config.get('RECOMMENDER_COMPACT_VECTORS', False)
+        )
+
+    @property
+    def is_ready(self):
+        """True once the engine has careers and vectors to score against."""
+        snapshot = self.engine.snapshot
+        return bool(snapshot.careers) and snapshot.career_vectors is not None
+
+    @property
+    def is_current(self):
+        """True when the engine was built from the latest catalog version."""
+        return self.engine_catalog_version == self.catalog_version
+
+    def stats(self):
+        """Return the engine state and cache metrics as a dictionary."""
+        engine = self.engine
+        stats = engine.get_cache_stats()
+        stats.update({
+            'ready': self.is_ready,
+            'current': self.is_current,
+            'catalog_version': self.catalog_version,
+            'model_version': self.model_version,
+            'retrieval_mode': engine.retrieval_mode,
+            'careers': len(engine.snapshot.careers),
+        })
+        return stats
+
+    def find_model_artifact(self):
+        """Return the active registry model, else the newest legacy artifact, or None."""
+        active_path = self.registry.active_path()
+        if active_path:
+            return active_path
+        existing = [path for path in MODEL_ARTIFACTS if os.path.exists(path)]
+        if not existing:
+            return None
+        return max(existing, key=os.path.getmtime)
+
+    def preload(self):
+        """
+        Load the engine at application startup.
+
+        The active registry model (or the newest legacy artifact) is used when
+        its rows line up with the careers in the database; otherwise a
+        background rebuild is started. Must be called inside an application
+        context.
+        """
+        self.install_catalog_listeners()
+
+        self._active_version = self.registry.active_version()
+        model_path = self.find_model_artifact()
+        loaded = False
+        if model_path:
+            generation, catalog_version = self._engine_state()
+            engine = self.load_engine(model_path)
+            if engine is not None:
+                from_registry = self._active_version is not None and model_path == self.registry.path(self._active_version)
+                model_version = self._active_version if from_registry else None
+                loaded = self._install_engine(engine, generation, model_version, catalog_version)
+                if loaded:
+                    logger.info(f"Recommendation engine preloaded from {model_path}")
+
+        if not loaded:
+            self.schedule_rebuild()
+        self.start_model_watcher()
+        return loaded
+
+    def load_engine(self, model_path):
+        """
+        Load a saved model and attach the database careers to its rows.
+
+        Must be called inside an application context.
+
+        Returns:
+            The loaded engine, or None if the model cannot be loaded or does
+            not match the career catalog
+        """
+        engine = self.new_engine()
+        if not engine.load_model(model_path):
+            return None
+        try:
+            careers, _ = load_catalog()
+            careers = self._align_careers(engine.snapshot, careers)
+            if careers is None:
+                logger.info(f"Model artifact {model_path} does not match the career catalog")
+                return None
+            engine.set_careers(careers)
+            return engine
+        except Exception as e:
+            logger.error(f"Error aligning model artifact with careers: {e}")
+            return None
+
+    def _engine_state(self):
+        """Return the (engine generation, catalog version) a new engine is loaded or built against."""
+        with self._lock:
+            return self.engine_generation, self.catalog_version
+
+    def _install_engine(self, engine, generation, model_version=None, catalog_version=None):
+        """
+        Make a loaded or rebuilt engine the serving engine, unless it is stale.
+
+        Args:
+            engine: The new engine
+            generation: engine_generation read (see _engine_state) before the
+                engine was loaded or built; if another engine was installed
+                since, this one is dropped
+            model_version: Registry version the engine was loaded from, or None
+            catalog_version: Catalog version the engine reflects (defaults to
+                the current one)
+
+        Returns:
+            True if the engine was installed
+        """
+        with self._lock:
+            if generation != self.engine_generation:
+                return False
+            self.engine = engine
+            self.model_version = model_version
+            self.engine_catalog_version = self.catalog_version if catalog_version is None else catalog_version
+            self.engine_generation += 1
+            return True
+
+    def start_model_watcher(self):
+        """Start polling the registry for a new active version, unless disabled or running."""
+        interval = self.app.config.get('RECOMMENDER_MODEL_POLL_SECONDS', 10)
+        if not interval or interval <= 0:
+            return False
+        with self._lock:
+            if self._watch_thread is not None and self._watch_thread.is_alive():
+                return False
+            self._watch_thread = threading.Thread(target=self._watch_models, args=(interval,),
+                                                  name='model-watcher', daemon=True)
+            self._watch_thread.start()
+            return True
+
+    def _watch_models(self, interval):
+        """Check the active registry version every interval seconds."""
+        while True:
+            time.sleep(interval)
+            try:
+                self.check_active_model()
+            except Exception as e:
+                logger.error(f"Error checking the active model version: {e}")
+
+    def check_active_model(self):
+        """
+        Swap to the active registry version if it changed since the last check.
+
+        A version that fails to load or does not match the catalog is logged
+        and skipped; the current engine keeps serving until the next change.
+        A version whose load was overtaken by another engine swap (such as a
+        rebuild) is dropped and loaded again on the next check.
+
+        Returns:
+            True if the engine was swapped
+        """
+        version = self.registry.active_version()
+        if version is None or version == self._active_version:
+            return False
+        self._active_version = version
+
+        generation, catalog_version = self._engine_state()
+        with self.app.app_context():
+            engine = self.load_engine(self.registry.path(version))
+        if engine is None:
+            logger.error(f"Model version {version} could not be activated; keeping the current engine")
+            return False
+
+        if not self._install_engine(engine, generation, version, catalog_version):
+            self._active_version = None
+            logger.info(f"Another engine was installed while model version {version} loaded; retrying later")
+            return False
+        logger.info(f"Recommendation engine swapped to model version {version}")
+        return True
+
+    def _align_careers(self, snapshot, careers):
+        """
+        Map model rows to career records, or return None on a mismatch.
+
+        Models saved with career ids are aligned by id, and rejected when
+        their catalog hash shows the careers changed since the fit; older
+        models are aligned by title.
+        """
+        if not careers or len(careers) != len(snapshot.career_titles):
+            return None
+
+        if snapshot.career_ids is not None:
+            careers_by_id = {career.id: career for career in careers}
+            aligned = [careers_by_id.get(int(career_id)) for career_id in snapshot.career_ids]
+        else:
+            careers_by_title = {career.title: career for career in careers}
+            aligned = [careers_by_title.get(title) for title in snapshot.career_titles]
+        if any(career is None for career in aligned):
+            return None
+
+        if snapshot.catalog_hash is not None and catalog_hash(aligned) != snapshot.catalog_hash:
+            logger.info("The career catalog changed since the model was fit")
+            return None
+        return aligned
+
+    def install_catalog_listeners(self):
+        """Bump the catalog version whenever a commit touches rows of the CATALOG_TABLES."""
+        if self._listeners_installed:
+            return
+
+        from models import Career, MarketTrend, Skill
+
+        catalog_models = (Career, Skill, MarketTrend)
+
+        def after_flush(session, _):
+            for obj in list(session.new) + list(session.deleted):
+                if isinstance(obj, catalog_models):
+                    session.info['catalog_changed'] = True
+                    return
+            # Dirty objects only count when fields the catalog reads changed:
+            # a user's skill list marks its skills dirty through their backref
+            for obj in session.dirty:
+                if isinstance(obj, catalog_models) and catalog_fields_changed(obj):
+                    session.info['catalog_changed'] = True
+                    return
+
+        def do_orm_execute(orm_execute_state):
+            statement = orm_execute_state.statement
+            if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+                table = getattr(statement, 'table', None)
+                changed = table is not None and table.name in CATALOG_TABLES
+            elif isinstance(statement, TextClause):
+                changed = bool(CATALOG_WRITE_PATTERN.match(statement.text))
+            else:
+                changed = False
+            if changed:
+                orm_execute_state.session.info['catalog_changed'] = True
+
+        def after_commit(session):
+            if session.info.pop('catalog_changed', False):
+                self.mark_catalog_changed()
+
+        def after_rollback(session):
+            session.info.pop('catalog_changed', None)
+
+        event.listen(Session, 'after_flush', after_flush)
+        event.listen(Session, 'do_orm_execute', do_orm_execute)
+        event.listen(Session, 'after_commit', after_commit)
+        event.listen(Session, 'after_rollback', after_rollback)
+        self._listeners_installed = True
+
+    def mark_catalog_changed(self):
+        """Record a catalog change and rebuild the engine in the background."""
+        with self._lock:
+            self.catalog_version += 1
+        # Cached results may show careers as they were before the change
+        self.engine.invalidate_results()
+        logger.info(f"Career catalog changed (version {self.catalog_version})")
+        self.schedule_rebuild()
+
+    def schedule_rebuild(self):
+        """Start a background rebuild unless one is already running."""
+        with self._lock:
+            if self._rebuild_thread is not None and self._rebuild_thread.is_alive():
+                return False
+            self._rebuild_thread = threading.Thread(target=self._rebuild, name='engine-rebuild', daemon=True)
+            self._rebuild_thread.start()
+            return True
+
+    def wait_for_rebuild(self, timeout=None):
+        """Block until a running background rebuild finishes; return False on timeout."""
+        thread = self._rebuild_thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def _build_engine(self):
+        """Fit a new engine on the careers currently in the database."""
+        try:
+            with self.app.app_context():
+                from models import Career
+
+                if Career.query.first() is None:
+                    logger.info("No careers in the database; recommendation engine not built")
+                    return None
+
+                # Stream the catalog straight into the vectorizer
+                engine = self.new_engine()
+                engine.create_career_vectors(iter_catalog())
+                return engine
+        except Exception as e:
+            logger.error(f"Error rebuilding recommendation engine: {e}")
+            return None
+
+    def _rebuild(self):
+        """Rebuild the engine until it catches up with the latest catalog version."""
+        while True:
+            generation, target_version = self._engine_state()
+            engine = self._build_engine()
+
+            if engine is not None:
+                if self._install_engine(engine, generation, catalog_version=target_version):
+                    logger.info(f"Recommendation engine rebuilt for catalog version {target_version}")
+                else:
+                    logger.info("Another engine was installed during the rebuild; dropping the rebuilt one")
+
+            with self._lock:
+                if engine is None or self.engine_catalog_version == self.catalog_version:
+                    self._rebuild_thread = None
+                    return
@@ -0,0 +1,358 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from ai_engine import CareerMatch, CareerRecommendationEngine
+from career_record import as_career_record
+from synthetic_data import make_topic_data, make_vocabulary
+from text_normalizer import normalize_text
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Default evaluation size
+N_CAREERS = 2000
+N_TOPICS = 200
+N_USERS = 2000
+BATCH_SIZE = 100
+K_VALUES = (5, 10)
+PERCENTILES = (50, 95, 99)
+
+# Requests run before timing starts
+WARMUP_REQUESTS = 20
+
+# Evaluation setup
+#
+# Every profile carries a 'relevant' list of career ids or titles: the
+# careers it was generated from. Profiles are generated either from a
+# synthetic topical catalog (synthetic_data.make_topic_data; relevant:
+# every career of the user's topic) or from the careers of the database
+# (relevant: the career whose skills and description words the profile
+# samples), or loaded from a JSON file, and can be saved so runs are
+# compared on identical profiles.
+#
+# The profiles are ranked twice with the result and user vector caches
+# disabled: in batches through get_career_recommendations_batch (exhaustive
+# scoring, reported with per-batch latency and throughput) and one by one
+# through get_career_recommendations (the engine's retrieval mode, reported
+# with per-request latency percentiles).
+
+def profiles_from_catalog(careers, n_users, n_skills=3, n_words=8, noise=0.25, seed=0):
+    """
+    Generate labelled user profiles from catalog careers
+
+    Each profile picks a career and samples some of its skills and
+    description words, with a share of noise words taken from other careers;
+    the picked career is the relevant one.
+
+    Args:
+        careers: CareerRecords or career dictionaries
+        n_users: Number of profiles
+        n_skills: Skills sampled per profile
+        n_words: Interest words sampled per profile
+        noise: Share of interest words taken from random other careers
+        seed: Random seed
+
+    Returns:
+        List of user profiles
+    """
+    rng = np.random.default_rng(seed)
+    careers = [as_career_record(career) for career in careers]
+    career_words = []
+    for career in careers:
+        description = career.get('description', '') if isinstance(career, dict) else career.description
+        career_words.append([word for word in normalize_text(description or '').split() if len(word) > 3])
+
+    users = []
+    for index in rng.integers(len(careers), size=n_users):
+        career = careers[index]
+        if isinstance(career, dict):
+            skills = [skill.strip() for skill in (career.get('skills') or '').split(',') if skill.strip()]
+            label, education = career.get('title'), career.get('requirements', '')
+        else:
+            skills = list(career.skill_names)
+            label = career.id if career.id is not None else career.title
+            education = career.education_required
+
+        n_noise = int(round(n_words * noise))
+        words = list(rng.choice(career_words[index], size=n_words - n_noise)) if career_words[index] else []
+        for other in rng.integers(len(careers), size=n_noise):
+            if career_words[other]:
+                words.append(str(rng.choice(career_words[other])))
+
+        users.append({
+            'skills': [str(skill) for skill in rng.permutation(skills)[:n_skills]],
+            'interests': ' '.join(str(word) for word in words),
+            'strengths': '',
+            'personality_traits': '',
+            'education_level': education or '',
+            'relevant': [label],
+        })
+    return users
+
+def is_relevant(career, relevant):
+    """True if a recommended career is among the relevant career ids or titles"""
+    if isinstance(career, dict):
+        return career.get('id') in relevant or career.get('title') in relevant
+    return getattr(career, 'id', None) in relevant or getattr(career, 'title', None) in relevant
+
+def ranking_metrics(results, users, k_values=K_VALUES):
+    """
+    Mean recall@k, NDCG@k (binary relevance) and MRR of ranked results
+
+    Args:
+        results: One list of (career, score, reasoning) tuples or CareerMatch
+            objects per user
+        users: Profiles with a 'relevant' list of career ids or titles
+        k_values: Cut-offs to report
+
+    Returns:
+        Dict of metric name to mean value
+    """
+    max_k = max(k_values)
+    discounts = 1.0 / np.log2(np.arange(2, max_k + 2))
+    recall = {k: [] for k in k_values}
+    ndcg = {k: [] for k in k_values}
+    reciprocal_ranks = []
+
+    for recommendations, user in zip(results, users, strict=True):
+        relevant = set(user['relevant'])
+        gains = np.zeros(max_k)
+        for rank, recommendation in enumerate(recommendations[:max_k]):
+            # Read the career of lazy results without generating their reasoning
+            career = recommendation.career if isinstance(recommendation, CareerMatch) else recommendation[0]
+            gains[rank] = is_relevant(career, relevant)
+        hits = np.flatnonzero(gains)
+        reciprocal_ranks.append(1.0 / (hits[0] + 1) if len(hits) else 0.0)
+        for k in k_values:
+            recall[k].append(gains[:k].sum() / max(len(relevant), 1))
+            ideal = discounts[:min(len(relevant), k)].sum()
+            ndcg[k].append((gains[:k] * discounts[:k]).sum() / ideal if ideal else 0.0)
+
+    metrics = {}
+    for k in k_values:
+        metrics[f'recall@{k}'] = float(np.mean(recall[k])) if users else None
+        metrics[f'ndcg@{k}'] = float(np.mean(ndcg[k])) if users else None
+    metrics[f'mrr@{max_k}'] = float(np.mean(reciprocal_ranks)) if users else None
+    return metrics
+
+def latency_summary(seconds):
+    """Percentiles and mean of latencies, in milliseconds"""
+    milliseconds = np.asarray(seconds) * 1e3
+    summary = {f'p{p}': float(np.percentile(milliseconds, p)) for p in PERCENTILES}
+    summary['mean'] = float(milliseconds.mean())
+    return summary
+
+def run_batches(engine, users, top_n, batch_size=BATCH_SIZE):
+    """Rank the users in batches, returning (results, per-batch latencies, total seconds)"""
+    engine.get_career_recommendations_batch(users[:min(len(users), batch_size)], top_n, lazy_reasoning=True)
+    results, latencies = [], []
+    start_time = time.perf_counter()
+    for start in range(0, len(users), batch_size):
+        batch_start = time.perf_counter()
+        results.extend(engine.get_career_recommendations_batch(users[start:start + batch_size], top_n,
+                                                               lazy_reasoning=True))
+        latencies.append(time.perf_counter() - batch_start)
+    return results, latencies, time.perf_counter() - start_time
+
+def run_single(engine, users, top_n, reasoning=False):
+    """Rank the users one request at a time, returning (results, per-request latencies, total seconds)"""
+    for user in users[:WARMUP_REQUESTS]:
+        engine.get_career_recommendations(user, top_n, lazy_reasoning=not reasoning)
+    results, latencies = [], []
+    start_time = time.perf_counter()
+    for user in users:
+        request_start = time.perf_counter()
+        results.append(engine.get_career_recommendations(user, top_n, lazy_reasoning=not reasoning))
+        latencies.append(time.perf_counter() - request_start)
+    return results, latencies, time.perf_counter() - start_time
+
+def evaluate(engine, users, k_values=K_VALUES, batch_size=BATCH_SIZE, reasoning=False):
+    """
+    Measure the ranking quality and latency of an engine on labelled profiles
+
+    Args:
+        engine: Fitted or loaded CareerRecommendationEngine, with caching disabled
+        users: Profiles with a 'relevant' list of career ids or titles
+        k_values: Cut-offs of the ranking metrics
+        batch_size: Users per batch request
+        reasoning: Generate the reasoning text in single requests, as the
+            web app does
+
+    Returns:
+        Dict with 'batch' and 'single' sections
+    """
+    top_n = max(k_values)
+    report = {}
+    for mode in ('batch', 'single'):
+        if mode == 'batch':
+            results, latencies, total = run_batches(engine, users, top_n, batch_size)
+        else:
+            results, latencies, total = run_single(engine, users, top_n, reasoning)
+        report[mode] = {
+            'quality': ranking_metrics(results, users, k_values),
+            'latency_ms': latency_summary(latencies),
+            'throughput_users_per_second': len(users) / total if total else None,
+        }
+        if mode == 'batch':
+            report[mode]['batch_size'] = batch_size
+
+        quality = ', '.join(f"{name}={value:.4f}" for name, value in report[mode]['quality'].items())
+        latency = ', '.join(f"{name}={value:.2f}" for name, value in report[mode]['latency_ms'].items())
+        logger.info(f"{mode}: {quality}")
+        logger.info(f"{mode}: latency ms {latency}; {report[mode]['throughput_users_per_second']:.0f} users/s")
+    return report
+
+def flatten_metrics(report, prefix=''):
+    """Flatten the numeric values of a nested report into {'a.b.c': value}"""
+    flat = {}
+    for key, value in report.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_metrics(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+def compare_reports(baseline, report, sections=('batch', 'single'),
+                    metrics=('quality', 'latency_ms', 'throughput_users_per_second')):
+    """Log the change of every metric between a baseline report and a new one"""
+    def measured(run):
+        return flatten_metrics({section: {name: value for name, value in run.get(section, {}).items()
+                                          if name in metrics}
+                                for section in sections})
+
+    old, new = measured(baseline), measured(report)
+    for name in sorted(set(old) & set(new)):
+        change = f" ({(new[name] - old[name]) / old[name]:+.1%})" if old[name] else ''
+        logger.info(f"{name}: {old[name]:.4f} -> {new[name]:.4f}{change}")
+
+def open_app():
+    """Import the Flask app for database-backed evaluation, without swapping models meanwhile"""
+    os.environ.setdefault('RECOMMENDER_MODEL_POLL_SECONDS', '0')
+    from app import app
+    from routes import engine_manager
+
+    # Do not measure while the app fits an engine in the background
+    engine_manager.wait_for_rebuild()
+    # Every request must be computed, not served from a cache
+    app.config['RECOMMENDER_CACHE_SIZE'] = 0
+    return app, engine_manager
+
+def main():
+    """Evaluate the recommendation engine from the command line"""
+    parser = argparse.ArgumentParser(description="Measure the ranking quality and latency of the recommendation engine")
+    engine_source = parser.add_mutually_exclusive_group()
+    engine_source.add_argument('--model', help="evaluate a saved model directory or pickle ('active': the active "
+                                        "registry version) against the database careers")
+    engine_source.add_argument('--database', action='store_true', help="fit the engine on the database careers")
+    parser.add_argument('--careers', type=int, default=N_CAREERS, help="synthetic catalog size")
+    parser.add_argument('--topics', type=int, default=N_TOPICS, help="synthetic catalog topics")
+    parser.add_argument('--users', type=int, default=N_USERS, help="number of generated profiles")
+    parser.add_argument('--noise', type=float, default=0.25,
+                        help="share of interest words of database profiles taken from other careers")
+    parser.add_argument('--load-users', help="JSON list of profiles with 'relevant' career ids or titles")
+    parser.add_argument('--save-users', help="write the profiles used to this JSON file")
+    parser.add_argument('--k', type=int, nargs='+', default=list(K_VALUES), help="ranking metric cut-offs")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="users per batch request")
+    parser.add_argument('--retrieval-mode', default='exhaustive', help="exhaustive, inverted or ivf")
+    parser.add_argument('--field-weights', type=json.loads, default=None,
+                        help="JSON field weights to fit a field-blocked engine, e.g. '{}'")
+    parser.add_argument('--compact', action='store_true', help="fit float32 vectors")
+    parser.add_argument('--reasoning', action='store_true', help="generate reasoning text in single requests")
+    parser.add_argument('--seed', type=int, default=0, help="random seed of the generated data")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    parser.add_argument('--compare', help="JSON report of a previous run to compare against")
+    args = parser.parse_args()
+
+    def new_engine():
+        return CareerRecommendationEngine(retrieval_mode=args.retrieval_mode, user_vector_cache_size=0,
+                                          result_cache_size=0, field_weights=args.field_weights,
+                                          compact=args.compact)
+
+    try:
+        model_info = {}
+        if args.model or args.database:
+            app, engine_manager = open_app()
+            app.config['RECOMMENDER_RETRIEVAL_MODE'] = args.retrieval_mode
+            with app.app_context():
+                from catalog_loader import load_catalog
+
+                careers, _ = load_catalog()
+                if not careers:
+                    logger.error("No careers in the database")
+                    return 1
+                if args.model:
+                    version = engine_manager.registry.active_version() if args.model == 'active' else None
+                    model_path = engine_manager.registry.path(version) if version else args.model
+                    engine = engine_manager.load_engine(model_path)
+                    if engine is None:
+                        logger.error(f"Model {model_path} could not be loaded against the database careers")
+                        return 1
+                    model_info = {'path': model_path, 'registry_version': version}
+                else:
+                    engine = new_engine()
+                    engine.create_career_vectors(careers)
+                users = (profiles_from_catalog(careers, args.users, noise=args.noise, seed=args.seed)
+                         if not args.load_users else None)
+            source = 'model' if args.model else 'database'
+        else:
+            app = None
+            careers, users = make_topic_data(args.careers, args.users, make_vocabulary(seed=args.seed),
+                                            n_topics=args.topics, seed=args.seed, skill_words=4, labels=True)
+            engine = new_engine()
+            engine.create_career_vectors(careers)
+            source = 'synthetic'
+
+        if args.load_users:
+            with open(args.load_users, encoding='utf-8') as f:
+                users = json.load(f)
+        if args.save_users:
+            with open(args.save_users, 'w', encoding='utf-8') as f:
+                json.dump(users, f)
+
+        snapshot = engine.snapshot
+        logger.info(f"Evaluating {len(users)} profiles against {snapshot.career_vectors.shape[0]} careers ({source})")
+        if app is not None:
+            with app.app_context():
+                results = evaluate(engine, users, args.k, args.batch_size, args.reasoning)
+        else:
+            results = evaluate(engine, users, args.k, args.batch_size, args.reasoning)
+    except Exception as e:
+        logger.error(f"Error evaluating engine: {e}")
+        return 1
+
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'source': source,
+        'engine': dict(model_info, **{
+            'retrieval_mode': engine.retrieval_mode,
+            'careers': snapshot.career_vectors.shape[0],
+            'terms': snapshot.term_count(),
+            'fields': list(snapshot.fields) if snapshot.fields else None,
+            'dtype': str(snapshot.career_vectors.dtype),
+            'catalog_hash': snapshot.catalog_hash,
+        }),
+        'users': {'count': len(users), 'loaded_from': args.load_users, 'seed': args.seed},
+        'k': list(args.k),
+    }
+    report.update(results)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare_reports(json.load(f), report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Report written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+import uuid
+from datetime import datetime
+
+from model_store import META_FILE, is_model_dir
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Registry layout
+#
+#     models/registry/
+#         ACTIVE                    id of the active version (replaced atomically)
+#         history.jsonl             one line per activation (or rollback), oldest first
+#         versions/<version>/       model directory written by save_model_dir,
+#             registry.json         plus the registry metadata of the version
+#
+# Versions are never modified once registered: a retrained or compacted
+# model is a new version. Version ids start with the creation time. Readers
+# resolve ACTIVE to a version directory, so switching models (or rolling
+# back) is a single os.replace of a small file; the engine manager polls it
+# and swaps the serving engine without a restart.
+REGISTRY_ROOT = 'models/registry'
+ACTIVE_FILE = 'ACTIVE'
+HISTORY_FILE = 'history.jsonl'
+VERSIONS_DIR = 'versions'
+VERSION_META_FILE = 'registry.json'
+
+class ModelRegistry:
+    """Versioned model artifacts with an atomically switched active version"""
+    def __init__(self, root=REGISTRY_ROOT):
+        self.root = root
+        self.versions_dir = os.path.join(root, VERSIONS_DIR)
+
+    def path(self, version):
+        """Return the model directory of a version"""
+        return os.path.join(self.versions_dir, version)
+
+    def exists(self, version):
+        """True if the version is registered"""
+        return bool(version) and os.path.exists(os.path.join(self.path(version), VERSION_META_FILE))
+
+    def get(self, version):
+        """Return the metadata of a version"""
+        with open(os.path.join(self.path(version), VERSION_META_FILE), encoding='utf-8') as f:
+            return json.load(f)
+
+    def versions(self):
+        """Return the metadata of every version, oldest first"""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        versions = [self.get(version) for version in os.listdir(self.versions_dir) if self.exists(version)]
+        return sorted(versions, key=lambda meta: meta['created_at'])
+
+    def active_version(self):
+        """Return the id of the active version, or None"""
+        try:
+            with open(os.path.join(self.root, ACTIVE_FILE), encoding='utf-8') as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version if self.exists(version) else None
+
+    def active_path(self):
+        """Return the model directory of the active version, or None"""
+        version = self.active_version()
+        return self.path(version) if version else None
+
+    def register(self, save_model, catalog_hash=None, source=None, build_seconds=None, activate=True, **extra):
+        """
+        Save a model as a new version
+
+        The model is written to a staging directory and renamed into place
+        with its metadata, so a version is complete as soon as it is visible.
+
+        Args:
+            save_model: Callable writing a model directory to the path it is
+                given and returning a truthy value on success (e.g.
+                engine.save_model)
+            catalog_hash: ai_engine.catalog_hash of the careers the model was
+                fit on (defaults to the hash saved with the model, if any)
+            source: Name of the script or process that built the model
+            build_seconds: Time spent fitting the model
+            activate: Make the new version the active one
+            **extra: Additional JSON-serializable metadata
+
+        Returns:
+            The new version id
+        """
+        version = f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+        os.makedirs(self.versions_dir, exist_ok=True)
+        staging = os.path.join(self.versions_dir, f'.staging-{version}')
+
+        start_time = time.perf_counter()
+        try:
+            if save_model(staging) is False or not is_model_dir(staging):
+                raise ValueError("The model was not saved")
+
+            with open(os.path.join(staging, META_FILE), encoding='utf-8') as f:
+                model_meta = json.load(f)
+            n_rows, n_columns = model_meta['shape']
+            fields = model_meta.get('fields') or [None]
+
+            metadata = {
+                'version': version,
+                'created_at': datetime.now().isoformat(),
+                'build_seconds': build_seconds,
+                'save_seconds': time.perf_counter() - start_time,
+                'source': source,
+                'catalog_hash': catalog_hash if catalog_hash is not None else model_meta.get('catalog_hash'),
+                'rows': n_rows,
+                'vocabulary_size': n_columns // len(fields),
+                'fields': model_meta.get('fields'),
+                'format_version': model_meta['format_version'],
+            }
+            metadata.update(extra)
+            with open(os.path.join(staging, VERSION_META_FILE), 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, indent=2)
+
+            os.rename(staging, self.path(version))
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        logger.info(f"Registered model version {version} ({n_rows} careers, {metadata['vocabulary_size']} terms)")
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version, rollback=False):
+        """
+        Make a version the active one
+
+        The ACTIVE file is replaced with os.replace, so readers see either the
+        previous or the new version id, never a partial write.
+
+        Args:
+            version: Version id to activate
+            rollback: Record the activation as a rollback (see rollback)
+        """
+        if not self.exists(version):
+            raise ValueError(f"Unknown model version: {version}")
+
+        previous = self.active_version()
+        pointer = os.path.join(self.root, f'.{ACTIVE_FILE}.{uuid.uuid4().hex}')
+        with open(pointer, 'w', encoding='utf-8') as f:
+            f.write(f'{version}\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(pointer, os.path.join(self.root, ACTIVE_FILE))
+
+        with open(os.path.join(self.root, HISTORY_FILE), 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'version': version, 'previous': previous, 'rollback': rollback,
+                                'activated_at': datetime.now().isoformat()}) + '\n')
+        logger.info(f"Activated model version {version} (previous: {previous})")
+        return version
+
+    def history(self):
+        """Return the activation records, oldest first"""
+        try:
+            with open(os.path.join(self.root, HISTORY_FILE), encoding='utf-8') as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def activation_stack(self):
+        """
+        Return the versions a rollback can return to, most recent last
+
+        Replays the history: an activation pushes its version, and a rollback
+        pops versions until its target is on top. The last entry is normally
+        the active version.
+        """
+        stack = []
+        for record in self.history():
+            if record.get('rollback'):
+                while stack and stack[-1] != record['version']:
+                    stack.pop()
+                if not stack:
+                    stack.append(record['version'])
+            else:
+                stack.append(record['version'])
+        return stack
+
+    def rollback(self):
+        """
+        Reactivate the version that was active before the current one
+
+        Rollbacks walk back through the activations: after C replaced B,
+        which replaced A, a first rollback returns to B and a second one to
+        A. Versions deleted since are skipped.
+
+        Returns:
+            The reactivated version id, or None if there is nothing to roll back to
+        """
+        active = self.active_version()
+        stack = self.activation_stack()
+        if stack and stack[-1] == active:
+            stack.pop()
+        for version in reversed(stack):
+            if version != active and self.exists(version):
+                return self.activate(version, rollback=True)
+        logger.warning("No previous model version to roll back to")
+        return None
+
+def main():
+    """List, inspect, activate and roll back model versions from the command line"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Manage the versioned model registry")
+    parser.add_argument('--root', default=REGISTRY_ROOT, help=f"registry directory (default: {REGISTRY_ROOT})")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help="list the registered versions")
+    show = commands.add_parser('show', help="print the metadata of a version (default: the active one)")
+    show.add_argument('version', nargs='?')
+    activate = commands.add_parser('activate', help="make a version the active one")
+    activate.add_argument('version')
+    commands.add_parser('rollback', help="reactivate the previously active version")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    try:
+        if args.command == 'list':
+            active = registry.active_version()
+            for meta in registry.versions():
+                marker = '*' if meta['version'] == active else ' '
+                print(f"{marker} {meta['version']}  {meta['created_at']}  rows={meta['rows']} "
+                      f"terms={meta['vocabulary_size']} source={meta.get('source')} "
+                      f"catalog={(meta.get('catalog_hash') or '-')[:12]}")
+        elif args.command == 'show':
+            version = args.version or registry.active_version()
+            if version is None:
+                logger.error("No active model version")
+                return 1
+            print(json.dumps(registry.get(version), indent=2))
+        elif args.command == 'activate':
+            registry.activate(args.version)
+        elif args.command == 'rollback':
+            if registry.rollback() is None:
+                return 1
+    except Exception as e:
+        logger.error(f"Error: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from career_fields import normalize_field_blocks
+
+# Version of the on-disk layout written by save_model_dir, and the versions
+# load_model_dir reads (version 2 added field-blocked matrices)
+MODEL_FORMAT_VERSION = 2
+SUPPORTED_FORMAT_VERSIONS = (1, 2)
+
+META_FILE = 'meta.json'
+VOCABULARY_FILE = 'vocabulary.txt'
+
+# Model directory layout
+#
+#     meta.json                     format version, matrix shape, vectorizer
+#                                   parameters, career titles, catalog hash
+#                                   and, for field-blocked matrices, the
+#                                   field names and default weights
+#     vocabulary.txt                one term per line, in column order
+#     idf.npy                       IDF weight of every column
+#     career_ids.npy                database id of every row (-1 if unknown)
+#     career_vectors.*.npy          career-major CSR arrays (data/indices/indptr)
+#     career_vectors_t.*.npy        term-major CSR arrays used for scoring
+#     ivf_centroids.npy             optional IVF clustering
+#     ivf_assignments.npy
+#
+# The career vectors are stored L2-normalized (per field block, see
+# career_fields) with sorted indices, so the arrays can be opened with
+# np.load(mmap_mode='r') and used as they are: every process serving the
+# model shares the same pages through the OS page cache instead of
+# unpickling a private copy.
+
+def compact_csr(matrix, dtype=np.float32):
+    """
+    Return a CSR matrix with dtype values and int32 indices and indptr
+
+    Index arrays stay int64 when the matrix is too large for int32.
+    """
+    matrix = sparse.csr_matrix(matrix, dtype=dtype)
+    if matrix.nnz <= np.iinfo(np.int32).max and max(matrix.shape) <= np.iinfo(np.int32).max:
+        matrix.indices = matrix.indices.astype(np.int32, copy=False)
+        matrix.indptr = matrix.indptr.astype(np.int32, copy=False)
+    return matrix
+
+def is_model_dir(path):
+    """Return True if path is a model directory written by save_model_dir"""
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, META_FILE))
+
+def _vectorizer_params(vectorizer):
+    """Return the JSON-serializable constructor parameters of a TfidfVectorizer"""
+    params = {}
+    for name, value in vectorizer.get_params().items():
+        if name == 'vocabulary':
+            continue
+        if name == 'dtype':
+            value = np.dtype(value).name
+        elif name == 'ngram_range':
+            value = list(value)
+        elif isinstance(value, frozenset):
+            value = sorted(value)
+        elif callable(value):
+            raise ValueError(f"Vectorizer parameter '{name}' is a callable and cannot be stored")
+        params[name] = value
+    return params
+
+def _restore_vectorizer(params, vocabulary, idf):
+    """Rebuild a fitted TfidfVectorizer from its parameters, vocabulary and IDF weights"""
+    params = dict(params)
+    params['dtype'] = np.dtype(params['dtype']).type
+    params['ngram_range'] = tuple(params['ngram_range'])
+    vectorizer = TfidfVectorizer(**params)
+    vectorizer.vocabulary_ = {term: index for index, term in enumerate(vocabulary)}
+    vectorizer.idf_ = np.asarray(idf)
+    return vectorizer
+
+def _save_csr(path, name, matrix):
+    """Write the data/indices/indptr arrays of a CSR matrix"""
+    for part in ('data', 'indices', 'indptr'):
+        np.save(os.path.join(path, f'{name}.{part}.npy'), getattr(matrix, part))
+
+def _load_csr(path, name, shape, mmap_mode):
+    """Open a CSR matrix written by _save_csr without copying its arrays"""
+    data, indices, indptr = (
+        np.load(os.path.join(path, f'{name}.{part}.npy'), mmap_mode=mmap_mode)
+        for part in ('data', 'indices', 'indptr')
+    )
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+    matrix.has_sorted_indices = True
+    return matrix
+
+def save_model_dir(path, vectorizer, career_vectors, career_titles, career_ids=None, clustering=None,
+                   fields=None, field_weights=None, catalog_hash=None):
+    """
+    Write a fitted model as a directory of .npy arrays
+
+    The directory is written next to its final location and swapped in with
+    renames, so processes that still have the previous version mapped keep
+    reading consistent files.
+
+    float32 career vectors (see CareerRecommendationEngine compact) are
+    stored as float32 with int32 indices; anything else as float64.
+
+    Args:
+        path: Model directory to create or replace
+        vectorizer: Fitted TfidfVectorizer
+        career_vectors: Career-major TF-IDF matrix (rows are careers)
+        career_titles: Title of every row
+        career_ids: Database id of every row, or None if unknown
+        clustering: Optional (centroids, assignments) of an IVF index
+        fields: Block names of a field-blocked matrix, or None
+        field_weights: Default weights of the fields
+        catalog_hash: ai_engine.catalog_hash of the careers behind the rows,
+            checked against the database when the model is loaded
+    """
+    dtype = np.float32 if career_vectors.dtype == np.float32 else np.float64
+    if fields:
+        career_vectors = normalize_field_blocks(career_vectors, len(fields), dtype=dtype)
+    else:
+        career_vectors = normalize(sparse.csr_matrix(career_vectors, dtype=dtype), norm='l2')
+        career_vectors.sort_indices()
+    career_vectors_t = career_vectors.T.tocsr()
+    career_vectors_t.sort_indices()
+    if dtype == np.float32:
+        career_vectors, career_vectors_t = compact_csr(career_vectors), compact_csr(career_vectors_t)
+
+    n_careers = career_vectors.shape[0]
+    if career_ids is None:
+        career_ids = [None] * n_careers
+    career_ids = np.array([-1 if career_id is None else career_id for career_id in career_ids], dtype=np.int64)
+
+    vocabulary = [None] * len(vectorizer.vocabulary_)
+    for term, index in vectorizer.vocabulary_.items():
+        if '\n' in term:
+            raise ValueError(f"Vocabulary term {term!r} contains a newline")
+        vocabulary[index] = term
+
+    meta = {
+        'format_version': MODEL_FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'shape': list(career_vectors.shape),
+        'vectorizer': _vectorizer_params(vectorizer),
+        'career_titles': list(career_titles),
+        'catalog_hash': catalog_hash,
+        'has_clustering': clustering is not None,
+        'fields': list(fields) if fields else None,
+        'field_weights': [float(weight) for weight in field_weights] if fields and field_weights is not None else None,
+    }
+
+    path = os.path.normpath(path)
+    parent = os.path.dirname(path) or '.'
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f'.{os.path.basename(path)}.', dir=parent)
+    try:
+        _save_csr(staging, 'career_vectors', career_vectors)
+        _save_csr(staging, 'career_vectors_t', career_vectors_t)
+        np.save(os.path.join(staging, 'idf.npy'), np.asarray(vectorizer.idf_, dtype=np.float64))
+        np.save(os.path.join(staging, 'career_ids.npy'), career_ids)
+        if clustering is not None:
+            centroids, assignments = clustering
+            np.save(os.path.join(staging, 'ivf_centroids.npy'), np.asarray(centroids))
+            np.save(os.path.join(staging, 'ivf_assignments.npy'), np.asarray(assignments))
+
+        with open(os.path.join(staging, VOCABULARY_FILE), 'w', encoding='utf-8') as f:
+            f.write(''.join(f'{term}\n' for term in vocabulary))
+
+        # meta.json goes last: a directory without it is not a model
+        with open(os.path.join(staging, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+        previous = None
+        if os.path.exists(path):
+            previous = tempfile.mkdtemp(prefix=f'.{os.path.basename(path)}.old.', dir=parent)
+            os.rename(path, os.path.join(previous, 'model'))
+        os.rename(staging, path)
+        if previous is not None:
+            shutil.rmtree(previous, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+def load_model_dir(path, mmap_mode='r'):
+    """
+    Open a model directory written by save_model_dir
+
+    Args:
+        path: Model directory
+        mmap_mode: Passed to np.load; 'r' maps the arrays read-only, None
+            reads them into private memory
+
+    Returns:
+        Dict with vectorizer, career_vectors, career_vectors_t, career_titles,
+        career_ids, catalog_hash, clustering ((centroids, assignments) or
+        None), fields and field_weights (None unless the matrix is
+        field-blocked)
+    """
+    with open(os.path.join(path, META_FILE), encoding='utf-8') as f:
+        meta = json.load(f)
+
+    if meta.get('format_version') not in SUPPORTED_FORMAT_VERSIONS:
+        raise ValueError(f"Unsupported model format version: {meta.get('format_version')}")
+
+    with open(os.path.join(path, VOCABULARY_FILE), encoding='utf-8') as f:
+        vocabulary = f.read().split('\n')[:-1]
+
+    n_careers, n_terms = meta['shape']
+    idf = np.load(os.path.join(path, 'idf.npy'), mmap_mode=mmap_mode)
+
+    clustering = None
+    if meta.get('has_clustering'):
+        clustering = (
+            np.load(os.path.join(path, 'ivf_centroids.npy'), mmap_mode=mmap_mode),
+            np.load(os.path.join(path, 'ivf_assignments.npy'), mmap_mode=mmap_mode),
+        )
+
+    return {
+        'vectorizer': _restore_vectorizer(meta['vectorizer'], vocabulary, idf),
+        'career_vectors': _load_csr(path, 'career_vectors', (n_careers, n_terms), mmap_mode),
+        'career_vectors_t': _load_csr(path, 'career_vectors_t', (n_terms, n_careers), mmap_mode),
+        'career_titles': meta['career_titles'],
+        'career_ids': np.load(os.path.join(path, 'career_ids.npy'), mmap_mode=mmap_mode),
+        'catalog_hash': meta.get('catalog_hash'),
+        'clustering': clustering,
+        'fields': tuple(meta['fields']) if meta.get('fields') else None,
+        'field_weights': meta.get('field_weights'),
+    }
@@ -71,16 +71,31 @@ class Career(db.Model):
     @property
     def avg_salary(self):
         """Calculate average salary from market trends"""
-        trends = self.market_trends.all()
+        return self.salary_from_trends(self.market_trends.all())
+    
+    @property
+    def growth_rate(self):
+        """Calculate growth rate from market trends"""
+        return self.growth_rate_from_trends(self.market_trends.all())
+    
+    @staticmethod
+    def salary_from_trends(trends):
+        """Average salary of a career given its market trend rows"""
         if not trends:
             return 0
         latest_trend = max(trends, key=lambda t: t.year) if trends else None
         return latest_trend.salary_trend if latest_trend else 0
     
-    @property
-    def growth_rate(self):
-        """Calculate growth rate from market trends"""
-        trends = self.market_trends.all()
+    @staticmethod
+    def salary_midpoint_from_trends(trends):
+        """Dollar salary of a career given its market trend rows: the midpoint of the latest range, or None"""
+        if not trends:
+            return None
+        return max(trends, key=lambda t: t.year).salary_midpoint
+    
+    @staticmethod
+    def growth_rate_from_trends(trends):
+        """Growth rate (%) of a career's demand given its market trend rows"""
         if len(trends) < 2:
             return 0
         sorted_trends = sorted(trends, key=lambda t: t.year, reverse=True)
@@ -203,6 +218,18 @@ class MarketTrend(db.Model):
         except:
             return 0
     
+    @property
+    def salary_midpoint(self):
+        """Dollar midpoint of a salary_range like "50000-70000" or "$60,000" (None for percentages)"""
+        if not self.salary_range or '%' in self.salary_range:
+            return None
+        try:
+            parts = [float(part.replace('$', '').replace(',', '').strip())
+                     for part in self.salary_range.split('-') if part.strip()]
+        except ValueError:
+            return None
+        return sum(parts) / len(parts) if parts else None
+    
     @property
     def job_posting_count(self):
         """Calculated based on demand level as we don't have actual data"""
@@ -0,0 +1,136 @@
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from numbers import Integral
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfTransformer
+
+from text_normalizer import normalize_corpus
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def resolve_n_jobs(n_jobs):
+    """Return the worker count for n_jobs (None or 1: serial, -1: one per CPU)"""
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return max(1, n_jobs)
+
+def _count_shard(vectorizer, documents, normalize):
+    """
+    Tokenize a shard of documents and count its terms (runs in a worker process)
+
+    Returns:
+        (terms in local column order, document frequency of each term,
+        data, indices and indptr of the shard's term count CSR matrix)
+    """
+    if normalize:
+        documents = normalize_corpus(documents)
+    analyze = vectorizer.build_analyzer()
+
+    vocabulary = {}
+    indices = []
+    indptr = [0]
+    for document in documents:
+        for term in analyze(document):
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+        indptr.append(len(indices))
+
+    counts = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.int64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(documents), len(vocabulary))
+    )
+    counts.sum_duplicates()
+    document_frequency = np.bincount(counts.indices, minlength=len(vocabulary))
+    return list(vocabulary), document_frequency, counts.data, counts.indices, counts.indptr
+
+def _document_count_limit(value, n_documents):
+    """Turn a min_df/max_df setting (count or proportion) into a document count"""
+    return value if isinstance(value, Integral) else value * n_documents
+
+def parallel_fit_transform(vectorizer, document_shards, n_jobs=-1, normalize=True):
+    """
+    Fit a TfidfVectorizer on sharded documents using a pool of processes
+
+    Every shard is tokenized and counted in a spawned worker process with its own
+    local vocabulary; at most two shards per worker are in flight, so a
+    streamed corpus is still consumed lazily. The shards' vocabularies and document frequencies are
+    then merged into the sorted global vocabulary, min_df/max_df/max_features
+    are applied to the merged counts, and the count matrices are stacked into
+    one CSR matrix that is IDF-weighted as TfidfVectorizer.fit_transform
+    would. The vectorizer ends up fitted exactly as with fit_transform.
+
+    Args:
+        vectorizer: Unfitted TfidfVectorizer with use_idf=True (fitted in place)
+        document_shards: Iterable of lists of documents, in corpus order
+        n_jobs: Worker processes (-1 for one per CPU)
+        normalize: Apply normalize_corpus to each shard in the workers
+
+    Returns:
+        TF-IDF matrix of the whole corpus (CSR)
+    """
+    if vectorizer.vocabulary is not None:
+        raise ValueError("parallel_fit_transform does not support a fixed vocabulary")
+    if not vectorizer.use_idf:
+        raise ValueError("parallel_fit_transform requires use_idf=True")
+
+    n_workers = resolve_n_jobs(n_jobs)
+    shards = []
+    # Spawned workers start from a fresh interpreter: forking a process that
+    # runs web server or engine watcher threads could copy a held lock
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        pending = deque()
+        for documents in document_shards:
+            pending.append(executor.submit(_count_shard, vectorizer, list(documents), normalize))
+            if len(pending) >= 2 * n_workers:
+                shards.append(pending.popleft().result())
+        shards.extend(future.result() for future in pending)
+
+    # Merge the shard vocabularies into the sorted global vocabulary
+    terms = sorted(set().union(*(shard_terms for shard_terms, *_ in shards)))
+    term_index = {term: index for index, term in enumerate(terms)}
+    document_frequency = np.zeros(len(terms), dtype=np.int64)
+
+    matrices = []
+    for shard_terms, shard_frequency, data, indices, indptr in shards:
+        columns = np.fromiter((term_index[term] for term in shard_terms), dtype=np.int64, count=len(shard_terms))
+        document_frequency[columns] += shard_frequency
+        matrices.append(sparse.csr_matrix((data, columns[indices], indptr), shape=(len(indptr) - 1, len(terms))))
+    counts = sparse.vstack(matrices, format='csr') if matrices else sparse.csr_matrix((0, 0), dtype=np.int64)
+
+    # Prune terms by document frequency and count, as CountVectorizer does
+    n_documents = counts.shape[0]
+    keep = ((document_frequency <= _document_count_limit(vectorizer.max_df, n_documents)) &
+            (document_frequency >= _document_count_limit(vectorizer.min_df, n_documents)))
+    if vectorizer.max_features is not None and keep.sum() > vectorizer.max_features:
+        term_counts = np.asarray(counts.sum(axis=0)).ravel()
+        kept = np.flatnonzero(keep)
+        keep[:] = False
+        keep[kept[(-term_counts[kept]).argsort(kind='stable')[:vectorizer.max_features]]] = True
+    if not keep.any():
+        raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+
+    kept = np.flatnonzero(keep)
+    counts = counts[:, kept]
+    counts.sort_indices()
+    if vectorizer.binary:
+        counts.data.fill(1)
+    counts = counts.astype(vectorizer.dtype)
+
+    vectorizer.vocabulary_ = {terms[index]: column for column, index in enumerate(kept)}
+    vectorizer.fixed_vocabulary_ = False
+
+    transformer = TfidfTransformer(norm=vectorizer.norm, use_idf=True,
+                                   smooth_idf=vectorizer.smooth_idf, sublinear_tf=vectorizer.sublinear_tf)
+    tfidf = transformer.fit_transform(counts)
+    # The public idf_ setter installs the weights transform() applies, as model_store does
+    vectorizer.idf_ = transformer.idf_
+
+    logger.info(f"Fitted {len(kept)} terms on {n_documents} documents in {len(shards)} shards")
+    return tfidf
@@ -1,29 +1,20 @@
 import os
 import pandas as pd
 import numpy as np
-import re
 import logging
 import pickle
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from models import Career, Skill, MarketTrend, db
 from ai_engine import CareerRecommendationEngine
+from model_registry import ModelRegistry
+from text_normalizer import clean_text
 from app import app
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def clean_text(text):
-    """Clean text by removing special characters and extra spaces"""
-    if not isinstance(text, str):
-        return ""
-    # Remove special characters
-    text = re.sub(r'[^\w\s]', ' ', text)
-    # Remove extra spaces
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
-
 def extract_career_info(row):
     """Extract career information from a dataset row"""
     # Get course/degree as title
@@ -134,10 +125,9 @@ def train_model(career_data):
         engine.create_career_vectors(career_data)
         logger.info("Successfully created career vectors")
         
-        # Save the trained model
-        os.makedirs('models', exist_ok=True)
-        engine.save_model('models/career_recommendation_model.pkl')
-        logger.info("Model trained and saved successfully")
+        # Register the trained model as the new active version
+        version = ModelRegistry().register(engine.save_model, source='process_career_dataset')
+        logger.info(f"Model trained and registered as version {version}")
         
         return engine
     
@@ -0,0 +1,359 @@
+import heapq
+import logging
+import threading
+
+import numpy as np
+from scipy import sparse
+from sklearn.utils.extmath import safe_sparse_dot
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def top_k_indices(scores, k):
+    """
+    Return the indices of the k highest scores, best first
+
+    Uses a partial selection (np.argpartition) and only sorts the k selected
+    entries, so the cost is linear in len(scores) instead of n log n.
+    """
+    scores = np.asarray(scores)
+    k = min(k, scores.shape[-1])
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+
+    if k < scores.shape[-1]:
+        candidates = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[-1]), scores.shape).copy()
+
+    candidate_scores = np.take_along_axis(scores, candidates, axis=-1)
+    order = np.argsort(-candidate_scores, axis=-1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=-1)
+
+def merge_top_k(chunks, k):
+    """
+    Merge top-k candidates streamed from several shards or batches
+
+    Args:
+        chunks: Iterable of (indices, scores) array pairs; indices must be
+            global career row numbers
+        k: Number of results to keep
+
+    Returns:
+        (indices, scores) arrays of the k best entries, best first
+    """
+    heap = []
+    for indices, scores in chunks:
+        scores = np.asarray(scores)
+        indices = np.asarray(indices)
+
+        # Only the chunk's own top k can make it into the global top k
+        if len(scores) > k:
+            keep = top_k_indices(scores, k)
+            indices, scores = indices[keep], scores[keep]
+
+        for idx, score in zip(indices.tolist(), scores.tolist(), strict=True):
+            if len(heap) < k:
+                heapq.heappush(heap, (score, -idx))
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, -idx))
+
+    best = sorted(heap, reverse=True)
+    return (np.array([-idx for _, idx in best], dtype=np.intp),
+            np.array([score for score, _ in best], dtype=float))
+
+# Postings lists longer than this many times the candidate count are probed
+# with binary search rather than traversed
+SEARCH_RATIO = 16
+
+# Queries whose postings add up to more than this many times the catalog size
+# are cheaper to score with one sparse product than with pruning
+DENSE_QUERY_RATIO = 1.0
+
+class InvertedIndex:
+    """
+    Term-at-a-time inverted index over the career TF-IDF matrix
+
+    Each term maps to a postings list of (career row, weight) pairs sorted by
+    career row, plus the largest weight in the list. Queries use MaxScore
+    pruning: terms are ordered by their score upper bound, and only the
+    postings of the leading "essential" terms are traversed. Once the k-th
+    best partial score reaches the sum of the remaining upper bounds, no
+    career outside those postings can enter the top k, so the remaining terms
+    are only looked up for the candidates that can still make it. Results are
+    exact.
+    """
+    def __init__(self, career_vectors_t):
+        """
+        Build the index
+
+        Args:
+            career_vectors_t: Term-major CSR matrix (terms x careers) of
+                L2-normalized career vectors; its rows are the postings lists
+        """
+        self.postings = sparse.csr_matrix(career_vectors_t)
+        self.postings.sort_indices()
+        self.n_careers = self.postings.shape[1]
+        self._workspace = threading.local()
+
+        # Largest weight in each postings list (0 for empty lists)
+        non_empty = np.diff(self.postings.indptr) > 0
+        self.max_weights = np.zeros(self.postings.shape[0], dtype=self.postings.dtype)
+        if self.postings.nnz:
+            self.max_weights[non_empty] = np.maximum.reduceat(
+                self.postings.data, self.postings.indptr[:-1][non_empty])
+
+        logger.info(f"Built inverted index with {self.postings.shape[0]} terms and {self.postings.nnz} postings")
+
+    def get_postings(self, term):
+        """Return the (career rows, weights) arrays of a term"""
+        start, end = self.postings.indptr[term], self.postings.indptr[term + 1]
+        return self.postings.indices[start:end], self.postings.data[start:end]
+
+    def _get_accumulator(self):
+        """Return this thread's score accumulator; it is all zeros between searches"""
+        accumulator = getattr(self._workspace, 'accumulator', None)
+        if accumulator is None:
+            accumulator = self._workspace.accumulator = np.zeros(self.n_careers)
+        return accumulator
+
+    def search(self, query_vector, k):
+        """
+        Find the k careers with the highest dot product with a query vector
+
+        Args:
+            query_vector: Sparse 1 x n_terms vector
+            k: Number of results to return
+
+        Returns:
+            (career rows, scores) arrays, best first
+        """
+        query = query_vector if sparse.issparse(query_vector) and query_vector.format == 'csr' else sparse.csr_matrix(query_vector)
+        k = min(k, self.n_careers)
+        if k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        terms = query.indices
+        weights = query.data
+        upper_bounds = weights * self.max_weights[terms]
+
+        # Visit terms from the largest possible contribution to the smallest
+        useful = upper_bounds > 0
+        order = np.argsort(-upper_bounds[useful], kind='stable')
+        terms = terms[useful][order]
+        weights = weights[useful][order]
+        upper_bounds = upper_bounds[useful][order]
+
+        # Broad queries touch most careers anyway; score them in one product
+        lengths = self.postings.indptr[terms + 1] - self.postings.indptr[terms]
+        if lengths.sum() > DENSE_QUERY_RATIO * self.n_careers:
+            scores = np.asarray(safe_sparse_dot(query, self.postings, dense_output=True)).ravel()
+            top = top_k_indices(scores, k)
+            return top, scores[top]
+
+        # remaining[i] is the most that terms i, i+1, ... can still add to a score
+        remaining = np.append(np.cumsum(upper_bounds[::-1])[::-1], 0.0)
+
+        accumulator = self._get_accumulator()
+        touched = []
+        threshold = -np.inf
+        i = 0
+
+        try:
+            # Essential terms: any career in their postings may still reach the top k.
+            # The k-th best score among the careers just updated is a lower bound on
+            # the k-th best score overall, which is all the stopping test needs.
+            while i < len(terms):
+                rows, values = self.get_postings(terms[i])
+                accumulator[rows] += values * weights[i]
+                touched.append(rows)
+                i += 1
+
+                if len(rows) >= k:
+                    updated = accumulator[rows]
+                    threshold = max(threshold, np.partition(updated, len(updated) - k)[len(updated) - k])
+                if threshold >= remaining[i]:
+                    break
+
+            # Non-essential terms: only careers that can still reach the threshold are
+            # scored, and the bound tightens as the remaining upper bounds shrink
+            rows = np.concatenate(touched) if touched else np.empty(0, dtype=np.intp)
+            candidates = np.unique(rows[accumulator[rows] + remaining[i] >= threshold])
+            for j in range(i, len(terms)):
+                scores = accumulator[candidates]
+                candidates = candidates[scores + remaining[j] >= threshold]
+
+                rows, values = self.get_postings(terms[j])
+                if len(candidates) * SEARCH_RATIO < len(rows):
+                    # Few candidates left: binary search instead of a full traversal
+                    positions = np.searchsorted(rows, candidates)
+                    positions[positions == len(rows)] = 0
+                    matched = rows[positions] == candidates
+                    accumulator[candidates[matched]] += values[positions[matched]] * weights[j]
+                else:
+                    accumulator[rows] += values * weights[j]
+                    touched.append(rows)
+
+                if len(candidates) >= k:
+                    scores = accumulator[candidates]
+                    threshold = max(threshold, np.partition(scores, len(scores) - k)[len(scores) - k])
+
+            scores = accumulator[candidates]
+        finally:
+            # Reset only the entries this search wrote to
+            for rows in touched:
+                accumulator[rows] = 0
+
+        # Pad with zero-score careers when fewer than k careers share a term
+        if len(candidates) < k:
+            padding = np.arange(min(self.n_careers, len(candidates) + k))
+            unmatched = np.setdiff1d(padding, candidates)[:k - len(candidates)]
+            candidates = np.concatenate([candidates, unmatched])
+            scores = np.concatenate([scores, np.zeros(len(unmatched))])
+
+        top = top_k_indices(scores, k)
+        return candidates[top].astype(np.intp), scores[top]
+
+class IVFIndex:
+    """
+    Cluster-pruned (IVF) approximate retrieval over the career TF-IDF matrix
+
+    Career vectors are grouped offline with spherical k-means. Each cluster
+    keeps a unit-length centroid and an inverted list of its career rows; the
+    rows are numbered cluster by cluster so a list is a contiguous range. A
+    query is scored against the centroids and only the careers of the nprobe
+    closest clusters are scored exactly.
+    """
+    def __init__(self, career_vectors, n_clusters=None, n_iter=10, seed=0,
+                 centroids=None, assignments=None):
+        """
+        Build the index
+
+        Args:
+            career_vectors: Career-major CSR matrix of L2-normalized vectors
+            n_clusters: Number of clusters (defaults to sqrt of the career count)
+            n_iter: Number of k-means iterations
+            seed: Random seed for the initial centroids
+            centroids, assignments: Previously computed clustering to reuse
+                instead of running k-means
+        """
+        career_vectors = sparse.csr_matrix(career_vectors)
+        n_careers = career_vectors.shape[0]
+
+        if assignments is None:
+            if n_clusters is None:
+                n_clusters = int(np.sqrt(n_careers))
+            n_clusters = max(1, min(n_clusters, n_careers))
+            centroids, assignments = spherical_kmeans(career_vectors, n_clusters, n_iter=n_iter, seed=seed)
+
+        self.centroids = np.asarray(centroids)
+        self.assignments = np.asarray(assignments)
+        self.n_clusters = self.centroids.shape[0]
+        self.n_careers = n_careers
+
+        # Inverted lists: rows ordered by cluster, with per-cluster offsets
+        self.rows = np.argsort(self.assignments, kind='stable')
+        counts = np.bincount(self.assignments, minlength=self.n_clusters)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+        # Term-major postings over the clustered row order
+        self.postings = career_vectors[self.rows].T.tocsr()
+        self.postings.sort_indices()
+        term_ids = np.repeat(np.arange(self.postings.shape[0], dtype=np.int64), np.diff(self.postings.indptr))
+        self.posting_keys = term_ids * n_careers + self.postings.indices
+
+        logger.info(f"Built IVF index with {self.n_clusters} clusters over {n_careers} careers")
+
+    def search(self, query_vector, k, nprobe=8):
+        """
+        Find approximately the k careers with the highest dot product with a query
+
+        Args:
+            query_vector: Sparse 1 x n_terms vector
+            k: Number of results to return
+            nprobe: Number of closest clusters to scan
+
+        Returns:
+            (career rows, scores) arrays, best first
+        """
+        query = query_vector if sparse.issparse(query_vector) and query_vector.format == 'csr' else sparse.csr_matrix(query_vector)
+
+        # Only the centroid columns of the query's terms contribute
+        centroid_scores = self.centroids[:, query.indices] @ query.data
+        probed = top_k_indices(centroid_scores, nprobe)
+
+        starts, ends = self.offsets[probed], self.offsets[probed + 1]
+        positions = concatenate_ranges(starts, ends)
+        if len(positions) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        # Postings are keyed by (term, clustered position), so one binary
+        # search finds the slice of every (query term, probed cluster) pair
+        term_keys = query.indices.astype(np.int64)[:, None] * self.n_careers
+        lo = np.searchsorted(self.posting_keys, (term_keys + starts).ravel())
+        hi = np.searchsorted(self.posting_keys, (term_keys + ends).ravel())
+        lengths = hi - lo
+        slices = concatenate_ranges(lo, hi)
+
+        # Shift clustered positions to slots in `positions` and sum per slot
+        cluster_slots = np.concatenate([[0], np.cumsum(ends - starts)[:-1]])
+        shifts = np.tile(starts - cluster_slots, len(query.indices))
+        slots = self.postings.indices[slices] - np.repeat(shifts, lengths)
+        weights = self.postings.data[slices] * np.repeat(np.repeat(query.data, len(starts)), lengths)
+        scores = np.bincount(slots, weights=weights, minlength=len(positions))
+
+        top = top_k_indices(scores, k)
+        return self.rows[positions[top]], scores[top]
+
+def concatenate_ranges(starts, ends):
+    """Return np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)]) without a Python loop"""
+    lengths = ends - starts
+    total = lengths.sum()
+    if total == 0:
+        return np.empty(0, dtype=np.intp)
+    offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+    return offsets + np.arange(total)
+
+def spherical_kmeans(vectors, n_clusters, n_iter=10, seed=0, chunk_size=10000):
+    """
+    Cluster L2-normalized sparse rows by cosine similarity
+
+    Returns:
+        (centroids, assignments): dense unit-length centroids of shape
+        (n_clusters, n_features) and the cluster number of every row
+    """
+    rng = np.random.default_rng(seed)
+    n_rows = vectors.shape[0]
+
+    initial = rng.choice(n_rows, size=n_clusters, replace=False)
+    centroids = vectors[initial].toarray().astype(np.float32)
+    assignments = np.zeros(n_rows, dtype=np.intp)
+
+    for _ in range(n_iter):
+        # Assign each row to its most similar centroid, a chunk at a time
+        for start in range(0, n_rows, chunk_size):
+            chunk = vectors[start:start + chunk_size]
+            assignments[start:start + chunk_size] = np.asarray(safe_sparse_dot(chunk, centroids.T)).argmax(axis=1)
+
+        # New centroid: normalized sum of its members
+        membership = sparse.csr_matrix(
+            (np.ones(n_rows, dtype=np.float32), (assignments, np.arange(n_rows))),
+            shape=(n_clusters, n_rows))
+        sums = np.asarray((membership @ vectors).toarray(), dtype=np.float32)
+        norms = np.linalg.norm(sums, axis=1)
+
+        # Re-seed empty clusters with random rows
+        empty = norms == 0
+        if empty.any():
+            reseed = rng.choice(n_rows, size=int(empty.sum()), replace=False)
+            sums[empty] = vectors[reseed].toarray()
+            norms[empty] = np.linalg.norm(sums[empty], axis=1)
+
+        norms[norms == 0] = 1.0
+        centroids = sums / norms[:, None]
+
+    for start in range(0, n_rows, chunk_size):
+        chunk = vectors[start:start + chunk_size]
+        assignments[start:start + chunk_size] = np.asarray(safe_sparse_dot(chunk, centroids.T)).argmax(axis=1)
+
+    return centroids, assignments
@@ -6,7 +6,7 @@ from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash
 from app import app, db
 from models import User, Skill, Career, Assessment, Recommendation, UserPreference, MarketTrend, Feedback, user_skill, career_skill
-from ai_engine import CareerRecommendationEngine
+from engine_manager import EngineManager
 import matplotlib.pyplot as plt
 import seaborn as sns
 import io
@@ -16,8 +16,8 @@ import numpy as np
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Initialize recommendation engine
-recommendation_engine = CareerRecommendationEngine()
+# Initialize recommendation engine manager (preloaded in app.py once tables exist)
+engine_manager = EngineManager(app)
 
 @app.route('/')
 def index():
@@ -220,14 +220,15 @@ def generate_recommendations(assessment_id):
         return redirect(url_for('dashboard'))
     
     # Check if recommendation engine is initialized
-    all_careers = Career.query.all()
-    if not all_careers:
-        flash('No career data is available. Please try again later.', 'warning')
+    if not engine_manager.is_ready:
+        if Career.query.first() is None:
+            flash('No career data is available. Please try again later.', 'warning')
+        else:
+            # The engine is fitted in the background, never inside a request
+            engine_manager.schedule_rebuild()
+            flash('Career recommendations are still being prepared. Please try again in a moment.', 'info')
         return redirect(url_for('dashboard'))
-        
-    # Initialize recommendation engine if needed
-    if not recommendation_engine.careers:
-        recommendation_engine.create_career_vectors(all_careers)
+    recommendation_engine = engine_manager.engine
     
     # Prepare user data
     user_data = {
@@ -360,7 +361,7 @@ def market_trends(career_id):
     career = Career.query.get_or_404(career_id)
     
     # Get trend analysis
-    trend_analysis = recommendation_engine.analyze_career_market_trends(career_id)
+    trend_analysis = engine_manager.engine.analyze_career_market_trends(career_id)
     
     if 'error' in trend_analysis:
         flash(trend_analysis['error'], 'warning')
@@ -486,6 +487,12 @@ def generate_trend_analysis_charts(trend_analysis):
     
     return charts
 
+@app.route('/admin/engine_stats')
+@login_required
+def engine_stats():
+    """Recommendation engine state and cache metrics as JSON"""
+    return jsonify(engine_manager.stats())
+
 @app.route('/admin/initialize_database')
 def initialize_database():
     """Initialize database with sample data (for development/testing only)"""
@@ -747,9 +754,6 @@ def initialize_database():
         db.session.commit()
         flash('Database initialized with sample data', 'success')
         
-        # Initialize recommendation engine with careers
-        recommendation_engine.create_career_vectors(Career.query.all())
-        
     except Exception as e:
         db.session.rollback()
         logger.error(f"Error initializing database: {e}")
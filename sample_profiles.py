@@ -0,0 +1,34 @@
+import copy
+
+# Sample user profiles for offline checks of the recommendation engine
+# (test_model, compact_model); importing this module starts nothing
+SAMPLE_USERS = [
+    {
+        'name': 'Software Developer Test',
+        'skills': ['Python', 'SQL', 'Java', 'Problem Solving skills'],
+        'interests': 'Technology, Software development, Data structures',
+        'education_level': 'bachelor in computer science',
+        'strengths': 'Analytical thinking, Critical thinking',
+        'personality_traits': 'Detail-oriented, Logical'
+    },
+    {
+        'name': 'Data Analyst Test',
+        'skills': ['Python', 'SQL', 'Data Visualization skills( Power Bi/ Tableau )', 'Excel'],
+        'interests': 'Data analytics, Research, Financial Analysis',
+        'education_level': 'bachelor in statistics',
+        'strengths': 'Analytical skills, Mathematics',
+        'personality_traits': 'Detail-oriented, Organized'
+    },
+    {
+        'name': 'Marketing Professional Test',
+        'skills': ['Communication skills', 'Leadership', 'Sales', 'Social Media Marketing'],
+        'interests': 'Sales/Marketing, Digital marketing, Market research',
+        'education_level': 'bachelor in marketing',
+        'strengths': 'Creativity, Communication',
+        'personality_traits': 'Outgoing, Persuasive'
+    }
+]
+
+def get_sample_user_data():
+    """Return copies of the sample user profiles"""
+    return copy.deepcopy(SAMPLE_USERS)
@@ -0,0 +1,125 @@
+import numpy as np
+
+# Words used to generate synthetic career and user documents
+VOCABULARY_SIZE = 5000
+DOCUMENT_LENGTH = 60
+
+def make_vocabulary(size=VOCABULARY_SIZE, seed=0):
+    """Generate pronounceable pseudo-words so the vectorizer keeps them as tokens"""
+    rng = np.random.default_rng(seed)
+    consonants = list('bcdfghjklmnprstvwz')
+    vowels = list('aeiou')
+    words = set()
+    while len(words) < size:
+        length = rng.integers(2, 5)
+        words.add(''.join(rng.choice(consonants) + rng.choice(vowels) for _ in range(length)))
+    return sorted(words)
+
+def make_careers(n_careers, vocabulary, seed=0):
+    """Generate synthetic career dictionaries with a Zipf-like word distribution"""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, len(vocabulary) + 1)
+    weights /= weights.sum()
+    vocabulary = np.array(vocabulary)
+
+    words = rng.choice(vocabulary, size=(n_careers, DOCUMENT_LENGTH), p=weights)
+    skills = rng.choice(vocabulary, size=(n_careers, 5), p=weights)
+
+    careers = []
+    for i in range(n_careers):
+        careers.append({
+            'title': f"Career {i}",
+            'description': ' '.join(words[i]),
+            'skills': ', '.join(skills[i]),
+            'interests': '',
+            'requirements': "Bachelor's degree"
+        })
+    return careers
+
+def make_users(n_users, vocabulary, seed=1):
+    """Generate synthetic user data dictionaries"""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, len(vocabulary) + 1)
+    weights /= weights.sum()
+    vocabulary = np.array(vocabulary)
+
+    users = []
+    for _ in range(n_users):
+        users.append({
+            'skills': list(rng.choice(vocabulary, size=4, p=weights)),
+            'interests': ' '.join(rng.choice(vocabulary, size=8, p=weights)),
+            'strengths': ' '.join(rng.choice(vocabulary, size=3, p=weights)),
+            'personality_traits': '',
+            'education_level': 'bachelor'
+        })
+    return users
+
+def make_specific_users(n_users, vocabulary, seed=2, skip_common=2000):
+    """Generate users whose words avoid the most common terms, as in real profiles"""
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(vocabulary[skip_common:])
+    return [{
+        'skills': list(rng.choice(vocabulary, size=2)),
+        'interests': ' '.join(rng.choice(vocabulary, size=6)),
+        'strengths': '',
+        'personality_traits': '',
+        'education_level': ''
+    } for _ in range(n_users)]
+
+def make_topic_data(n_careers, n_users, vocabulary, n_topics=200, topic_words=40, seed=4,
+                    skill_words=0, labels=False):
+    """
+    Generate careers and users with topical structure: each document mixes
+    words from its topic's own word list with background Zipf words
+
+    Args:
+        skill_words: Topic words in each career's skills (and half as many
+            in each user's skills); 0 leaves the skills empty
+        labels: Draw users from topics that have careers and give each a
+            'relevant' list with the titles of its topic's careers (see
+            evaluate_engine)
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(vocabulary)
+    weights = 1.0 / np.arange(1, len(vocabulary) + 1)
+    weights /= weights.sum()
+    topics = rng.choice(vocabulary[len(vocabulary) // 10:], size=(n_topics, topic_words))
+
+    def words(topic, n_topic_words, n_background_words):
+        chosen = np.concatenate([rng.choice(topics[topic], size=n_topic_words),
+                                 rng.choice(vocabulary, size=n_background_words, p=weights)])
+        return [str(word) for word in chosen]
+
+    def document(topic, n_topic_words, n_background_words):
+        return ' '.join(words(topic, n_topic_words, n_background_words))
+
+    career_topics = rng.integers(n_topics, size=n_careers)
+    careers = [{
+        'title': f"Career {i}",
+        'description': document(topic, DOCUMENT_LENGTH // 2, DOCUMENT_LENGTH // 2),
+        'skills': ', '.join(words(topic, skill_words, skill_words // 2)) if skill_words else '',
+        'interests': '',
+        'requirements': ''
+    } for i, topic in enumerate(career_topics)]
+
+    careers_by_topic = {}
+    for career, topic in zip(careers, career_topics, strict=True):
+        careers_by_topic.setdefault(int(topic), []).append(career['title'])
+
+    if labels:
+        user_topics = rng.choice(sorted(careers_by_topic), size=n_users)
+    else:
+        user_topics = rng.integers(n_topics, size=n_users)
+    users = []
+    for topic in user_topics:
+        user = {
+            'skills': words(topic, skill_words // 2, skill_words // 4) if skill_words else [],
+            'interests': document(topic, 6, 6),
+            'strengths': '',
+            'personality_traits': '',
+            'education_level': ''
+        }
+        if labels:
+            user['relevant'] = careers_by_topic[int(topic)]
+        users.append(user)
+    return careers, users
@@ -1,9 +1,12 @@
 import os
 import logging
 import pickle
-from models import User, Skill, Career, MarketTrend, db
-from ai_engine import CareerRecommendationEngine
 from app import app
+from models import User, Skill, MarketTrend, db
+from ai_engine import CareerRecommendationEngine
+from catalog_loader import load_catalog
+from model_registry import ModelRegistry
+from sample_profiles import get_sample_user_data
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -12,7 +15,9 @@ logger = logging.getLogger(__name__)
 def load_trained_model():
     """Load the trained career recommendation model"""
     try:
-        model_path = 'models/career_recommendation_model.pkl'
+        model_path = ModelRegistry().active_path() or 'models/career_recommendation_model'
+        if not os.path.exists(model_path):
+            model_path = 'models/career_recommendation_model.pkl'
         if not os.path.exists(model_path):
             logger.error(f"Model file not found: {model_path}")
             return None
@@ -31,37 +36,6 @@ def load_trained_model():
         logger.error(f"Error loading model: {e}")
         return None
 
-def get_sample_user_data():
-    """Create sample user data for testing the model"""
-    sample_users = [
-        {
-            'name': 'Software Developer Test',
-            'skills': ['Python', 'SQL', 'Java', 'Problem Solving skills'],
-            'interests': 'Technology, Software development, Data structures',
-            'education_level': 'bachelor in computer science',
-            'strengths': 'Analytical thinking, Critical thinking',
-            'personality_traits': 'Detail-oriented, Logical'
-        },
-        {
-            'name': 'Data Analyst Test',
-            'skills': ['Python', 'SQL', 'Data Visualization skills( Power Bi/ Tableau )', 'Excel'],
-            'interests': 'Data analytics, Research, Financial Analysis',
-            'education_level': 'bachelor in statistics',
-            'strengths': 'Analytical skills, Mathematics',
-            'personality_traits': 'Detail-oriented, Organized'
-        },
-        {
-            'name': 'Marketing Professional Test',
-            'skills': ['Communication skills', 'Leadership', 'Sales', 'Social Media Marketing'],
-            'interests': 'Sales/Marketing, Digital marketing, Market research',
-            'education_level': 'bachelor in marketing',
-            'strengths': 'Creativity, Communication',
-            'personality_traits': 'Outgoing, Persuasive'
-        }
-    ]
-    
-    return sample_users
-
 def test_recommendation_engine():
     """Test the recommendation engine with sample user data"""
     try:
@@ -71,22 +45,24 @@ def test_recommendation_engine():
             logger.error("Recommendation engine not available")
             return False
         
-        # Load career data from database
         with app.app_context():
-            careers = Career.query.all()
-            engine.careers = careers
+            # Models saved with career ids fetch the careers of their results
+            # by id; legacy pickles only know their titles and need the catalog
+            if engine.career_ids is None:
+                careers, _ = load_catalog()
+                engine.set_careers(careers)
             
             # Get sample user data
             sample_users = get_sample_user_data()
             
-            # Generate recommendations for each sample user
-            for user_data in sample_users:
+            # Generate recommendations for all sample users in one batch
+            batch_recommendations = engine.get_career_recommendations_batch(sample_users, top_n=3)
+            
+            for user_data, recommendations in zip(sample_users, batch_recommendations):
                 logger.info(f"\nGenerating recommendations for: {user_data['name']}")
                 logger.info(f"Skills: {user_data['skills']}")
                 logger.info(f"Interests: {user_data['interests']}")
                 
-                recommendations = engine.get_career_recommendations(user_data, top_n=3)
-                
                 if recommendations:
                     logger.info("Top 3 Career Recommendations:")
                     
@@ -0,0 +1,195 @@
+import numpy as np
+import pytest
+from sklearn.preprocessing import normalize
+
+from ai_engine import CareerMatch, CareerRecommendationEngine
+from career_fields import CAREER_FIELDS, DEFAULT_FIELD_WEIGHTS
+from catalog_loader import CatalogSessionError
+from text_normalizer import normalize_corpus
+
+
+class ReasoningCounter:
+    """Engine stand-in counting how often a reasoning is generated"""
+    def __init__(self):
+        self.calls = 0
+
+    def generate_recommendation_reasoning(self, career, user_data, _score, **_kwargs):
+        self.calls += 1
+        return f"{career} fits {user_data['name']}"
+
+class FixedContext:
+    user_data = {'name': 'Ada'}
+    snapshot = None
+
+    def get_features(self, _engine):
+        return None
+
+def test_career_match_indexing_builds_reasoning_only_when_read():
+    engine = ReasoningCounter()
+    match = CareerMatch(engine, 'Data Scientist', 0.8, 0, FixedContext())
+
+    assert match[0] == 'Data Scientist'
+    assert match[1] == 0.8
+    assert match[:2] == ('Data Scientist', 0.8)
+    assert engine.calls == 0
+
+    assert match[2] == 'Data Scientist fits Ada'
+    career, score, reasoning = match
+    assert (career, score, reasoning) == ('Data Scientist', 0.8, 'Data Scientist fits Ada')
+    assert match[-1] == reasoning
+    assert engine.calls == 1
+
+    with pytest.raises(IndexError):
+        match[3]
+
+def test_create_career_vectors_with_no_careers_publishes_empty_snapshot():
+    engine = CareerRecommendationEngine()
+    engine.create_career_vectors([
+        {'id': 1, 'title': 'Data Scientist', 'description': 'Statistics and machine learning',
+         'skills': ['python', 'statistics']},
+    ])
+    version = engine.snapshot.model_version
+
+    engine.create_career_vectors([])
+
+    snapshot = engine.snapshot
+    assert snapshot.career_vectors is None
+    assert not snapshot.has_careers()
+    assert snapshot.career_titles == []
+    assert snapshot.model_version != version
+    assert engine.get_career_recommendations({'skills': ['python']}) == []
+
+def test_loaded_model_without_session_raises_outside_app_context(tmp_path):
+    engine = CareerRecommendationEngine()
+    engine.create_career_vectors([
+        {'id': 1, 'title': 'Data Scientist', 'description': 'Statistics and machine learning',
+         'skills': ['python', 'statistics']},
+        {'id': 2, 'title': 'Chef', 'description': 'Cooking in restaurant kitchens', 'skills': ['cooking']},
+    ])
+    model_path = str(tmp_path / 'model')
+    assert engine.save_model(model_path)
+
+    loaded = CareerRecommendationEngine()
+    assert loaded.load_model(model_path)
+    with pytest.raises(CatalogSessionError):
+        loaded.get_career_recommendations({'skills': ['python']})
+    with pytest.raises(CatalogSessionError):
+        loaded.get_career_recommendations_batch([{'skills': ['python']}])
+
+def make_ranked_careers(n_careers=30):
+    rng = np.random.default_rng(0)
+    words = ['python', 'data', 'cloud', 'design', 'sales', 'finance']
+    return [{
+        'id': i + 1,
+        'title': f"Career {i}",
+        'description': 'engineer ' + ' '.join(rng.choice(words, size=5)),
+        'skills': ', '.join(rng.choice(words, size=2)),
+        'industry': str(rng.choice(['Tech', 'Finance'])),
+        'work_environment': str(rng.choice(['Remote', 'Office'])),
+        'demand_level': float(rng.random()),
+        'growth_rate': float(rng.normal(5, 3)),
+        'salary': float(rng.normal(70000, 15000)),
+    } for i in range(n_careers)]
+
+@pytest.mark.parametrize('retrieval_mode', ['inverted', 'ivf'])
+def test_indexed_hybrid_ranking_reranks_index_candidates(retrieval_mode):
+    careers = make_ranked_careers()
+    user = {'skills': ['python'], 'interests': 'data engineer',
+            'preferences': {'job_security': 8, 'growth_opportunity': 3, 'remote_work': True,
+                            'salary_preference': '60000-80000'}}
+
+    exhaustive = CareerRecommendationEngine(result_cache_size=0)
+    exhaustive.create_career_vectors(careers)
+    expected = exhaustive.get_career_recommendations(user, top_n=5)
+
+    # Enough candidates to cover the catalog: the same ranking as scoring every career
+    indexed = CareerRecommendationEngine(retrieval_mode=retrieval_mode, n_clusters=3, nprobe=3,
+                                         result_cache_size=0, hybrid_candidates=len(careers))
+    indexed.create_career_vectors(careers)
+    results = indexed.get_career_recommendations(user, top_n=5)
+
+    assert [career['title'] for career, _, _ in results] == [career['title'] for career, _, _ in expected]
+    np.testing.assert_allclose([score for _, score, _ in results], [score for _, score, _ in expected])
+
+def test_indexed_hybrid_ranking_only_scores_candidates(monkeypatch):
+    engine = CareerRecommendationEngine(retrieval_mode='inverted', result_cache_size=0, hybrid_candidates=2)
+    engine.create_career_vectors(make_ranked_careers())
+    monkeypatch.setattr(engine, 'score_user_vectors', None)
+
+    results = engine.get_career_recommendations({'skills': ['python'], 'interests': 'data engineer',
+                                                 'preferences': {'job_security': 8}}, top_n=3)
+    assert len(results) == 3
+
+def test_result_cache_is_keyed_by_result_generation_and_model_version():
+    engine = CareerRecommendationEngine()
+    engine.create_career_vectors(make_ranked_careers())
+    user = {'skills': ['python'], 'interests': 'data engineer'}
+
+    first = engine.get_career_recommendations(user, top_n=3)
+    assert engine.get_career_recommendations(user, top_n=3) == first
+    assert engine.result_cache.stats()['hits'] == 1
+
+    # A new result generation makes the cached entry unreachable
+    generation = engine.snapshot.result_generation
+    engine.invalidate_results()
+    assert engine.snapshot.result_generation == generation + 1
+    misses = engine.result_cache.stats()['misses']
+    assert engine.get_career_recommendations(user, top_n=3) == first
+    assert engine.result_cache.stats()['misses'] == misses + 1
+
+    # A refit changes model_version: neither results nor user vectors of the old model are served
+    version = engine.snapshot.model_version
+    engine.create_career_vectors([
+        {'id': 1, 'title': 'Pastry Chef', 'description': 'Baking bread and cakes', 'skills': 'baking, python'},
+        {'id': 2, 'title': 'Gardener', 'description': 'Planting and pruning', 'skills': 'gardening'},
+    ])
+    assert engine.snapshot.model_version != version
+    assert len(engine.user_vector_cache) == 0
+    results = engine.get_career_recommendations(user, top_n=3)
+    assert [career['title'] for career, _, _ in results] == ['Pastry Chef', 'Gardener']
+    assert engine.create_user_vector(user).shape[1] == engine.snapshot.term_count()
+
+def make_field_careers():
+    return [
+        {'id': 1, 'title': 'Python Developer', 'description': 'Build web services',
+         'skills': 'django, sql', 'requirements': 'Office'},
+        {'id': 2, 'title': 'Data Analyst', 'description': 'Reports and dashboards',
+         'skills': 'python, sql, statistics', 'requirements': 'Remote'},
+        {'id': 3, 'title': 'Chef', 'description': 'Cooking in restaurant kitchens',
+         'skills': 'cooking', 'requirements': 'Kitchen'},
+    ]
+
+def test_field_blocked_scores_are_weighted_field_cosines():
+    careers = make_field_careers()
+    engine = CareerRecommendationEngine(result_cache_size=0, field_weights={'skills': 2})
+    engine.create_career_vectors(careers)
+    user = {'skills': ['python', 'sql'], 'interests': 'statistics'}
+
+    user_vector = engine.create_user_vector(user)
+    scores = engine.score_user_vectors(engine.query_vectors(user_vector, [user])).ravel()
+
+    weights = dict(DEFAULT_FIELD_WEIGHTS, skills=2)
+    expected = np.zeros(len(careers))
+    for field, documents in zip(CAREER_FIELDS, zip(*map(engine.career_field_documents, careers), strict=True),
+                                strict=True):
+        block = normalize(engine.snapshot.vectorizer.transform(normalize_corpus(list(documents))))
+        expected += weights[field] * (block @ user_vector.T).toarray().ravel()
+    np.testing.assert_allclose(scores, expected / sum(weights.values()))
+
+def test_field_weights_change_without_refit():
+    careers = make_field_careers()
+    engine = CareerRecommendationEngine(field_weights={})
+    engine.create_career_vectors(careers)
+    user = {'skills': ['python'], 'interests': 'developer'}
+
+    def top_title(user_data):
+        return engine.get_career_recommendations(user_data, top_n=1)[0][0]['title']
+
+    assert top_title(user) == 'Python Developer'
+    assert top_title(dict(user, field_weights={'title': 0, 'skills': 1})) == 'Data Analyst'
+
+    version, generation = engine.snapshot.model_version, engine.snapshot.result_generation
+    engine.set_field_weights({'title': 0, 'skills': 1})
+    assert engine.snapshot.model_version == version
+    assert engine.snapshot.result_generation == generation + 1
+    assert top_title(user) == 'Data Analyst'
@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+
+from ai_engine import CareerRecommendationEngine
+from engine_manager import EngineManager
+
+
+def make_manager(tmp_path):
+    app = SimpleNamespace(config={'RECOMMENDER_MODEL_REGISTRY': str(tmp_path / 'registry'),
+                                  'RECOMMENDER_MODEL_POLL_SECONDS': 0})
+    return EngineManager(app)
+
+def test_stale_engine_is_dropped(tmp_path):
+    manager = make_manager(tmp_path)
+    rebuilt, loaded = CareerRecommendationEngine(), CareerRecommendationEngine()
+
+    # Both engines started from the same generation; the first swap wins
+    generation, catalog_version = manager._engine_state()
+    assert manager._install_engine(loaded, generation, 'v1', catalog_version)
+    assert not manager._install_engine(rebuilt, generation, catalog_version=catalog_version)
+
+    assert manager.engine is loaded
+    assert manager.model_version == 'v1'
+    assert manager.engine_generation == generation + 1
+
+def test_installed_engine_records_its_catalog_version(tmp_path):
+    manager = make_manager(tmp_path)
+    generation, catalog_version = manager._engine_state()
+    manager.catalog_version += 1
+
+    assert manager._install_engine(CareerRecommendationEngine(), generation, catalog_version=catalog_version)
+    assert not manager.is_current
@@ -0,0 +1,56 @@
+import json
+import os
+
+import pytest
+
+from model_registry import ModelRegistry
+
+
+def save_fake_model(path):
+    """Write the meta.json of a model directory, enough for the registry"""
+    os.makedirs(path)
+    with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({'format_version': 2, 'shape': [3, 10], 'fields': None}, f)
+    return True
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(str(tmp_path / 'registry'))
+
+def test_register_activates_and_records_metadata(registry):
+    version = registry.register(save_fake_model, catalog_hash='abc', source='test')
+    assert registry.active_version() == version
+    meta = registry.get(version)
+    assert meta['rows'] == 3
+    assert meta['vocabulary_size'] == 10
+    assert meta['catalog_hash'] == 'abc'
+
+def test_failed_save_leaves_no_version(registry):
+    with pytest.raises(ValueError):
+        registry.register(lambda _: False)
+    assert registry.versions() == []
+    assert registry.active_version() is None
+
+def test_rollbacks_walk_back_through_activations(registry):
+    a = registry.register(save_fake_model)
+    b = registry.register(save_fake_model)
+    c = registry.register(save_fake_model)
+
+    assert registry.rollback() == b
+    assert registry.active_version() == b
+    assert registry.rollback() == a
+    assert registry.active_version() == a
+    assert registry.rollback() is None
+    assert registry.active_version() == a
+
+    # A new activation after rollbacks starts from the restored version
+    registry.activate(c)
+    assert registry.rollback() == a
+
+def test_rollback_skips_deleted_versions(registry):
+    a = registry.register(save_fake_model)
+    b = registry.register(save_fake_model)
+    registry.register(save_fake_model)
+    os.remove(os.path.join(registry.path(b), 'registry.json'))
+
+    assert registry.rollback() == a
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from parallel_vectorizer import parallel_fit_transform
+
+DOCUMENTS = [
+    'python data analysis and machine learning',
+    'cooking in restaurant kitchens',
+    'machine learning engineer building data pipelines',
+    'pastry chef baking bread in kitchens',
+    'statistics and data visualization',
+]
+
+def test_parallel_fit_matches_fit_transform():
+    serial = TfidfVectorizer(stop_words='english')
+    expected = serial.fit_transform(DOCUMENTS)
+
+    vectorizer = TfidfVectorizer(stop_words='english')
+    shards = [DOCUMENTS[:2], DOCUMENTS[2:4], DOCUMENTS[4:]]
+    tfidf = parallel_fit_transform(vectorizer, shards, n_jobs=2, normalize=False)
+
+    assert vectorizer.vocabulary_ == serial.vocabulary_
+    np.testing.assert_allclose(vectorizer.idf_, serial.idf_)
+    np.testing.assert_allclose(tfidf.toarray(), expected.toarray())
+    np.testing.assert_allclose(vectorizer.transform(DOCUMENTS).toarray(), expected.toarray())
+
+def test_parallel_fit_requires_idf():
+    with pytest.raises(ValueError):
+        parallel_fit_transform(TfidfVectorizer(use_idf=False), [DOCUMENTS], n_jobs=2)
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+from retrieval import InvertedIndex, IVFIndex, merge_top_k, top_k_indices
+
+
+def make_career_vectors(n_careers=60, n_terms=40, seed=0):
+    """L2-normalized sparse career rows; every row is repeated once so scores tie"""
+    rng = np.random.default_rng(seed)
+    vectors = sparse.random(n_careers // 2, n_terms, density=0.15, random_state=rng, format='csr')
+    vectors = normalize(sparse.vstack([vectors, vectors]), norm='l2').tocsr()
+    return vectors[rng.permutation(n_careers)]
+
+def make_queries(n_terms=40, n_queries=20, seed=1):
+    rng = np.random.default_rng(seed)
+    queries = sparse.random(n_queries, n_terms, density=0.1, random_state=rng, format='csr')
+    return normalize(queries, norm='l2').tocsr()
+
+def assert_exact_top_k(career_vectors, query, rows, scores, k):
+    """Check (rows, scores) against brute force; tied careers may come in any order"""
+    expected = np.asarray((career_vectors @ query.T).todense()).ravel()
+    expected_top = top_k_indices(expected, k)
+
+    assert len(rows) == len(expected_top)
+    assert len(set(rows.tolist())) == len(rows)
+    np.testing.assert_allclose(scores, expected[expected_top], atol=1e-12)
+    np.testing.assert_allclose(scores, expected[rows], atol=1e-12)
+
+def test_top_k_indices_with_ties_and_k_past_the_end():
+    scores = np.array([0.5, 0.9, 0.5, 0.1, 0.9])
+    top = top_k_indices(scores, 3).tolist()
+    assert top[:2] == [1, 4]
+    assert top[2] in (0, 2)
+    assert top_k_indices(scores, 10).tolist() == [1, 4, 0, 2, 3]
+    assert top_k_indices(scores, 0).tolist() == []
+
+def test_merge_top_k_matches_a_global_top_k():
+    rng = np.random.default_rng(0)
+    scores = rng.random(100)
+    chunks = [(np.arange(start, start + 25), scores[start:start + 25]) for start in range(0, 100, 25)]
+
+    indices, top_scores = merge_top_k(chunks, 7)
+    assert indices.tolist() == top_k_indices(scores, 7).tolist()
+    np.testing.assert_allclose(top_scores, scores[indices])
+
+@pytest.mark.parametrize('k', [1, 5, 30, 100])
+def test_inverted_index_search_is_exact(k):
+    career_vectors = make_career_vectors()
+    index = InvertedIndex(career_vectors.T.tocsr())
+
+    for query in make_queries():
+        rows, scores = index.search(query, k)
+        assert_exact_top_k(career_vectors, query, rows, scores, k)
+
+def test_inverted_index_search_pads_with_unmatched_careers():
+    career_vectors = make_career_vectors()
+    index = InvertedIndex(career_vectors.T.tocsr())
+    query = sparse.csr_matrix(([1.0], ([0], [career_vectors.shape[1] - 1])), shape=(1, career_vectors.shape[1]))
+
+    rows, scores = index.search(query, career_vectors.shape[0] + 10)
+    assert sorted(rows.tolist()) == list(range(career_vectors.shape[0]))
+    assert_exact_top_k(career_vectors, query, rows, scores, career_vectors.shape[0])
+
+@pytest.mark.parametrize('k', [1, 5, 30, 100])
+def test_ivf_index_search_is_exact_when_probing_every_cluster(k):
+    career_vectors = make_career_vectors()
+    index = IVFIndex(career_vectors, n_clusters=6)
+
+    for query in make_queries():
+        rows, scores = index.search(query, k, nprobe=index.n_clusters)
+        assert_exact_top_k(career_vectors, query, rows, scores, k)
+
+def test_ivf_index_search_only_returns_probed_clusters():
+    career_vectors = make_career_vectors()
+    index = IVFIndex(career_vectors, n_clusters=6)
+    query = make_queries()[0]
+
+    rows, _ = index.search(query, 100, nprobe=1)
+    centroid_scores = index.centroids @ query.toarray().ravel()
+    probed = top_k_indices(centroid_scores, 1)[0]
+    assert set(rows.tolist()) == set(np.flatnonzero(index.assignments == probed).tolist())
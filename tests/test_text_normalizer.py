@@ -0,0 +1,23 @@
+from text_normalizer import DOCUMENT_SEPARATOR, normalize_corpus, normalize_text
+
+DOCUMENTS = [
+    'Data Scientist: Python, SQL & statistics (5+ years)',
+    'C++/C# developer_backend',
+    '  Multiple   spaces\tand\nnewlines  ',
+    'Café crème – naïve résumé № 42',
+    'Ünïcödé ½ ² ٣ digits and ‘quotes’',
+    '',
+    None,
+    12345,
+    'ends with punctuation!!!',
+]
+
+def test_normalize_corpus_matches_normalize_text():
+    assert normalize_corpus(DOCUMENTS) == [normalize_text(document) for document in DOCUMENTS]
+
+def test_normalize_corpus_handles_documents_containing_the_separator():
+    documents = ['first' + DOCUMENT_SEPARATOR + 'second', 'Third, document']
+    assert normalize_corpus(documents) == [normalize_text(document) for document in documents]
+
+def test_normalize_corpus_of_no_documents():
+    assert normalize_corpus([]) == []
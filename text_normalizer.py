@@ -0,0 +1,94 @@
+import re
+import string
+
+# Separates documents in normalize_corpus; the corpus translate table keeps it
+DOCUMENT_SEPARATOR = '\x00'
+
+def _ascii_table(punctuation, delete='', keep=''):
+    """Build a str.translate table for ASCII text: punctuation and control characters become spaces"""
+    controls = ''.join(chr(code) for code in list(range(32)) + [127] if not chr(code).isspace())
+    table = {ord(char): ' ' for char in punctuation + controls if char not in keep}
+    table.update({ord(char): None for char in delete})
+    return table
+
+# Tokenizer input: ASCII punctuation (including _) -> space, digits removed
+_NORMALIZE_TABLE = _ascii_table(string.punctuation, delete=string.digits)
+_CORPUS_TABLE = _ascii_table(string.punctuation, delete=string.digits, keep=DOCUMENT_SEPARATOR)
+
+# Display text: ASCII punctuation except _ -> space, digits kept
+_CLEAN_TABLE = _ascii_table(string.punctuation.replace('_', ''))
+
+# The same rules for non-ASCII characters, applied only to non-ASCII text.
+# Group 1 matches digits, which are removed; anything else becomes a space.
+_NORMALIZE_PATTERN = re.compile(r'(\d+)|[^\w\s\x00]|_')
+_CLEAN_PATTERN = re.compile(r'[^\w\s]')
+
+def _normalize_replacement(match):
+    return '' if match.group(1) else ' '
+
+def _normalize(text, table=_NORMALIZE_TABLE):
+    """Lowercase, strip punctuation and digits; whitespace is not collapsed"""
+    text = text.lower().translate(table)
+    if not text.isascii():
+        text = _NORMALIZE_PATTERN.sub(_normalize_replacement, text)
+    return text
+
+def normalize_text(text):
+    """
+    Normalize text for the TF-IDF vectorizer
+
+    Lowercases, turns punctuation into spaces, removes digits and collapses
+    whitespace. Used for both career documents and user profiles, so training
+    and serving tokenize identically.
+
+    Args:
+        text: Text to normalize (None and non-strings give an empty string)
+
+    Returns:
+        Normalized text
+    """
+    if not text or not isinstance(text, str):
+        return ""
+    return ' '.join(_normalize(text).split())
+
+def normalize_corpus(documents):
+    """
+    Normalize a list of documents in one pass
+
+    The documents are joined with a separator character, so lowercasing,
+    translation and the non-ASCII regex run once over the whole corpus
+    instead of once per document. Same result as [normalize_text(d) for d in
+    documents].
+
+    Args:
+        documents: List of strings (None and non-strings give empty strings)
+
+    Returns:
+        List of normalized documents
+    """
+    documents = [document if isinstance(document, str) else '' for document in documents]
+    parts = _normalize(DOCUMENT_SEPARATOR.join(documents), _CORPUS_TABLE).split(DOCUMENT_SEPARATOR)
+
+    # A document containing the separator itself would split; fall back
+    if len(parts) != len(documents):
+        return [normalize_text(document) for document in documents]
+    return [' '.join(part.split()) for part in parts]
+
+def clean_text(text):
+    """
+    Clean text for display by removing special characters and extra spaces
+
+    Unlike normalize_text, case and digits are kept.
+
+    Args:
+        text: Text to clean (non-strings give an empty string)
+
+    Returns:
+        Cleaned text
+    """
+    if not isinstance(text, str):
+        return ""
+    text = text.translate(_CLEAN_TABLE)
+    if not text.isascii():
+        text = _CLEAN_PATTERN.sub(' ', text)
+    return ' '.join(text.split())
@@ -41,6 +41,11 @@ def load_and_preprocess_data():
         logger.error(f"Error loading and preprocessing data: {e}")
         return None
 
+def cell_text(row, column):
+    """Return a dataset cell, or an empty string for a missing column or a missing (NaN) value"""
+    value = row[column] if column in row else ''
+    return '' if pd.isna(value) else value
+
 def train_recommendation_model(career_data):
     """
     Train the career recommendation model using the dataset
@@ -55,10 +60,12 @@ def train_recommendation_model(career_data):
         for _, row in career_data.iterrows():
             career_dict = {
                 'title': row['Title'],
-                'description': row['Description'] if 'Description' in row else '',
-                'skills': row['Skills'] if 'Skills' in row else '',
-                'interests': row['Interests'] if 'Interests' in row else '',
-                'requirements': row['Requirements'] if 'Requirements' in row else '',
+                # Text is normalized by the vectorizer; the skills keep their
+                # comma separators for skill matching
+                'description': cell_text(row, 'Description'),
+                'skills': cell_text(row, 'Skills'),
+                'interests': cell_text(row, 'Interests'),
+                'requirements': cell_text(row, 'Requirements'),
             }
             careers_for_vectorization.append(career_dict)
         
@@ -67,7 +74,7 @@ def train_recommendation_model(career_data):
         logger.info("Successfully created career vectors")
         
         # Save the trained model
-        engine.save_model('data/trained_career_model.pkl')
+        engine.save_model('data/trained_career_model')
         logger.info("Model trained and saved successfully")
         
         return engine
@@ -1,17 +1,27 @@
 import os
 import pandas as pd
 import numpy as np
-import re
+import time
 import logging
-import pickle
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from model_store import save_model_dir
+from model_registry import ModelRegistry
+from parallel_vectorizer import parallel_fit_transform, resolve_n_jobs
+from text_normalizer import clean_text, normalize_text, normalize_corpus
 import sys
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Processes used to tokenize the corpus (-1: one per CPU) and documents per process task
+FIT_JOBS = int(os.environ.get("RECOMMENDER_FIT_JOBS", "1"))
+FIT_SHARD_SIZE = 1000
+
+# Store float32 vectors with int32 indices in the saved model
+COMPACT_VECTORS = os.environ.get("RECOMMENDER_COMPACT_VECTORS", "0") == "1"
+
 class CareerData:
     """Simple class to hold career data for training"""
     def __init__(self, title, description, skills, education_required, avg_salary, growth_rate, work_environment):
@@ -23,16 +33,6 @@ class CareerData:
         self.growth_rate = growth_rate
         self.work_environment = work_environment
 
-def clean_text(text):
-    """Clean text by removing special characters and extra spaces"""
-    if not isinstance(text, str):
-        return ""
-    # Remove special characters
-    text = re.sub(r'[^\w\s]', ' ', text)
-    # Remove extra spaces
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
-
 def extract_career_info(row):
     """Extract career information from a dataset row"""
     # Get course/degree as title
@@ -180,36 +180,17 @@ def load_and_process_dataset():
 class KaggleCareerRecommendationEngine:
     """Simplified version of the career recommendation engine for training"""
     def __init__(self):
-        self.vectorizer = TfidfVectorizer(stop_words='english')
+        self.vectorizer = TfidfVectorizer(stop_words='english', dtype=np.float32 if COMPACT_VECTORS else np.float64)
         self.careers = []
         self.career_vectors = None
         self.career_titles = []
     
     def preprocess_text(self, text):
-        """Preprocess text by removing punctuation, numbers, and stopwords."""
-        if not text:
-            return ""
-        
-        try:
-            # Convert to lowercase
-            text = text.lower()
-            
-            # Remove punctuation
-            text = re.sub(r'[^\w\s]', ' ', text)
-            
-            # Remove numbers
-            text = re.sub(r'\d+', '', text)
-            
-            # Remove extra whitespace
-            text = re.sub(r'\s+', ' ', text).strip()
-            
-            return text
-        except Exception as e:
-            logger.error(f"Error preprocessing text: {e}")
-            return text or ""
+        """Preprocess text the same way as the serving engine (see text_normalizer)."""
+        return normalize_text(text)
     
-    def create_career_vectors(self, careers):
-        """Create TF-IDF vectors for careers"""
+    def create_career_vectors(self, careers, n_jobs=FIT_JOBS):
+        """Create TF-IDF vectors for careers, tokenizing in n_jobs processes"""
         self.careers = careers
         
         # Prepare document corpus for each career
@@ -221,32 +202,28 @@ class KaggleCareerRecommendationEngine:
             skill_text = ' '.join([skill.name for skill in career.skills])
             
             document = f"{career.title} {career.description} {skill_text} {career.education_required} {career.work_environment}"
-            document = self.preprocess_text(document)
             
             career_documents.append(document)
             self.career_titles.append(career.title)
         
         try:
-            # Create TF-IDF vectors
-            self.career_vectors = self.vectorizer.fit_transform(career_documents)
+            if resolve_n_jobs(n_jobs) > 1:
+                # Normalize, tokenize and count shards of the corpus in worker processes
+                shards = [career_documents[i:i + FIT_SHARD_SIZE]
+                          for i in range(0, len(career_documents), FIT_SHARD_SIZE)]
+                self.career_vectors = parallel_fit_transform(self.vectorizer, shards, n_jobs)
+            else:
+                # Normalize the whole corpus at once, then create TF-IDF vectors
+                self.career_vectors = self.vectorizer.fit_transform(normalize_corpus(career_documents))
             logger.info(f"Created TF-IDF vectors for {len(careers)} careers")
         except Exception as e:
             logger.error(f"Error creating career vectors: {e}")
             self.career_vectors = np.zeros((len(careers), 1))  # Fallback
     
-    def save_model(self, filepath='career_recommendation_model.pkl'):
-        """Save the model to a file."""
+    def save_model(self, filepath='models/career_recommendation_model'):
+        """Save the model as a memory-mappable model directory."""
         try:
-            model_data = {
-                'vectorizer': self.vectorizer,
-                'career_vectors': self.career_vectors,
-                'career_titles': self.career_titles
-            }
-            
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            
-            with open(filepath, 'wb') as f:
-                pickle.dump(model_data, f)
+            save_model_dir(filepath, self.vectorizer, self.career_vectors, self.career_titles)
                 
             logger.info(f"Model saved to {filepath}")
             return True
@@ -293,14 +270,18 @@ def main():
     
     # Train model
     engine = KaggleCareerRecommendationEngine()
+    start_time = time.perf_counter()
     engine.create_career_vectors(career_data)
+    build_seconds = time.perf_counter() - start_time
     
-    # Save the model
-    os.makedirs('models', exist_ok=True)
-    success = engine.save_model('models/career_recommendation_model.pkl')
-    
-    if not success:
-        logger.error("Failed to save model. Exiting...")
+    # Register the model as the new active version; the careers are not from
+    # the database, so there is no catalog hash to record
+    try:
+        version = ModelRegistry().register(engine.save_model, source='train_kaggle_model',
+                                           build_seconds=build_seconds)
+        logger.info(f"Model registered as version {version}")
+    except Exception as e:
+        logger.error(f"Failed to save model: {e}. Exiting...")
         return
     
     # Generate career JSON for database import
@@ -1,8 +1,11 @@
 import os
 import json
+import time
 import pandas as pd
 import logging
 from ai_engine import CareerRecommendationEngine
+from catalog_loader import load_catalog
+from model_registry import ModelRegistry
 from app import app, db
 from sqlalchemy import text
 from models import Career, Skill, MarketTrend
@@ -195,26 +198,26 @@ def train_recommendation_model():
     try:
         with app.app_context():
             # Create recommendation engine
-            engine = CareerRecommendationEngine()
+            engine = CareerRecommendationEngine(n_jobs=app.config['RECOMMENDER_FIT_JOBS'],
+                                                field_weights=app.config['RECOMMENDER_FIELD_WEIGHTS'],
+                                                compact=app.config['RECOMMENDER_COMPACT_VECTORS'])
             
-            # Get all careers with their skills
-            careers = Career.query.all()
+            # Get all careers with their skills and market trends
+            careers, _ = load_catalog()
             if not careers:
                 logger.error("No careers found in the database")
                 return False
             
             # Create career vectors
+            start_time = time.perf_counter()
             engine.create_career_vectors(careers)
+            build_seconds = time.perf_counter() - start_time
             
-            # Save the trained model
-            model_saved = engine.save_model('career_recommendation_model.pkl')
-            
-            if model_saved:
-                logger.info("Career recommendation model trained and saved successfully")
-                return True
-            else:
-                logger.error("Failed to save the trained model")
-                return False
+            # Register the trained model (saved with its catalog hash) as the new active version
+            version = ModelRegistry().register(engine.save_model, source='train_model',
+                                               build_seconds=build_seconds)
+            logger.info(f"Career recommendation model trained and registered as version {version}")
+            return True
     
     except Exception as e:
         logger.error(f"Error training recommendation model: {e}")
@@ -227,8 +230,8 @@ def test_model():
             # Create recommendation engine
             engine = CareerRecommendationEngine()
             
-            # Load the trained model
-            model_loaded = engine.load_model('career_recommendation_model.pkl')
+            # Load the active model version
+            model_loaded = engine.load_model(ModelRegistry().active_path() or 'models/career_recommendation_model')
             if not model_loaded:
                 logger.error("Failed to load the trained model")
                 return False